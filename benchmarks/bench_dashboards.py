@@ -0,0 +1,95 @@
+"""Dashboard generation benchmark.
+
+Times DashboardGenerator.build_dashboards for synthetic fleets of increasing
+size, checks that time per service stays flat (linear scaling) and that the
+rendered JSON is byte-identical across runs.
+
+    python -m benchmarks.bench_dashboards --sizes 1000 5000 10000
+"""
+import argparse
+import hashlib
+import time
+from typing import Any, Dict, List
+
+from generator.dashboard_generator import DashboardGenerator, render_json
+
+LANGUAGE_SHARES = {"python": 0.4, "node": 0.35, "java": 0.25}
+
+# Allowed growth of per-service time from the smallest to the largest fleet
+# before the run is reported as super-linear.
+MAX_PER_SERVICE_GROWTH = 2.0
+
+
+def synthetic_services(count: int) -> Dict[str, List[Any]]:
+    services: Dict[str, List[Any]] = {key: [] for key in LANGUAGE_SHARES}
+    index = 0
+    for key, share in LANGUAGE_SHARES.items():
+        for _ in range(int(count * share)):
+            services[key].append({"pid": 10000 + index, "name": f"{key}-svc-{index:05d}", "cmdline": [key]})
+            index += 1
+    services["docker"] = [{"id": f"c{i:05d}", "name": f"container-{i:05d}"} for i in range(count // 10)]
+    return services
+
+
+def render_fleet(services: Dict[str, List[Any]]) -> Dict[str, str]:
+    generator = DashboardGenerator()
+    dashboards = {spec.file_name: render_json(d) for spec, d in generator.build_dashboards(services)}
+    dashboards["recording-rules.yaml"] = generator.recording_rules.to_yaml()
+    return dashboards
+
+
+def digest(rendered: Dict[str, str]) -> str:
+    h = hashlib.sha256()
+    for name in sorted(rendered):
+        h.update(name.encode())
+        h.update(rendered[name].encode())
+    return h.hexdigest()
+
+
+def run(sizes: List[int], repeats: int = 3) -> Dict[str, Any]:
+    results = []
+    for size in sizes:
+        services = synthetic_services(size)
+        timings, digests = [], set()
+        for _ in range(repeats):
+            start = time.perf_counter()
+            rendered = render_fleet(services)
+            timings.append(time.perf_counter() - start)
+            digests.add(digest(rendered))
+        best = min(timings)
+        results.append({
+            "services": size,
+            "seconds": round(best, 4),
+            "us_per_service": round(best / size * 1e6, 3),
+            "deterministic": len(digests) == 1,
+        })
+        print(f"   {size:>6} services: {best * 1000:8.1f} ms "
+              f"({results[-1]['us_per_service']} µs/service), "
+              f"{'byte-identical' if len(digests) == 1 else 'OUTPUT DIFFERS'} across {repeats} runs")
+
+    growth = results[-1]["us_per_service"] / (results[0]["us_per_service"] or 1e-9)
+    return {
+        "runs": results,
+        "per_service_growth": round(growth, 3),
+        "linear": growth <= MAX_PER_SERVICE_GROWTH,
+        "deterministic": all(r["deterministic"] for r in results),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print("🏁 Benchmarking dashboard generation...")
+    summary = run(sorted(args.sizes), args.repeats)
+    print(f"📈 Per-service time growth {summary['per_service_growth']}x "
+          f"({'linear' if summary['linear'] else 'super-linear'})")
+    ok = summary["linear"] and summary["deterministic"]
+    print("✅ Dashboard generation is linear and deterministic" if ok else "❌ Dashboard benchmark failed")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
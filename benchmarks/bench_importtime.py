@@ -0,0 +1,108 @@
+"""CLI import-time regression benchmark.
+
+For every Typer command in main.py, imports main plus the modules that command
+imports lazily in a fresh interpreter under `python -X importtime`, and fails
+when the cold-start import cost exceeds the command's budget. Budgets are
+multiples of importing main alone, measured in the same run, so they hold on
+faster and slower machines alike.
+
+    python -m benchmarks.bench_importtime
+    python -m benchmarks.bench_importtime --command validate --scale 2
+"""
+import argparse
+import ast
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+MAIN = Path("main.py")
+
+# Cold-start import budgets as a multiple of `import main` alone (medians of
+# --repeats runs), with about 40% headroom over typical runs. Commands that only
+# read YAML should stay far below the ones that pull in the OpenTelemetry SDK.
+DEFAULT_BUDGET = 5.0
+COMMAND_BUDGETS = {
+    "validate": 2.0,
+    "reload": 4.0,
+    "batch-render": 4.0,
+    "generate-dashboards": 4.0,
+    "check-resilience": 2.5,
+    "reset-circuit-breaker": 2.5,
+    "benchmark-exporters": 6.0,
+    "health-check": 6.0,
+    "probe-capacity": 6.0,
+}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\| ( *)(\S+)")
+
+
+def command_imports(path: Path = MAIN) -> Dict[str, List[str]]:
+    """Map each @app.command() function (as a CLI name) to the modules it imports."""
+    tree = ast.parse(path.read_text())
+    commands = {}
+    for node in tree.body:
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        if not any(isinstance(d, ast.Call) and getattr(d.func, "attr", "") == "command" for d in node.decorator_list):
+            continue
+        modules = set()
+        for child in ast.walk(node):
+            if isinstance(child, ast.Import):
+                modules.update(alias.name for alias in child.names)
+            elif isinstance(child, ast.ImportFrom) and child.module:
+                modules.add(child.module)
+        commands[node.name.replace("_", "-")] = sorted(modules)
+    return commands
+
+
+def import_cost_ms(modules: List[str]) -> float:
+    """Cumulative import time of `main` plus `modules` in a fresh interpreter."""
+    code = "; ".join(f"import {m}" for m in ["main"] + modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # Only top-level entries: their cumulative time already includes nested imports.
+        if match and not match.group(3):
+            total_us += int(match.group(2))
+    return total_us / 1000
+
+
+def median_cost_ms(modules: List[str], repeats: int) -> float:
+    samples = sorted(import_cost_ms(modules) for _ in range(max(1, repeats)))
+    return samples[len(samples) // 2]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--command", action="append", help="Only check these commands")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI machines)")
+    args = parser.parse_args()
+
+    commands = command_imports()
+    selected = args.command or sorted(commands)
+    print("🏁 Measuring cold-start import time per command...")
+    baseline = median_cost_ms([], args.repeats)
+    print(f"   import main alone: {baseline:.1f} ms")
+    failures = []
+    for name in selected:
+        median = median_cost_ms(commands[name], args.repeats)
+        budget = COMMAND_BUDGETS.get(name, DEFAULT_BUDGET) * baseline * args.scale
+        ok = median <= budget
+        if not ok:
+            failures.append(name)
+        print(f"   {'✅' if ok else '❌'} {name:<24} {median:7.1f} ms (budget {budget:.0f} ms)")
+
+    if failures:
+        print(f"❌ Import time over budget: {', '.join(failures)}")
+        return 1
+    print("✅ All commands within their import-time budget")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""Synthetic fixtures for the benchmark suite.
+
+Everything is generated from a seed, so the same parameters give the same
+fixture on every run and results stay comparable across commits.
+"""
+import json
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# (language key, process name, cmdline template, manifest file, manifest body)
+LANGUAGE_PROFILES = [
+    ("python", "python3", ["python3", "{dir}/app.py"], "requirements.txt",
+     "flask==3.0.0\nopentelemetry-api\nopentelemetry-sdk\nopentelemetry-instrumentation-flask\n"),
+    ("node", "node", ["node", "{dir}/server.js"], "package.json",
+     json.dumps({"dependencies": {"express": "^4", "@opentelemetry/api": "^1"}})),
+    ("java", "java", ["java", "-jar", "{dir}/app.jar"], "pom.xml",
+     "<project><dependencies><dependency>opentelemetry-api</dependency></dependencies></project>"),
+]
+
+OTHER_PROCESSES = ["bash", "sshd", "systemd", "cron", "postgres", "redis-server", "nginx", "kafka", "dockerd", "envoy"]
+
+K8S_KINDS = ["Deployment", "Service", "ConfigMap", "StatefulSet", "Ingress"]
+
+
+def fake_process_table(count: int, seed: int = 7, project_root: str = "/srv") -> List[SimpleNamespace]:
+    """Objects shaped like psutil.process_iter(attrs=...) results: `.info` holds pid/name/cmdline/exe."""
+    rng = random.Random(seed)
+    table = []
+    for pid in range(1, count + 1):
+        if rng.random() < 0.3:
+            key, name, cmdline, _, _ = rng.choice(LANGUAGE_PROFILES)
+            project = f"{project_root}/{key}-{pid:06d}"
+            info = {"pid": pid, "name": name, "cmdline": [c.format(dir=project) for c in cmdline],
+                    "exe": f"/usr/bin/{name}"}
+        else:
+            name = rng.choice(OTHER_PROCESSES)
+            info = {"pid": pid, "name": name, "cmdline": [f"/usr/sbin/{name}", "--flag"], "exe": f"/usr/sbin/{name}"}
+        table.append(SimpleNamespace(info=info))
+    return table
+
+
+def make_tree(root: Path, files: int, manifests: int, seed: int = 7) -> Dict[str, Any]:
+    """Directory tree with `files` plain files (some logs), `manifests` Kubernetes YAML manifests
+    and a docker-compose.yml at the root."""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    dirs = [root / f"dir{i:03d}" / f"sub{i % 7}" for i in range(max(1, files // 50))]
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+    extensions = [".py", ".js", ".txt", ".md", ".log", ".json"]
+    for i in range(files):
+        path = rng.choice(dirs) / f"file{i:06d}{rng.choice(extensions)}"
+        path.write_text(f"line {i}\n" * rng.randint(1, 20))
+    for i in range(manifests):
+        kind = rng.choice(K8S_KINDS)
+        path = rng.choice(dirs) / f"manifest{i:05d}.yaml"
+        path.write_text(f"apiVersion: v1\nkind: {kind}\nmetadata:\n  name: svc-{i:05d}\n"
+                        f"  labels:\n    app: svc-{i:05d}\nspec:\n  replicas: {rng.randint(1, 5)}\n")
+    compose = {"services": {f"app{i:04d}": {"image": f"app{i:04d}:latest", "ports": [f"{8000 + i}:8080"]}
+                            for i in range(max(1, manifests // 10))}}
+    (root / "docker-compose.yml").write_text(json.dumps(compose))
+    return {"files": files, "manifests": manifests, "dirs": len(dirs)}
+
+
+def synthetic_inventory(count: int, project_root: Path, projects: int = 0, seed: int = 7) -> Dict[str, List[Any]]:
+    """Discovery output with `count` language services spread over `projects` project directories.
+
+    With projects > 0 the project directories are created with a manifest and a
+    few source files so InstrumentationChecker has real files to read; several
+    services (workers) then share one project, as on real hosts.
+    """
+    rng = random.Random(seed)
+    inventory: Dict[str, List[Any]] = {key: [] for key, *_ in LANGUAGE_PROFILES}
+    project_dirs = []
+    for p in range(projects):
+        key, _, _, manifest, body = LANGUAGE_PROFILES[p % len(LANGUAGE_PROFILES)]
+        project = project_root / f"{key}-project-{p:04d}"
+        project.mkdir(parents=True, exist_ok=True)
+        (project / manifest).write_text(body)
+        for n in range(3):
+            (project / f"module{n}.{'js' if key == 'node' else 'py'}").write_text("import opentelemetry\n")
+        project_dirs.append((key, project))
+    for i in range(count):
+        if project_dirs:
+            key, project = project_dirs[i % len(project_dirs)]
+        else:
+            key, project = rng.choice(LANGUAGE_PROFILES)[0], project_root / f"svc-{i:06d}"
+        name = next(p[1] for p in LANGUAGE_PROFILES if p[0] == key)
+        inventory[key].append({
+            "pid": 10000 + i,
+            "name": f"{key}-svc-{i:06d}",
+            "cmdline": [name, str(project / "main")],
+            # InstrumentationChecker inspects dirname(exe).
+            "exe": str(project / name),
+        })
+    inventory["databases"] = [{"pid": 9000, "name": "postgres"}]
+    inventory["docker"] = [{"name": f"container-{i:04d}", "image": "app:latest"} for i in range(count // 20)]
+    return inventory
+
+
+def promql_dashboard_set(dashboards: int, panels: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Dashboards with raw (unrecorded) PromQL panels of varying cost for the query cost analyzer."""
+    rng = random.Random(seed)
+    templates = [
+        'sum(rate(http_requests_total{{job="{job}"}}[5m])) by (service_name)',
+        'histogram_quantile(0.95, sum by (le) (rate(http_request_duration_seconds_bucket[{window}])))',
+        'rate(traces_span_metrics_calls_total[{window}])',
+        'sum by (service_name) (process_resident_memory_bytes{{job="{job}"}})',
+        'count(up{{job="{job}"}})',
+    ]
+    result = []
+    for d in range(dashboards):
+        panel_list = []
+        for p in range(panels):
+            expr = rng.choice(templates).format(job=f"job{rng.randint(0, 50)}", window=rng.choice(["1m", "5m", "1h"]))
+            panel_list.append({"id": p + 1, "title": f"Panel {p}", "type": "timeseries",
+                               "targets": [{"expr": expr, "legendFormat": "{{service_name}}"}]})
+        result.append({"dashboard": {"title": f"Synthetic {d}", "panels": panel_list}})
+    return result
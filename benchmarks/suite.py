@@ -0,0 +1,206 @@
+"""Benchmark suite over synthetic fixtures, stored as JSON per commit.
+
+Covers EnhancedServiceScanner (process table and filesystem scans),
+InstrumentationChecker, the config/env/dashboard generators, the query cost
+analyzer and validate_enhanced_config. Results go to
+output/benchmarks/<commit>.json; --compare reports the change against an
+earlier result file and fails on regressions above --threshold.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --services 5000 --compare output/benchmarks/3d32f5e.json
+"""
+import argparse
+import copy
+import io
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+from benchmarks import fixtures
+
+RESULTS_DIR = Path("output/benchmarks")
+
+# Relative slowdown of a case's median before --compare reports a regression.
+DEFAULT_THRESHOLD = 0.2
+# Sub-millisecond cases jitter by more than the threshold; ignore smaller absolute changes.
+NOISE_FLOOR_SECONDS = 0.002
+
+
+@dataclass
+class Case:
+    name: str
+    # Untimed; called before every repeat, its return value is passed to run().
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+
+
+def git_commit() -> Dict[str, Any]:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": None}
+    return {"commit": sha, "dirty": dirty}
+
+
+def build_cases(args: argparse.Namespace, workdir: Path) -> List[Case]:
+    from discovery.enhanced_scanner import EnhancedServiceScanner
+    from generator.config_generator import generate_configs
+    from generator.dashboard_generator import DashboardGenerator
+    from generator.env_generator import render_env_file, render_setup_instructions
+    from generator.query_cost import QueryCostAnalyzer
+    from pipeline.enhanced_run import render_config
+    from validators.instrumentation_check import InstrumentationChecker
+    from validators.validate_enhanced_config import validate_enhanced_config
+
+    table = fixtures.fake_process_table(args.processes)
+    tree = workdir / "tree"
+    fixtures.make_tree(tree, args.files, args.manifests)
+    inventory = fixtures.synthetic_inventory(args.services, workdir / "projects", projects=args.projects)
+    promql = fixtures.promql_dashboard_set(args.dashboards, args.panels)
+    # Validation input only; the generator cases render into a fresh directory each repeat
+    # so they time a real write rather than the unchanged-output skip.
+    enhanced_path = render_config({"discover": inventory}, str(workdir / "validate-input"))["path"]
+
+    def output_dir() -> str:
+        return tempfile.mkdtemp(dir=workdir)
+
+    def scan_processes(_: Any) -> None:
+        with mock.patch("discovery.enhanced_scanner.psutil.process_iter", lambda attrs=None: iter(table)):
+            EnhancedServiceScanner().scan_processes()
+
+    def scan_tree(_: Any) -> None:
+        scanner = EnhancedServiceScanner()
+        scanner.scan_docker_compose(str(tree))
+        scanner.scan_kubernetes(str(tree))
+        scanner.scan_logs(str(tree))
+
+    def env_outputs(_: Any) -> None:
+        render_env_file(inventory)
+        render_setup_instructions(inventory)
+
+    def query_cost(dashboards: List[Dict[str, Any]]) -> None:
+        analyzer = QueryCostAnalyzer(max_query_cost=None)
+        for dashboard in dashboards:
+            analyzer.optimize_dashboard(dashboard)
+
+    return [
+        Case("scanner.scan_processes", lambda: None, scan_processes),
+        Case("scanner.scan_tree", lambda: None, scan_tree),
+        Case("instrumentation.check_all_services", lambda: None,
+             lambda _: InstrumentationChecker().check_all_services(inventory)),
+        Case("generator.config", output_dir, lambda out: generate_configs(inventory, out)),
+        Case("generator.enhanced_config", output_dir, lambda out: render_config({"discover": inventory}, out)),
+        Case("generator.env", lambda: None, env_outputs),
+        Case("generator.dashboards", lambda: None, lambda _: DashboardGenerator().build_dashboards(inventory)),
+        Case("generator.query_cost", lambda: copy.deepcopy(promql), query_cost),
+        Case("validator.validate_enhanced_config", lambda: None, lambda _: validate_enhanced_config(enhanced_path)),
+    ]
+
+
+def time_case(case: Case, repeats: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeats):
+        state = case.setup()
+        # The generators and scanners print progress; keep it out of the report.
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            case.run(state)
+            timings.append(time.perf_counter() - start)
+    return {
+        "min_seconds": round(min(timings), 6),
+        "median_seconds": round(statistics.median(timings), 6),
+        "runs": [round(t, 6) for t in timings],
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    params = {key: getattr(args, key) for key in
+              ("processes", "files", "manifests", "services", "projects", "dashboards", "panels")}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="otel-bench-") as tmp:
+        with redirect_stdout(io.StringIO()):
+            cases = build_cases(args, Path(tmp))
+        for case in cases:
+            if args.case and not any(case.name.startswith(prefix) for prefix in args.case):
+                continue
+            results[case.name] = time_case(case, args.repeats)
+            print(f"   {case.name:<38} {results[case.name]['median_seconds'] * 1000:9.2f} ms median "
+                  f"({results[case.name]['min_seconds'] * 1000:.2f} ms min)")
+    return {
+        **git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "repeats": args.repeats,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print per-case change against `baseline`; return the names of regressed cases."""
+    if current["params"] != baseline.get("params"):
+        print(f"⚠️  Baseline was run with different parameters: {baseline.get('params')}")
+    regressions = []
+    print(f"📊 Compared with {baseline.get('commit', 'unknown')}:")
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            print(f"   🆕 {name:<38}")
+            continue
+        change = result["median_seconds"] / old["median_seconds"] - 1 if old["median_seconds"] else 0.0
+        regressed = change > threshold and result["median_seconds"] - old["median_seconds"] > NOISE_FLOOR_SECONDS
+        if regressed:
+            regressions.append(name)
+        print(f"   {'❌' if regressed else '✅'} {name:<38} {old['median_seconds'] * 1000:9.2f} → "
+              f"{result['median_seconds'] * 1000:9.2f} ms ({change:+.1%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=5000, help="Fake process table size")
+    parser.add_argument("--files", type=int, default=2000, help="Files in the scanned directory tree")
+    parser.add_argument("--manifests", type=int, default=200, help="Kubernetes manifests in the tree")
+    parser.add_argument("--services", type=int, default=500, help="Services in the inventory")
+    parser.add_argument("--projects", type=int, default=50, help="Project directories the services live in")
+    parser.add_argument("--dashboards", type=int, default=20, help="Dashboards in the PromQL set")
+    parser.add_argument("--panels", type=int, default=30, help="Panels per PromQL dashboard")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--case", action="append", help="Only run cases with this name prefix")
+    parser.add_argument("--output", help=f"Result file (default: {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    print("🏁 Running benchmark suite...")
+    report = run(args)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"💾 Results saved to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ Regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,10 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import requests
 
+COMPOSE_FILES = ("docker-compose.yml", "docker-compose.yaml", "compose.yml")
+K8S_EXTENSIONS = ('.yaml', '.yml')
+LOG_EXTENSIONS = ('.log', '.out', '.err', '.access', '.error')
+
 class EnhancedServiceScanner:
     def __init__(self, extra_processes: Optional[List[str]] = None, extra_ports: Optional[List[int]] = None):
         self.services = {
@@ -141,50 +145,60 @@ class EnhancedServiceScanner:
         except:
             pass
 
+    def compose_services(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Services declared in one Docker Compose file."""
+        with open(file_path, 'r') as f:
+            compose_config = yaml.safe_load(f)
+        if not compose_config or 'services' not in compose_config:
+            return []
+        return [
+            {
+                "name": service_name,
+                "image": service_config.get('image', 'unknown'),
+                "ports": service_config.get('ports', []),
+                "environment": service_config.get('environment', {}),
+                "source": "docker-compose"
+            }
+            for service_name, service_config in compose_config['services'].items()
+        ]
+
+    def kubernetes_resource(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """The resource described by one Kubernetes manifest, or None if it is not one."""
+        try:
+            with open(file_path, 'r') as f:
+                k8s_config = yaml.safe_load(f)
+        except Exception:
+            return None
+        if isinstance(k8s_config, dict) and 'kind' in k8s_config:
+            return {
+                "kind": k8s_config['kind'],
+                "name": (k8s_config.get('metadata') or {}).get('name', 'unknown'),
+                "file": str(file_path)
+            }
+        return None
+
     def scan_docker_compose(self, scan_path: str = "."):
         print("🔍 Scanning for Docker Compose files...")
-        compose_files = ["docker-compose.yml", "docker-compose.yaml", "compose.yml"]
-        for compose_file in compose_files:
+        for compose_file in COMPOSE_FILES:
             file_path = Path(scan_path) / compose_file
             if file_path.exists():
                 try:
-                    with open(file_path, 'r') as f:
-                        compose_config = yaml.safe_load(f)
-                    if 'services' in compose_config:
-                        for service_name, service_config in compose_config['services'].items():
-                            self.services["docker"].append({
-                                "name": service_name,
-                                "image": service_config.get('image', 'unknown'),
-                                "ports": service_config.get('ports', []),
-                                "environment": service_config.get('environment', {}),
-                                "source": "docker-compose"
-                            })
+                    self.services["docker"].extend(self.compose_services(file_path))
                 except Exception as e:
                     print(f"⚠️  Error parsing {compose_file}: {e}")
     def scan_kubernetes(self, scan_path: str = "."):
         print("🔍 Scanning for Kubernetes manifests...")
-        k8s_extensions = ['.yaml', '.yml']
         for root, dirs, files in os.walk(scan_path):
             for file in files:
-                if any(file.endswith(ext) for ext in k8s_extensions):
-                    file_path = Path(root) / file
-                    try:
-                        with open(file_path, 'r') as f:
-                            k8s_config = yaml.safe_load(f)
-                        if k8s_config and 'kind' in k8s_config:
-                            self.services["kubernetes"].append({
-                                "kind": k8s_config['kind'],
-                                "name": k8s_config.get('metadata', {}).get('name', 'unknown'),
-                                "file": str(file_path)
-                            })
-                    except Exception:
-                        continue
+                if file.endswith(K8S_EXTENSIONS):
+                    resource = self.kubernetes_resource(Path(root) / file)
+                    if resource:
+                        self.services["kubernetes"].append(resource)
     def scan_logs(self, scan_path: str = "."):
         print("🔍 Scanning for log files...")
-        log_extensions = ['.log', '.out', '.err', '.access', '.error']
         for root, dirs, files in os.walk(scan_path):
             for file in files:
-                if any(file.endswith(ext) for ext in log_extensions):
+                if file.endswith(LOG_EXTENSIONS):
                     log_path = os.path.join(root, file)
                     self.services["logs"].append(log_path)
     def detect_services(self, scan_path: str = ".") -> Dict[str, List[Any]]:
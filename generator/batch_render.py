@@ -0,0 +1,217 @@
+import json
+import os
+import re
+import shutil
+import socket
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from generator.config_generator import ENHANCED_EXPORTERS, ENHANCED_TEMPLATE
+from generator.dashboard_generator import DashboardGenerator, render_json
+from generator.env_generator import render_env_file, render_setup_instructions
+from generator.exporter_settings import load_exporter_settings
+from generator.output_writer import content_hash
+from generator.recording_rules import RULES_FILE_NAME
+from generator.spanmetrics import spanmetrics_settings
+from generator.templates import get_template
+
+SNAPSHOT_DIR = Path("output/snapshots")
+FLEET_OUTPUT_DIR = Path("output/fleet")
+
+_UNSAFE_HOST_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+# Per-worker state, set once by _init_worker so templates are loaded and
+# compiled once per process rather than once per host.
+_worker: Dict[str, Any] = {}
+
+
+def host_dir_name(host: str) -> str:
+    """Host name made safe to use as a single path component (no separators, no leading dots)."""
+    return _UNSAFE_HOST_CHARS.sub("_", host).lstrip(".") or "_"
+
+
+def save_snapshot(services: Dict[str, List[Any]], host: Optional[str] = None,
+                  snapshot_dir: str = str(SNAPSHOT_DIR)) -> str:
+    """Save a discovery result so the host can be re-rendered later without rescanning it."""
+    host = host or socket.gethostname()
+    path = Path(snapshot_dir) / f"{host_dir_name(host)}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"host": host, "services": services}, f, indent=2, sort_keys=True, default=str)
+    return str(path)
+
+
+def load_snapshots(snapshot_dir: str = str(SNAPSHOT_DIR)) -> List[Tuple[str, Dict[str, List[Any]]]]:
+    """Load (host, services) pairs from *.json snapshots, sorted by host."""
+    snapshots = []
+    for path in sorted(Path(snapshot_dir).glob("*.json")):
+        with open(path) as f:
+            data = json.load(f)
+        if "services" in data:
+            snapshots.append((data.get("host") or path.stem, data["services"]))
+        else:
+            # Bare discovery output (what detect_services returns)
+            snapshots.append((path.stem, data))
+    return snapshots
+
+
+def _init_worker(exporter_settings: Dict[str, Dict[str, Any]]) -> None:
+    _worker["template"] = get_template(ENHANCED_TEMPLATE)
+    _worker["exporter_settings"] = exporter_settings
+    _worker["verified"] = set()
+
+
+def render_host(services: Dict[str, List[Any]]) -> Dict[str, str]:
+    """Render every output for one host into memory: collector config, env files and dashboards."""
+    outputs = {
+        "otel-collector-config.yaml": _worker["template"].render(
+            services=services, exporters=ENHANCED_EXPORTERS,
+            exporter_settings=_worker["exporter_settings"],
+            spanmetrics=spanmetrics_settings(services)),
+        "otel-config.env": render_env_file(services),
+        "setup-instructions.md": render_setup_instructions(services),
+    }
+    dashboards = DashboardGenerator()
+    for spec, dashboard in dashboards.build_dashboards(services):
+        outputs[f"dashboards/{spec.file_name}"] = render_json(dashboard)
+    outputs[f"dashboards/{RULES_FILE_NAME}"] = dashboards.recording_rules.to_yaml()
+    return outputs
+
+
+def _store_object(store: Path, data: bytes) -> Tuple[Path, bool]:
+    """Put `data` in the content-addressed store; returns its path and whether it was (re)written.
+
+    Objects are read-only because every host sharing them is a hard link. An
+    existing object is checked against its digest once per worker and replaced
+    if its content was changed in place.
+    """
+    digest = content_hash(data)
+    path = store / digest[:2] / digest
+    verified = _worker.setdefault("verified", set())
+    if digest in verified:
+        return path, False
+    if path.exists() and content_hash(path.read_bytes()) == digest:
+        verified.add(digest)
+        return path, False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(tmp_name, 0o444)
+    # Another worker may have stored the same object meanwhile; the content is identical either way.
+    os.replace(tmp_name, path)
+    verified.add(digest)
+    return path, True
+
+
+def _link(source: Path, target: Path) -> None:
+    """Atomically point `target` at a store object (hard link, copy where links are unsupported)."""
+    if target.exists() and os.path.samefile(source, target):
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(source, tmp)
+    except OSError:
+        tmp.write_bytes(source.read_bytes())
+    os.replace(tmp, target)
+
+
+def _render_and_store(job: Tuple[str, Dict[str, List[Any]], str]) -> Dict[str, Any]:
+    host, services, output_dir = job
+    store = Path(output_dir) / "store"
+    host_dir = Path(output_dir) / "hosts" / host_dir_name(host)
+    files, new_objects, rendered_bytes = {}, 0, 0
+    for name, content in render_host(services).items():
+        data = content.encode("utf-8")
+        rendered_bytes += len(data)
+        obj, created = _store_object(store, data)
+        new_objects += created
+        _link(obj, host_dir / name)
+        files[name] = obj.name
+    return {"host": host, "files": files, "new_objects": new_objects, "bytes": rendered_bytes}
+
+
+class BatchRenderer:
+    """Render collector configs, env files and dashboards for a whole fleet.
+
+    Hosts are rendered in a process pool whose workers load the Jinja templates
+    once at start-up. Every rendered file goes into a content-addressed store
+    (store/<sha[:2]>/<sha256>) and is hard-linked into hosts/<host>/, so hosts
+    with identical configs share one copy on disk. index.json maps each host's
+    files to their hashes.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunksize: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+
+    def render(self, snapshots: List[Tuple[str, Dict[str, List[Any]]]],
+               output_dir: str = str(FLEET_OUTPUT_DIR)) -> Dict[str, Any]:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        dir_names: Dict[str, str] = {}
+        for host, _ in snapshots:
+            other = dir_names.setdefault(host_dir_name(host), host)
+            if other != host:
+                raise ValueError(f"Hosts {other!r} and {host!r} both map to hosts/{host_dir_name(host)}")
+        jobs = [(host, services, output_dir) for host, services in snapshots]
+        settings = load_exporter_settings()
+        # Compile in the parent too, so forked workers inherit the compiled template.
+        get_template(ENHANCED_TEMPLATE)
+        start = time.perf_counter()
+        if self.workers == 1:
+            _init_worker(settings)
+            results = [_render_and_store(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(settings,)) as pool:
+                results = list(pool.map(_render_and_store, jobs, chunksize=self.chunksize))
+        elapsed = time.perf_counter() - start
+        self._prune_hosts(Path(output_dir) / "hosts", set(dir_names))
+
+        index = {r["host"]: r["files"] for r in results}
+        pruned = self._prune_store(Path(output_dir) / "store", {d for files in index.values() for d in files.values()})
+        with open(Path(output_dir) / "index.json", "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        total_files = sum(len(r["files"]) for r in results)
+        unique = len({digest for files in index.values() for digest in files.values()})
+        return {
+            "hosts": len(results),
+            "workers": self.workers,
+            "seconds": round(elapsed, 3),
+            "hosts_per_sec": round(len(results) / elapsed, 1) if elapsed else 0.0,
+            "files": total_files,
+            "unique_objects": unique,
+            "new_objects": sum(r["new_objects"] for r in results),
+            "pruned_objects": pruned,
+            "rendered_bytes": sum(r["bytes"] for r in results),
+        }
+
+    @staticmethod
+    def _prune_hosts(hosts_dir: Path, keep: Set[str]) -> None:
+        """Remove host directories left over from hosts no longer in the fleet."""
+        if not hosts_dir.is_dir():
+            return
+        for path in hosts_dir.iterdir():
+            if path.name not in keep:
+                if path.is_dir() and not path.is_symlink():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+
+    @staticmethod
+    def _prune_store(store: Path, keep: Set[str]) -> int:
+        """Delete store objects no host references any more; returns how many were removed."""
+        pruned = 0
+        if not store.is_dir():
+            return pruned
+        for path in store.glob("*/*"):
+            if path.name not in keep:
+                path.unlink()
+                pruned += 1
+        return pruned
@@ -1,332 +1,214 @@
 import json
 from pathlib import Path
-from typing import Dict, List, Any
-from jinja2 import Environment, FileSystemLoader
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from generator.output_writer import OutputWriter
+from generator.dashboard_specs import DASHBOARD_SPECS, SPECS_BY_KEY, DashboardSpec, QuerySpec
+from generator.query_cost import DEFAULT_MAX_QUERY_COST, SERVICE_VARIABLE, QueryCostAnalyzer, service_variable
+from generator.recording_rules import RULES_FILE_NAME, RecordingRuleSet, select
+from generator.spanmetrics import (
+    LANGUAGE_KEYS,
+    RED_LABELS,
+    error_rate_query,
+    language_matcher,
+    latency_bucket_rate_query,
+    request_rate_query,
+)
+
+# Short label names used in the `level` part of recorded series (level:metric:operations).
+RULE_LEVEL_ALIASES = {"service_name": "service", "service_language": "language"}
+
+
+def render_json(data: Dict[str, Any]) -> str:
+    """Serialize generated JSON identically on every run so regenerated files diff cleanly."""
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def applicable_specs(services: Dict[str, List[Any]]) -> List[DashboardSpec]:
+    """Specs with something to show: unscoped ones, or those whose discovery keys found services."""
+    return [spec for spec in DASHBOARD_SPECS
+            if not spec.service_keys or any(services.get(key) for key in spec.service_keys)]
 
-TEMPLATE_DIR = Path("templates")
 
 class DashboardGenerator:
-    def __init__(self):
-        self.env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    def __init__(self, max_query_cost: Optional[float] = DEFAULT_MAX_QUERY_COST):
+        self.recording_rules = RecordingRuleSet()
+        self.cost_analyzer = QueryCostAnalyzer(max_query_cost=max_query_cost)
+        self.cost_report: Dict[str, Any] = {"dashboards": [], "recording_rules": []}
+
+    def _request_rate_record(self) -> str:
+        return self.recording_rules.record(
+            "service_language:traces_span_metrics_calls:rate5m", request_rate_query(by=RED_LABELS))
+
+    def _request_rate(self, matcher: str = "") -> str:
+        return f"sum by (service_name) ({select(self._request_rate_record(), matcher)})"
+
+    def _error_rate(self, matcher: str = "") -> str:
+        record = self.recording_rules.record(
+            "service_language:traces_span_metrics_errors:rate5m", error_rate_query(by=RED_LABELS))
+        return f"sum by (service_name) ({select(record, matcher)})"
+
+    def _latency_quantile(self, quantile: float, matcher: str = "") -> str:
+        record = self.recording_rules.record(
+            "service_language_le:traces_span_metrics_duration_milliseconds_bucket:rate5m",
+            latency_bucket_rate_query(by=RED_LABELS))
+        return f"histogram_quantile({quantile}, sum by (service_name, le) ({select(record, matcher)}))"
+
+    def _service_count(self, matcher: str = "") -> str:
+        # Services with server traffic in the last 5m, from the recorded request rate.
+        return f"count(sum by (service_name) ({select(self._request_rate_record(), matcher)}))"
+
+    def _recorded_sum(self, metric: str, labels: List[str], matcher: str = "", rate: bool = False) -> str:
+        """Record `sum by (labels)` of a raw (or rated) metric and query it by service."""
+        inner = f"rate({metric}[5m])" if rate else metric
+        level = "_".join(RULE_LEVEL_ALIASES.get(label, label) for label in labels)
+        record = self.recording_rules.record(
+            f"{level}:{metric}:{'rate5m' if rate else 'sum'}", f"sum by ({', '.join(labels)}) ({inner})")
+        return f"sum by (service_name) ({select(record, matcher)})"
         
-    def generate_overview_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
-        """Generate a high-level overview dashboard."""
-        dashboard = {
-            "dashboard": {
-                "title": "OpenTelemetry Overview",
-                "description": "High-level overview of all telemetry data",
-                "panels": [
-                    {
-                        "title": "Service Overview",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "count(service_name)",
-                                "legendFormat": "Total Services"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Request Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Error Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{status_code=~\"5..\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
+    def _service_names(self, services: Dict[str, List[Any]], keys: List[str]) -> List[str]:
+        """Distinct discovered service names for the given discovery keys, sorted for stable output."""
+        names = {}
+        for key in keys:
+            for service in services.get(key, []):
+                if isinstance(service, dict) and service.get("name"):
+                    names[str(service["name"])] = None
+        return sorted(names)
+
+    def _service_variable(self, spec: DashboardSpec, service_names: List[str]) -> Dict[str, Any]:
+        """Grafana `service` variable, pre-populated with discovered names and refreshed from Prometheus.
+
+        Dashboards with repeated panels default to the first service rather than
+        All, which would repeat every panel once per service on first load.
+        """
+        language = language_matcher(spec.language) if spec.language else ""
+        query = f"label_values({select(self._request_rate_record(), language)}, service_name)"
+        repeats = any(panel.repeat_per_service for panel in spec.panels)
+        return service_variable(query, service_names, service_names[0] if repeats and service_names else None)
+
+    def _target_expr(self, spec: DashboardSpec, query: QuerySpec) -> str:
+        service = f'service_name=~"${SERVICE_VARIABLE}"'
+        language = language_matcher(spec.language) if spec.language else ""
+        red_scope = ",".join(m for m in (language, service) if m)
+        if query.kind == "request_rate":
+            return self._request_rate(red_scope)
+        if query.kind == "error_rate":
+            return self._error_rate(red_scope)
+        if query.kind == "latency":
+            return self._latency_quantile(query.quantile, red_scope)
+        if query.kind == "service_count":
+            return self._service_count(red_scope)
+        if query.kind == "recorded_sum":
+            matcher = ",".join(m for m in (query.matcher, service) if m)
+            return self._recorded_sum(query.metric, list(query.labels), matcher, rate=query.rate)
+        if query.kind == "recorded_count":
+            record = self.recording_rules.record(
+                f"service:{query.metric}:count", f"count by (service_name) ({query.metric})")
+            return f"sum({select(record, service)})"
+        raise ValueError(f"Unknown panel query kind: {query.kind}")
+
+    def build_dashboard(self, spec: DashboardSpec, services: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Assemble one dashboard from its spec.
+
+        Per-service panels are emitted once and repeated by Grafana over the
+        `service` variable, so the panel count does not grow with the number of
+        discovered services; only selected services are repeated.
+        """
+        panels = []
+        for index, panel_spec in enumerate(spec.panels):
+            panel = {
+                "id": index + 1,
+                "title": panel_spec.title,
+                "type": panel_spec.type,
+                "gridPos": {"h": 8, "w": 12, "x": (index % 2) * 12, "y": (index // 2) * 8},
+                "targets": [
                     {
-                        "title": "Response Time",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "histogram_quantile(0.95, rate(http_request_duration_seconds_bucket[5m]))",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
+                        "expr": self._target_expr(spec, panel_spec.query),
+                        "legendFormat": panel_spec.legend
                     }
                 ]
             }
-        }
-        return dashboard
-    
-    def generate_python_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
-        """Generate a Python-specific dashboard."""
-        dashboard = {
+            if panel_spec.repeat_per_service:
+                panel["repeat"] = SERVICE_VARIABLE
+                panel["repeatDirection"] = "h"
+                panel["maxPerRow"] = 4
+            panels.append(panel)
+
+        keys = list(spec.service_keys) or LANGUAGE_KEYS
+        return {
             "dashboard": {
-                "title": "Python Services",
-                "description": "Python application telemetry",
-                "panels": [
-                    {
-                        "title": "Python Services",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "count(service_name{service_language=\"python\"})",
-                                "legendFormat": "Python Services"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Python Request Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{service_language=\"python\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Python Error Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{service_language=\"python\",status_code=~\"5..\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Python Memory Usage",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "process_resident_memory_bytes{service_language=\"python\"}",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    }
-                ]
+                "uid": f"otel-{spec.key}",
+                "title": spec.title,
+                "description": spec.description,
+                "templating": {"list": [self._service_variable(spec, self._service_names(services, keys))]},
+                "panels": panels
             }
         }
-        return dashboard
-    
+
+    def build_dashboards(self, services: Dict[str, List[Any]],
+                         keys: Optional[Iterable[str]] = None) -> List[Tuple[DashboardSpec, Dict[str, Any]]]:
+        """Build every applicable dashboard (or only the specs in `keys`) in memory, with expensive queries rewritten."""
+        self.cost_report["dashboards"] = []
+        built = []
+        for spec in applicable_specs(services):
+            if keys is not None and spec.key not in keys:
+                continue
+            dashboard = self.build_dashboard(spec, services)
+            report = self.cost_analyzer.optimize_dashboard(dashboard)
+            self.cost_report["dashboards"].append(report)
+            flagged = [p for p in report["panels"] if p["issues"]]
+            if flagged:
+                print(f"⚠️  Rewrote {len(flagged)} expensive quer{'y' if len(flagged) == 1 else 'ies'} in {report['title']}")
+            built.append((spec, dashboard))
+        return built
+
+    def generate_overview_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Generate a high-level overview dashboard."""
+        return self.build_dashboard(SPECS_BY_KEY["overview"], services)
+
+    def generate_python_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Generate a Python-specific dashboard."""
+        return self.build_dashboard(SPECS_BY_KEY["python"], services)
+
     def generate_nodejs_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
         """Generate a Node.js-specific dashboard."""
-        dashboard = {
-            "dashboard": {
-                "title": "Node.js Services",
-                "description": "Node.js application telemetry",
-                "panels": [
-                    {
-                        "title": "Node.js Services",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "count(service_name{service_language=\"nodejs\"})",
-                                "legendFormat": "Node.js Services"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Node.js Request Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{service_language=\"nodejs\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Node.js Error Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{service_language=\"nodejs\",status_code=~\"5..\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Node.js Event Loop Lag",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "nodejs_eventloop_lag_seconds{service_language=\"nodejs\"}",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-        return dashboard
-    
+        return self.build_dashboard(SPECS_BY_KEY["nodejs"], services)
+
     def generate_java_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
         """Generate a Java-specific dashboard."""
-        dashboard = {
-            "dashboard": {
-                "title": "Java Services",
-                "description": "Java application telemetry",
-                "panels": [
-                    {
-                        "title": "Java Services",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "count(service_name{service_language=\"java\"})",
-                                "legendFormat": "Java Services"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Java Request Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{service_language=\"java\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Java Heap Memory",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "jvm_memory_used_bytes{area=\"heap\",service_language=\"java\"}",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Java GC Duration",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(jvm_gc_collection_seconds_sum{service_language=\"java\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-        return dashboard
-    
+        return self.build_dashboard(SPECS_BY_KEY["java"], services)
+
     def generate_infrastructure_dashboard(self, services: Dict[str, List[Any]]) -> Dict[str, Any]:
         """Generate an infrastructure dashboard."""
-        dashboard = {
-            "dashboard": {
-                "title": "Infrastructure",
-                "description": "Infrastructure and system metrics",
-                "panels": [
-                    {
-                        "title": "Database Connections",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(db_connections_total[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Message Queue Rate",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(message_queue_messages_total[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Web Server Requests",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(http_requests_total{job=~\"nginx|apache\"}[5m])",
-                                "legendFormat": "{{service_name}}"
-                            }
-                        ]
-                    },
-                    {
-                        "title": "Docker Containers",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "count(container_cpu_usage_seconds_total)",
-                                "legendFormat": "Running Containers"
-                            }
-                        ]
-                    }
-                ]
-            }
-        }
-        return dashboard
-    
+        return self.build_dashboard(SPECS_BY_KEY["infrastructure"], services)
+
     def generate_all_dashboards(self, services: Dict[str, List[Any]], output_dir: str = "output/dashboards") -> List[str]:
         """Generate all dashboard files based on discovered services."""
         print("📊 Generating Grafana dashboards...")
         
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        
         generated_files = []
+        writer = OutputWriter(output_dir)
         
-        # Always generate overview dashboard
-        overview_dashboard = self.generate_overview_dashboard(services)
-        overview_file = output_path / "overview-dashboard.json"
-        with open(overview_file, "w") as f:
-            json.dump(overview_dashboard, f, indent=2)
-        generated_files.append(str(overview_file))
-        print(f"✅ Generated overview dashboard: {overview_file}")
-        
-        # Generate language-specific dashboards if services are detected
-        if services.get("python"):
-            python_dashboard = self.generate_python_dashboard(services)
-            python_file = output_path / "python-services-dashboard.json"
-            with open(python_file, "w") as f:
-                json.dump(python_dashboard, f, indent=2)
-            generated_files.append(str(python_file))
-            print(f"✅ Generated Python dashboard: {python_file}")
-        
-        if services.get("node"):
-            nodejs_dashboard = self.generate_nodejs_dashboard(services)
-            nodejs_file = output_path / "nodejs-services-dashboard.json"
-            with open(nodejs_file, "w") as f:
-                json.dump(nodejs_dashboard, f, indent=2)
-            generated_files.append(str(nodejs_file))
-            print(f"✅ Generated Node.js dashboard: {nodejs_file}")
+        for spec, dashboard in self.build_dashboards(services):
+            generated_files.append(writer.write(spec.file_name, render_json(dashboard)))
+            print(f"✅ Generated {spec.label} dashboard: {generated_files[-1]}")
         
-        if services.get("java"):
-            java_dashboard = self.generate_java_dashboard(services)
-            java_file = output_path / "java-services-dashboard.json"
-            with open(java_file, "w") as f:
-                json.dump(java_dashboard, f, indent=2)
-            generated_files.append(str(java_file))
-            print(f"✅ Generated Java dashboard: {java_file}")
+        # Recording rules backing the panels above (shared expressions recorded once)
+        generated_files.append(writer.write(RULES_FILE_NAME, self.recording_rules.to_yaml()))
+        print(f"✅ Generated {len(self.recording_rules.rules)} Prometheus recording rules: {generated_files[-1]}")
         
-        # Generate infrastructure dashboard if infrastructure services are detected
-        infra_services = ["databases", "message_queues", "web_servers", "docker", "kubernetes"]
-        if any(services.get(service) for service in infra_services):
-            infra_dashboard = self.generate_infrastructure_dashboard(services)
-            infra_file = output_path / "infrastructure-dashboard.json"
-            with open(infra_file, "w") as f:
-                json.dump(infra_dashboard, f, indent=2)
-            generated_files.append(str(infra_file))
-            print(f"✅ Generated infrastructure dashboard: {infra_file}")
+        # Query cost report for panels and recording rules
+        self.cost_report["recording_rules"] = self.cost_analyzer.analyze_rules(
+            self.recording_rules.to_dict()["groups"][0]["rules"])
+        generated_files.append(writer.write("query-cost-report.json", render_json(self.cost_report)))
+        print(f"✅ Generated query cost report: {generated_files[-1]}")
         
         # Generate import instructions
-        instructions_file = output_path / "dashboard-import-instructions.md"
-        with open(instructions_file, "w") as f:
-            f.write(self._generate_import_instructions(generated_files))
-        generated_files.append(str(instructions_file))
-        print(f"✅ Generated import instructions: {instructions_file}")
+        instructions = self._generate_import_instructions(generated_files)
+        generated_files.append(writer.write("dashboard-import-instructions.md", instructions))
+        print(f"✅ Generated import instructions: {generated_files[-1]}")
+        
+        writer.save_manifest()
+        print(writer.report())
         
         return generated_files
     
@@ -362,11 +244,29 @@ If you prefer to copy-paste:
 4. Paste the JSON into the **Import via panel json** field
 5. Click **Import**
 
+## Prometheus Recording Rules
+
+The panels query precomputed series from `recording-rules.yaml` instead of running
+`rate(...)`/`histogram_quantile(...)` over raw series on every refresh. Load the rules
+before importing the dashboards:
+
+```yaml
+# prometheus.yml
+rule_files:
+  - /path/to/recording-rules.yaml
+```
+
+Recorded series only exist from the moment Prometheus loads the rules, so panels fill
+in from that point on.
+
 ## Dashboard Features
 
 - **Overview Dashboard**: High-level metrics across all services
 - **Language-Specific Dashboards**: Detailed metrics for Python, Node.js, Java services
 - **Infrastructure Dashboard**: Database, message queue, and system metrics
+- **Request, error and latency panels** query the `traces_span_metrics_*` series that the
+  collector's `spanmetrics` connector derives from traces, so services do not need to
+  export their own HTTP metrics
 
 ## Customization
 
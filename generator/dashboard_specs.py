@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Declarative description of every generated Grafana dashboard. The
+# DashboardGenerator turns these specs into dashboard JSON; adding a panel or
+# a language dashboard means adding data here, not another method.
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """What a panel plots.
+
+    kind is one of:
+      request_rate / error_rate / latency / service_count - spanmetrics RED series
+      recorded_sum   - sum by service of a recorded raw (or rated) metric
+      recorded_count - number of series of a metric, recorded per service
+    """
+    kind: str
+    metric: str = ""
+    labels: Tuple[str, ...] = ("service_name",)
+    matcher: str = ""
+    rate: bool = False
+    quantile: float = 0.95
+
+
+@dataclass(frozen=True)
+class PanelSpec:
+    title: str
+    type: str
+    query: QuerySpec
+    legend: str = "{{service_name}}"
+    # Repeat the panel once per selected $service instead of emitting one panel per service.
+    repeat_per_service: bool = False
+
+
+@dataclass(frozen=True)
+class DashboardSpec:
+    key: str
+    title: str
+    description: str
+    file_name: str
+    label: str
+    # Discovery keys that enable the dashboard; empty means always generated.
+    service_keys: Tuple[str, ...] = ()
+    # telemetry.sdk.language value used to scope spanmetrics panels.
+    language: Optional[str] = None
+    panels: Tuple[PanelSpec, ...] = ()
+
+
+def _runtime(metric: str, language: str, extra_labels: Tuple[str, ...] = (), extra_matcher: str = "",
+             rate: bool = False) -> QuerySpec:
+    matcher = ",".join(m for m in (extra_matcher, f'service_language="{language}"') if m)
+    return QuerySpec("recorded_sum", metric, ("service_name", "service_language") + extra_labels, matcher, rate)
+
+
+def _language_dashboard(key: str, label: str, language: str, service_key: str,
+                        runtime_panels: Tuple[PanelSpec, ...], include_errors: bool = True) -> DashboardSpec:
+    panels = [
+        PanelSpec(f"{label} Services", "stat", QuerySpec("service_count"), legend=f"{label} Services"),
+        PanelSpec(f"{label} Request Rate", "timeseries", QuerySpec("request_rate"), repeat_per_service=True),
+    ]
+    if include_errors:
+        panels.append(PanelSpec(f"{label} Error Rate", "timeseries", QuerySpec("error_rate"), repeat_per_service=True))
+    return DashboardSpec(
+        key=key,
+        title=f"{label} Services",
+        description=f"{label} application telemetry",
+        file_name=f"{key}-services-dashboard.json",
+        label=label,
+        service_keys=(service_key,),
+        language=language,
+        panels=tuple(panels) + runtime_panels,
+    )
+
+
+DASHBOARD_SPECS: Tuple[DashboardSpec, ...] = (
+    DashboardSpec(
+        key="overview",
+        title="OpenTelemetry Overview",
+        description="High-level overview of all telemetry data",
+        file_name="overview-dashboard.json",
+        label="overview",
+        panels=(
+            PanelSpec("Service Overview", "stat", QuerySpec("service_count"), legend="Total Services"),
+            PanelSpec("Request Rate", "timeseries", QuerySpec("request_rate")),
+            PanelSpec("Error Rate", "timeseries", QuerySpec("error_rate")),
+            PanelSpec("Response Time", "timeseries", QuerySpec("latency", quantile=0.95)),
+        ),
+    ),
+    _language_dashboard("python", "Python", "python", "python", (
+        PanelSpec("Python Memory Usage", "timeseries",
+                  _runtime("process_resident_memory_bytes", "python"), repeat_per_service=True),
+    )),
+    _language_dashboard("nodejs", "Node.js", "nodejs", "node", (
+        PanelSpec("Node.js Event Loop Lag", "timeseries",
+                  _runtime("nodejs_eventloop_lag_seconds", "nodejs"), repeat_per_service=True),
+    )),
+    _language_dashboard("java", "Java", "java", "java", (
+        PanelSpec("Java Heap Memory", "timeseries",
+                  _runtime("jvm_memory_used_bytes", "java", ("area",), 'area="heap"'), repeat_per_service=True),
+        PanelSpec("Java GC Duration", "timeseries",
+                  _runtime("jvm_gc_collection_seconds_sum", "java", rate=True), repeat_per_service=True),
+    ), include_errors=False),
+    DashboardSpec(
+        key="infrastructure",
+        title="Infrastructure",
+        description="Infrastructure and system metrics",
+        file_name="infrastructure-dashboard.json",
+        label="infrastructure",
+        service_keys=("databases", "message_queues", "web_servers", "docker", "kubernetes"),
+        panels=(
+            PanelSpec("Database Connections", "timeseries",
+                      QuerySpec("recorded_sum", "db_connections_total", rate=True)),
+            PanelSpec("Message Queue Rate", "timeseries",
+                      QuerySpec("recorded_sum", "message_queue_messages_total", rate=True)),
+            PanelSpec("Web Server Requests", "timeseries",
+                      QuerySpec("recorded_sum", "http_requests_total", ("service_name", "job"), 'job=~"nginx|apache"', rate=True)),
+            PanelSpec("Docker Containers", "stat",
+                      QuerySpec("recorded_count", "container_cpu_usage_seconds_total"), legend="Running Containers"),
+        ),
+    ),
+)
+
+SPECS_BY_KEY: Dict[str, DashboardSpec] = {spec.key: spec for spec in DASHBOARD_SPECS}
@@ -1,9 +1,9 @@
 import os
-from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from generator.output_writer import OutputWriter
 
-def generate_env_file(services: Dict[str, List[Any]], output_dir: str = "output") -> str:
-    """Generate a .env file with OpenTelemetry configuration for discovered services."""
+def render_env_file(services: Dict[str, List[Any]]) -> str:
+    """Render the .env file content for discovered services."""
     env_content = """# OpenTelemetry Configuration for Discovered Services
 # Generated by otel-integrator-OPD
 
@@ -81,16 +81,19 @@ OTEL_DOTNET_TRACES_SAMPLER_ARG=1.0
                 env_content += f"# {service.get('name', service.get('kind', 'Unknown'))} (PID: {service.get('pid', 'N/A')})\n"
             else:
                 env_content += f"# {service}\n"
-    
-    # Write to file
-    env_path = Path(output_dir) / "otel-config.env"
-    with open(env_path, "w") as f:
-        f.write(env_content)
-    
-    return str(env_path)
+    return env_content
 
-def generate_setup_instructions(services: Dict[str, List[Any]], output_dir: str = "output") -> str:
-    """Generate setup instructions for discovered services."""
+def generate_env_file(services: Dict[str, List[Any]], output_dir: str = "output",
+                      writer: Optional[OutputWriter] = None) -> str:
+    """Generate a .env file with OpenTelemetry configuration for discovered services."""
+    env_content = render_env_file(services)
+    if writer is None:
+        with OutputWriter(output_dir) as writer:
+            return writer.write("otel-config.env", env_content)
+    return writer.write("otel-config.env", env_content)
+
+def render_setup_instructions(services: Dict[str, List[Any]]) -> str:
+    """Render setup instructions for discovered services."""
     instructions = """# OpenTelemetry Setup Instructions
 # Generated by otel-integrator-OPD
 
@@ -199,18 +202,23 @@ environment:
 - Ensure the collector is running and accessible
 - Check that your backend services are running
 """
-    
-    # Write to file
-    instructions_path = Path(output_dir) / "setup-instructions.md"
-    with open(instructions_path, "w") as f:
-        f.write(instructions)
-    
-    return str(instructions_path)
+    return instructions
+
+def generate_setup_instructions(services: Dict[str, List[Any]], output_dir: str = "output",
+                                writer: Optional[OutputWriter] = None) -> str:
+    """Generate setup instructions for discovered services."""
+    instructions = render_setup_instructions(services)
+    if writer is None:
+        with OutputWriter(output_dir) as writer:
+            return writer.write("setup-instructions.md", instructions)
+    return writer.write("setup-instructions.md", instructions)
 
 def generate_all_env_outputs(services: Dict[str, List[Any]], output_dir: str = "output") -> Dict[str, str]:
     """Generate all environment and setup files."""
-    env_file = generate_env_file(services, output_dir)
-    instructions_file = generate_setup_instructions(services, output_dir)
+    with OutputWriter(output_dir) as writer:
+        env_file = generate_env_file(services, output_dir, writer)
+        instructions_file = generate_setup_instructions(services, output_dir, writer)
+    print(writer.report())
     
     return {
         "env_file": env_file,
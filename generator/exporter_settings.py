@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+EXPORTER_SETTINGS_FILE = Path("output/exporter-settings.json")
+
+# Per-exporter knobs rendered into the comprehensive collector template.
+# Benchmarks and probes overwrite individual keys via save_exporter_settings().
+DEFAULT_EXPORTER_SETTINGS: Dict[str, Dict[str, Any]] = {
+    name: {"transport": "otlphttp", "compression": "gzip",
+           "num_consumers": 10, "queue_size": 10000, "send_batch_size": 1024}
+    for name in ("elastic", "grafana", "influxdb")
+}
+
+# What each backend accepts. Only codecs/transports listed here are ever selected.
+EXPORTER_CAPABILITIES: Dict[str, Dict[str, Any]] = {
+    "elastic": {"transports": ["otlphttp", "otlp"], "codecs": ["gzip", "none"], "signals": ["traces", "logs"]},
+    "grafana": {"transports": ["otlphttp"], "codecs": ["gzip", "zstd", "snappy", "none"], "signals": ["traces", "metrics"]},
+    "influxdb": {"transports": ["otlphttp"], "codecs": ["gzip", "none"], "signals": ["metrics"]},
+}
+
+# Settings that only apply to one transport; they are dropped when the transport changes.
+TRANSPORT_KEYS: Dict[str, List[str]] = {"otlp": ["keepalive"], "otlphttp": ["http_client"]}
+
+
+def load_exporter_settings(path: Path = EXPORTER_SETTINGS_FILE) -> Dict[str, Dict[str, Any]]:
+    """Return the default exporter settings overlaid with any measured ones saved at `path`."""
+    settings = {name: dict(values) for name, values in DEFAULT_EXPORTER_SETTINGS.items()}
+    path = Path(path)
+    if path.exists():
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable exporter settings {path}: {e}")
+            return settings
+        for name, values in saved.get("exporters", {}).items():
+            settings.setdefault(name, {}).update(values)
+    return settings
+
+
+def save_exporter_settings(updates: Dict[str, Dict[str, Any]], source: str,
+                           path: Path = EXPORTER_SETTINGS_FILE) -> str:
+    """Merge `updates` into the saved exporter settings, recording which command produced them."""
+    path = Path(path)
+    saved: Dict[str, Any] = {"exporters": {}, "sources": {}}
+    if path.exists():
+        try:
+            with open(path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            pass
+    exporters = saved.setdefault("exporters", {})
+    for name, values in updates.items():
+        current = exporters.setdefault(name, {})
+        transport = values.get("transport")
+        if transport and transport != current.get("transport"):
+            for other, keys in TRANSPORT_KEYS.items():
+                if other != transport:
+                    for key in keys:
+                        current.pop(key, None)
+        current.update(values)
+    saved.setdefault("sources", {})[source] = sorted(updates)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(saved, f, indent=2, sort_keys=True)
+    return str(path)
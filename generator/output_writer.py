@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_NAME = ".otel-integrator-manifest.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class OutputWriter:
+    """Write generated files only when their content changed.
+
+    Content is rendered in memory and hashed; the hash, size and mtime of every
+    file written are kept in a manifest next to the outputs. A file is rewritten
+    only when its new hash differs from what is on disk, so unchanged configs do
+    not trigger collector reloads, Grafana provisioning rescans or git churn.
+    Writes go to a temp file in the same directory followed by os.replace, so
+    readers never see a half-written file.
+    """
+
+    def __init__(self, output_dir: str, manifest_name: str = MANIFEST_NAME):
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / manifest_name
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _current_hash(self, name: str, path: Path) -> Optional[str]:
+        """Hash of the file on disk, trusting the manifest while size and mtime still match."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        entry = self.manifest.get(name)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["sha256"]
+        # Edited or never tracked: hash what is actually there.
+        return content_hash(path.read_bytes())
+
+    def write(self, name: str, content: str) -> str:
+        """Write `content` to `output_dir/name` if it differs from the file on disk; returns the path."""
+        path = self.output_dir / name
+        data = content.encode("utf-8")
+        digest = content_hash(data)
+        if self._current_hash(name, path) == digest:
+            self.unchanged.append(str(path))
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(path, data)
+            self.written.append(str(path))
+        stat = path.stat()
+        self.manifest[name] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        return str(path)
+
+    def _atomic_write(self, path: Path, data: bytes) -> None:
+        mode = path.stat().st_mode & 0o777 if path.exists() else 0o644
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_name, mode)
+            os.replace(tmp_name, path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def save_manifest(self) -> None:
+        data = (json.dumps({"files": dict(sorted(self.manifest.items()))}, indent=2) + "\n").encode("utf-8")
+        try:
+            if self.manifest_path.read_bytes() == data:
+                return
+        except FileNotFoundError:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(self.manifest_path, data)
+
+    def summary(self) -> Dict[str, Any]:
+        return {"written": list(self.written), "unchanged": list(self.unchanged)}
+
+    def report(self) -> str:
+        return f"💾 {self.output_dir}: {len(self.written)} written, {len(self.unchanged)} unchanged"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save_manifest()
+        return False
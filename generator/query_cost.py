@@ -0,0 +1,449 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# --- Cost model -------------------------------------------------------------
+# Costs are "samples touched per dashboard refresh": series selected x samples
+# per series in the range window x evaluation steps across the panel's time range.
+SCRAPE_INTERVAL_SECONDS = 15
+RAW_SERIES_PER_METRIC = 5000        # assumed series behind an unfiltered raw metric
+RECORDED_SERIES_PER_METRIC = 200    # recorded series are pre-aggregated per service
+MATCHER_SELECTIVITY = {"=": 0.1, "=~": 0.3, "!=": 0.9, "!~": 0.9}
+VARIABLE_SELECTIVITY = 0.1          # a Grafana variable typically narrows to one service
+RATE_INTERVAL_SECONDS = 4 * SCRAPE_INTERVAL_SECONDS  # what $__rate_interval resolves to
+DASHBOARD_RANGE_SECONDS = 6 * 3600  # Grafana's default "now-6h"
+
+DEFAULT_MAX_DATA_POINTS = 500
+DEFAULT_PANEL_INTERVAL = "1m"
+DEFAULT_MAX_QUERY_COST = 10_000_000
+# Windows up to this long are "recent rate" windows and safe to replace with $__rate_interval;
+# longer ones are deliberate smoothing and only flagged.
+MAX_REWRITABLE_RANGE_SECONDS = 300
+
+SERVICE_VARIABLE = "service"
+SERVICE_MATCHER = ("service_name", "=~", f"${SERVICE_VARIABLE}")
+
+AGGREGATIONS = {"sum", "count", "avg", "min", "max", "stddev", "stdvar", "topk", "bottomk", "quantile", "group", "count_values"}
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800, "y": 31536000}
+
+
+class QueryCostExceeded(ValueError):
+    """Raised when a generated panel query is estimated to cost more than the configured ceiling."""
+
+
+class UnsupportedQuery(ValueError):
+    """Raised for PromQL this parser does not model; such queries are left untouched."""
+
+
+# --- AST --------------------------------------------------------------------
+@dataclass
+class Selector:
+    metric: str
+    matchers: List[Tuple[str, str, str]] = field(default_factory=list)
+    range: Optional[str] = None
+
+    @property
+    def recorded(self) -> bool:
+        # Recording rule names follow level:metric:operations.
+        return ":" in self.metric
+
+
+@dataclass
+class Call:
+    func: str
+    args: List["Node"]
+
+
+@dataclass
+class Aggregation:
+    op: str
+    args: List["Node"]
+    grouping: Optional[List[str]] = None
+    without: bool = False
+
+
+@dataclass
+class Literal:
+    text: str
+
+
+@dataclass
+class Binary:
+    op: str
+    left: "Node"
+    right: "Node"
+
+
+@dataclass
+class Paren:
+    expr: "Node"
+
+
+@dataclass
+class Unary:
+    op: str
+    expr: "Node"
+
+
+Node = Union[Selector, Call, Aggregation, Literal, Binary, Paren, Unary]
+
+TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<duration>\[[^\]]+\])
+  | (?P<number>\d+(?:\.\d+)?(?:e[+-]?\d+)?)
+  | (?P<op>=~|!~|!=|==|>=|<=|[-+*/%^<>=])
+  | (?P<punct>[(){},])
+  | (?P<ident>[A-Za-z_:$][A-Za-z0-9_:.$]*)
+""", re.VERBOSE)
+
+
+# Modifiers the AST has no place for; rewriting around them would change the query.
+UNSUPPORTED_KEYWORDS = {"offset", "bool", "on", "ignoring", "group_left", "group_right"}
+
+
+def tokenize(expr: str) -> List[Tuple[str, str]]:
+    tokens, pos = [], 0
+    while pos < len(expr):
+        match = TOKEN_RE.match(expr, pos)
+        if not match:
+            raise UnsupportedQuery(f"Cannot parse PromQL near: {expr[pos:pos + 20]!r}")
+        pos = match.end()
+        if match.lastgroup == "ident" and match.group() in UNSUPPORTED_KEYWORDS:
+            raise UnsupportedQuery(f"Unsupported PromQL modifier {match.group()!r}")
+        if match.lastgroup == "duration" and ":" in match.group():
+            raise UnsupportedQuery(f"Unsupported PromQL subquery {match.group()!r}")
+        if match.lastgroup != "ws":
+            tokens.append((match.lastgroup, match.group()))
+    return tokens
+
+
+class _Parser:
+    BINARY_OPS = {"+", "-", "*", "/", "%", "^", "==", "!=", ">", "<", ">=", "<=", "and", "or", "unless"}
+
+    def __init__(self, expr: str):
+        self.tokens = tokenize(expr)
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else ("eof", "")
+
+    def take(self, value: Optional[str] = None) -> Tuple[str, str]:
+        token = self.peek()
+        if value is not None and token[1] != value:
+            raise UnsupportedQuery(f"Expected {value!r}, got {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Node:
+        node = self.expression()
+        if self.peek()[0] != "eof":
+            raise UnsupportedQuery(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def expression(self) -> Node:
+        node = self.primary()
+        while self.peek()[1] in self.BINARY_OPS:
+            op = self.take()[1]
+            node = Binary(op, node, self.primary())
+        return node
+
+    def grouping(self) -> Tuple[List[str], bool]:
+        without = self.take()[1] == "without"
+        self.take("(")
+        labels = []
+        while self.peek()[1] != ")":
+            kind, value = self.take()
+            if kind == "ident":
+                labels.append(value)
+        self.take(")")
+        return labels, without
+
+    def args(self) -> List[Node]:
+        self.take("(")
+        args = []
+        while self.peek()[1] != ")":
+            args.append(self.expression())
+            if self.peek()[1] == ",":
+                self.take(",")
+            elif self.peek()[1] != ")":
+                raise UnsupportedQuery(f"Unexpected token {self.peek()[1]!r} in argument list")
+        self.take(")")
+        return args
+
+    def primary(self) -> Node:
+        kind, value = self.peek()
+        if value == "(":
+            self.take("(")
+            node = self.expression()
+            self.take(")")
+            return Paren(node)
+        if value in ("-", "+"):
+            self.take()
+            return Unary(value, self.primary())
+        if kind in ("number", "string"):
+            self.take()
+            return Literal(value)
+        if value == "{":
+            return self.selector("")
+        if kind != "ident":
+            raise UnsupportedQuery(f"Unexpected token {value!r}")
+        self.take()
+        if value in AGGREGATIONS and self.peek()[1] in ("(", "by", "without"):
+            grouping, without = (None, False)
+            if self.peek()[1] in ("by", "without"):
+                grouping, without = self.grouping()
+            args = self.args()
+            if self.peek()[1] in ("by", "without"):
+                grouping, without = self.grouping()
+            return Aggregation(value, args, grouping, without)
+        if self.peek()[1] == "(":
+            return Call(value, self.args())
+        return self.selector(value)
+
+    def selector(self, metric: str) -> Selector:
+        matchers = []
+        if self.peek()[1] == "{":
+            self.take("{")
+            while self.peek()[1] != "}":
+                label = self.take()[1]
+                op = self.take()[1]
+                kind, value = self.take()
+                if kind != "string" or op not in MATCHER_SELECTIVITY:
+                    raise UnsupportedQuery(f"Unsupported label matcher {label}{op}{value}")
+                matchers.append((label, op, unquote(value)))
+                if self.peek()[1] == ",":
+                    self.take(",")
+            self.take("}")
+        range_ = None
+        if self.peek()[0] == "duration":
+            range_ = self.take()[1][1:-1]
+        return Selector(metric, matchers, range_)
+
+
+def parse(expr: str) -> Node:
+    return _Parser(expr).parse()
+
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+_ESCAPE_RE = re.compile(r"\\(.)", re.S)
+
+
+def unquote(token: str) -> str:
+    """Value of a single- or double-quoted PromQL string token."""
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), token[1:-1])
+
+
+def quote(value: str) -> str:
+    """Double-quoted PromQL string for `value`."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return '"' + escaped.replace("\n", "\\n").replace("\t", "\\t").replace("\r", "\\r") + '"'
+
+
+def render(node: Node) -> str:
+    """Turn an AST back into PromQL."""
+    if isinstance(node, Selector):
+        text = node.metric
+        if node.matchers:
+            text += "{" + ",".join(f"{label}{op}{quote(value)}" for label, op, value in node.matchers) + "}"
+        if node.range:
+            text += f"[{node.range}]"
+        return text
+    if isinstance(node, Call):
+        return f"{node.func}({', '.join(render(arg) for arg in node.args)})"
+    if isinstance(node, Aggregation):
+        args = ", ".join(render(arg) for arg in node.args)
+        if node.grouping is None:
+            return f"{node.op}({args})"
+        return f"{node.op} {'without' if node.without else 'by'} ({', '.join(node.grouping)}) ({args})"
+    if isinstance(node, Binary):
+        return f"{render(node.left)} {node.op} {render(node.right)}"
+    if isinstance(node, Paren):
+        return f"({render(node.expr)})"
+    if isinstance(node, Unary):
+        return f"{node.op}{render(node.expr)}"
+    return node.text
+
+
+def selectors(node: Node) -> List[Selector]:
+    if isinstance(node, Selector):
+        return [node]
+    if isinstance(node, (Call, Aggregation)):
+        return [s for arg in node.args for s in selectors(arg)]
+    if isinstance(node, Binary):
+        return selectors(node.left) + selectors(node.right)
+    if isinstance(node, (Paren, Unary)):
+        return selectors(node.expr)
+    return []
+
+
+def duration_seconds(duration: str) -> float:
+    if duration == "$__rate_interval" or duration == "$__interval":
+        return RATE_INTERVAL_SECONDS
+    total = 0.0
+    for amount, unit in re.findall(r"(\d+(?:\.\d+)?)(ms|[smhdwy])", duration):
+        total += float(amount) * DURATION_UNITS[unit]
+    return total or RATE_INTERVAL_SECONDS
+
+
+# --- Analyzer ---------------------------------------------------------------
+class QueryCostAnalyzer:
+    """Estimate, flag and rewrite expensive PromQL in generated dashboards."""
+
+    def __init__(self, max_query_cost: Optional[float] = DEFAULT_MAX_QUERY_COST,
+                 max_data_points: int = DEFAULT_MAX_DATA_POINTS, interval: str = DEFAULT_PANEL_INTERVAL):
+        self.max_query_cost = max_query_cost
+        self.max_data_points = max_data_points
+        self.interval = interval
+
+    def selector_cost(self, selector: Selector) -> float:
+        series = RECORDED_SERIES_PER_METRIC if selector.recorded else RAW_SERIES_PER_METRIC
+        for _, op, value in selector.matchers:
+            series *= VARIABLE_SELECTIVITY if "$" in value else MATCHER_SELECTIVITY.get(op, 1.0)
+        samples = duration_seconds(selector.range) / SCRAPE_INTERVAL_SECONDS if selector.range else 1
+        return max(series, 1) * max(samples, 1)
+
+    def steps(self, panel: Dict[str, Any]) -> float:
+        interval = duration_seconds(panel.get("interval") or f"{SCRAPE_INTERVAL_SECONDS}s")
+        steps = DASHBOARD_RANGE_SECONDS / interval
+        if panel.get("maxDataPoints"):
+            steps = min(steps, panel["maxDataPoints"])
+        return steps
+
+    def issues(self, node: Node, in_panel: bool = True) -> List[str]:
+        found = []
+        for selector in selectors(node):
+            if selector.recorded:
+                continue
+            # Recording rules aggregate across all series by design; only panels must be scoped.
+            if in_panel and not selector.matchers:
+                found.append(f"unbounded selector: {selector.metric} has no label matchers")
+            if in_panel and selector.range and not selector.range.startswith("$"):
+                found.append(f"fixed range [{selector.range}] on {selector.metric}: use $__rate_interval")
+        for aggregation in self._aggregations(node):
+            raw_unbounded = [s for s in selectors(aggregation) if not s.recorded and not s.matchers]
+            if aggregation.grouping is None and raw_unbounded:
+                found.append(f"{aggregation.op}() over all series of {raw_unbounded[0].metric} without grouping")
+        return found
+
+    def _aggregations(self, node: Node) -> List[Aggregation]:
+        found = [node] if isinstance(node, Aggregation) else []
+        children = node.args if isinstance(node, (Call, Aggregation)) else \
+            [node.left, node.right] if isinstance(node, Binary) else \
+            [node.expr] if isinstance(node, (Paren, Unary)) else []
+        for child in children:
+            found.extend(self._aggregations(child))
+        return found
+
+    def expr_cost(self, expr: str) -> float:
+        return sum(self.selector_cost(s) for s in selectors(parse(expr)))
+
+    def rewrite_expr(self, expr: str) -> str:
+        """Apply panel-side fixes: $__rate_interval and a $service matcher.
+
+        Grouping is left as written; adding one would split a single-value panel per service.
+        """
+        node = parse(expr)
+        for selector in selectors(node):
+            if selector.recorded:
+                continue
+            if (selector.range and not selector.range.startswith("$")
+                    and duration_seconds(selector.range) <= MAX_REWRITABLE_RANGE_SECONDS):
+                selector.range = "$__rate_interval"
+            if not selector.matchers:
+                selector.matchers.append(SERVICE_MATCHER)
+        return render(node)
+
+    def optimize_dashboard(self, dashboard: Dict[str, Any]) -> Dict[str, Any]:
+        """Rewrite a dashboard in place and return its cost report.
+
+        Raises QueryCostExceeded when any panel stays above the ceiling after rewriting.
+        """
+        body = dashboard.get("dashboard", dashboard)
+        report = {"title": body.get("title"), "panels": []}
+        uses_service_variable = False
+        for panel in body.get("panels", []):
+            panel.setdefault("maxDataPoints", self.max_data_points)
+            panel.setdefault("interval", self.interval)
+            for target in panel.get("targets", []):
+                original = target["expr"]
+                try:
+                    issues = self.issues(parse(original))
+                except UnsupportedQuery as e:
+                    # Left as written and not costed; the ceiling cannot be checked for it.
+                    report["panels"].append({"panel": panel.get("title"), "expr": original, "original_expr": None,
+                                             "issues": [f"unsupported: {e}"], "estimated_cost": None})
+                    continue
+                rewritten = self.rewrite_expr(original) if issues else original
+                if rewritten != original:
+                    try:
+                        parse(rewritten)
+                    except UnsupportedQuery as e:
+                        # Never ship a rewrite that does not parse back; keep the query as written.
+                        issues = issues + [f"rewrite skipped: {e}"]
+                        rewritten = original
+                target["expr"] = rewritten
+                uses_service_variable = uses_service_variable or f"${SERVICE_VARIABLE}" in rewritten
+                cost = self.expr_cost(rewritten) * self.steps(panel)
+                report["panels"].append({
+                    "panel": panel.get("title"),
+                    "expr": rewritten,
+                    "original_expr": original if rewritten != original else None,
+                    "issues": issues,
+                    "estimated_cost": int(cost),
+                })
+        if uses_service_variable:
+            self._add_service_variable(body)
+
+        if self.max_query_cost is not None:
+            over = [p for p in report["panels"]
+                    if p["estimated_cost"] is not None and p["estimated_cost"] > self.max_query_cost]
+            if over:
+                details = ", ".join(f"{p['panel']} ({p['estimated_cost']:,})" for p in over)
+                raise QueryCostExceeded(
+                    f"{body.get('title')}: panels exceed query cost ceiling {int(self.max_query_cost):,}: {details}")
+        return report
+
+    def analyze_rules(self, rules: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Cost of recording rules, evaluated once per rule interval regardless of viewers."""
+        return [
+            {
+                "record": rule["record"],
+                "issues": self.issues(parse(rule["expr"]), in_panel=False),
+                "estimated_cost_per_evaluation": int(self.expr_cost(rule["expr"])),
+            }
+            for rule in rules
+        ]
+
+    def _add_service_variable(self, body: Dict[str, Any]):
+        variables = body.setdefault("templating", {}).setdefault("list", [])
+        if any(v.get("name") == SERVICE_VARIABLE for v in variables):
+            return
+        variables.append(service_variable("label_values(service_name)"))
+
+
+def service_variable(query: str, service_names: Optional[List[str]] = None,
+                     selected: Optional[str] = None) -> Dict[str, Any]:
+    """Grafana `service` variable refreshed from `query`, optionally pre-populated with known names.
+
+    `selected` (one of `service_names`) is the default instead of All.
+    """
+    variable = {
+        "name": SERVICE_VARIABLE,
+        "label": "Service",
+        "type": "query",
+        "query": query,
+        "includeAll": True,
+        "multi": True,
+        # ".*" also matches series without a service_name label.
+        "allValue": ".*",
+        "refresh": 2,
+    }
+    if service_names is not None:
+        options = [{"text": "All", "value": "$__all", "selected": selected is None}]
+        options.extend({"text": name, "value": name, "selected": name == selected} for name in service_names)
+        variable["current"] = {"text": [selected], "value": [selected]} if selected is not None \
+            else {"text": "All", "value": "$__all"}
+        variable["options"] = options
+    return variable
@@ -0,0 +1,80 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import yaml
+
+RULES_FILE_NAME = "recording-rules.yaml"
+
+
+@dataclass(frozen=True)
+class RecordingRule:
+    record: str
+    expr: str
+
+
+def normalize_expr(expr: str) -> str:
+    """Canonical form used to spot the same expression written two ways.
+
+    Whitespace is dropped and label matchers inside each {...} block are sorted,
+    so `m{a="1", b="2"}` and `m{b="2",a="1"}` dedupe to one rule.
+    """
+    compact = re.sub(r"\s+", "", expr)
+    return re.sub(r"\{([^{}]*)\}", lambda m: "{" + ",".join(sorted(filter(None, m.group(1).split(",")))) + "}", compact)
+
+
+def select(record: str, *matchers: str) -> str:
+    """Selector for a recorded series, optionally narrowed by label matchers."""
+    present = [m for m in matchers if m]
+    return record + ("{" + ",".join(present) + "}" if present else "")
+
+
+class RecordingRuleSet:
+    """Prometheus recording rules backing the generated dashboards.
+
+    Each expensive panel expression is recorded once, aggregated by service (and
+    language where available), and dashboards query the recorded series instead.
+    Expressions shared between dashboards map to a single rule.
+    """
+
+    def __init__(self, group_name: str = "otel-integrator-dashboards", interval: str = "1m"):
+        self.group_name = group_name
+        self.interval = interval
+        self._by_expr: Dict[str, RecordingRule] = {}
+        self._by_name: Dict[str, RecordingRule] = {}
+
+    def record(self, record: str, expr: str) -> str:
+        """Register `expr` under `record` and return the series name dashboards should query."""
+        key = normalize_expr(expr)
+        if key in self._by_expr:
+            return self._by_expr[key].record
+        name = record
+        suffix = 2
+        while name in self._by_name:
+            # Same name, different expression: keep both rules distinct.
+            name = f"{record}_{suffix}"
+            suffix += 1
+        rule = RecordingRule(record=name, expr=expr)
+        self._by_expr[key] = rule
+        self._by_name[name] = rule
+        return name
+
+    @property
+    def rules(self) -> List[RecordingRule]:
+        return sorted(self._by_name.values(), key=lambda rule: rule.record)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "groups": [
+                {
+                    "name": self.group_name,
+                    "interval": self.interval,
+                    "rules": [{"record": rule.record, "expr": rule.expr} for rule in self.rules],
+                }
+            ]
+        }
+
+    def to_yaml(self) -> str:
+        header = ("# Prometheus recording rules for the generated Grafana dashboards.\n"
+                  "# Add this file to `rule_files` in prometheus.yml.\n")
+        return header + yaml.safe_dump(self.to_dict(), sort_keys=False, width=1000)
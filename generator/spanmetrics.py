@@ -0,0 +1,99 @@
+from typing import Any, Dict, List
+
+# The spanmetrics connector derives RED (rate, errors, duration) metrics from
+# spans inside the collector, so dashboards no longer depend on every service
+# exporting its own http_requests_total / http_request_duration_seconds.
+SPANMETRICS_NAMESPACE = "traces.span.metrics"
+
+# Prometheus series names after the collector's OTLP -> Prometheus translation.
+CALLS_METRIC = "traces_span_metrics_calls_total"
+DURATION_BUCKET_METRIC = "traces_span_metrics_duration_milliseconds_bucket"
+
+SERVER_SPANS = 'span_kind="SPAN_KIND_SERVER"'
+ERROR_SPANS = 'status_code="STATUS_CODE_ERROR"'
+
+# Latency buckets in ms. Fewer buckets = fewer series; the coarse set is used
+# once the estimated series count exceeds the budget.
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+COARSE_LATENCY_BUCKETS_MS = [10, 50, 250, 1000, 5000]
+
+# Extra dimensions on top of the connector's built-in service.name, span.name,
+# span.kind and status.code. Each entry is (attribute, default, expected distinct values).
+# Attributes such as http.url, http.target or user ids are deliberately never
+# added: they are unbounded and would explode the series count.
+BOUNDED_DIMENSIONS = [
+    ("telemetry.sdk.language", None, 1),
+    ("http.method", "GET", 5),
+]
+
+# Labels the recorded RED series keep, so one rule serves every language dashboard.
+RED_LABELS = ("service_name", "telemetry_sdk_language")
+
+LANGUAGE_KEYS = ["python", "node", "java", "go", "dotnet", "ruby", "php"]
+
+# Assumed per-service span name count (routes/operations) and kinds x statuses.
+SPAN_NAMES_PER_SERVICE = 25
+KIND_STATUS_COMBINATIONS = 2 * 3
+DEFAULT_MAX_SERIES = 100000
+
+
+def estimate_series(service_count: int, bucket_count: int, dimensions: List[tuple]) -> int:
+    """Estimate spanmetrics series: calls counter plus histogram (buckets + +Inf + sum + count)."""
+    per_combination = 1 + (bucket_count + 3)
+    dimension_values = 1
+    for _, _, distinct in dimensions:
+        dimension_values *= distinct
+    return max(service_count, 1) * SPAN_NAMES_PER_SERVICE * KIND_STATUS_COMBINATIONS * dimension_values * per_combination
+
+
+def spanmetrics_settings(services: Dict[str, List[Any]], max_series: int = DEFAULT_MAX_SERIES) -> Dict[str, Any]:
+    """Choose histogram buckets and dimensions that keep the estimated series count under `max_series`."""
+    service_count = sum(len(services.get(key, [])) for key in LANGUAGE_KEYS)
+    buckets = LATENCY_BUCKETS_MS
+    dimensions = list(BOUNDED_DIMENSIONS)
+
+    if estimate_series(service_count, len(buckets), dimensions) > max_series:
+        buckets = COARSE_LATENCY_BUCKETS_MS
+    if estimate_series(service_count, len(buckets), dimensions) > max_series:
+        dimensions = [d for d in dimensions if d[0] == "telemetry.sdk.language"]
+
+    estimated = estimate_series(service_count, len(buckets), dimensions)
+    return {
+        "namespace": SPANMETRICS_NAMESPACE,
+        "buckets": [f"{b}ms" for b in buckets],
+        "dimensions": [{"name": name, "default": default} for name, default, _ in dimensions],
+        # Upper bound on distinct dimension sets kept in memory by the connector.
+        "dimensions_cache_size": max(1000, min(estimated, max_series)),
+        "estimated_series": estimated,
+    }
+
+
+def _selector(*matchers: str) -> str:
+    present = [m for m in matchers if m]
+    return "{" + ",".join(present) + "}" if present else ""
+
+
+def request_rate_query(matcher: str = "", window: str = "5m", by=("service_name",)) -> str:
+    return f"sum by ({', '.join(by)}) (rate({CALLS_METRIC}{_selector(SERVER_SPANS, matcher)}[{window}]))"
+
+
+def error_rate_query(matcher: str = "", window: str = "5m", by=("service_name",)) -> str:
+    return f"sum by ({', '.join(by)}) (rate({CALLS_METRIC}{_selector(SERVER_SPANS, ERROR_SPANS, matcher)}[{window}]))"
+
+
+def latency_bucket_rate_query(matcher: str = "", window: str = "5m", by=("service_name",)) -> str:
+    labels = ", ".join(tuple(by) + ("le",))
+    return f"sum by ({labels}) (rate({DURATION_BUCKET_METRIC}{_selector(SERVER_SPANS, matcher)}[{window}]))"
+
+
+def latency_quantile_query(quantile: float = 0.95, matcher: str = "", window: str = "5m") -> str:
+    return f"histogram_quantile({quantile}, {latency_bucket_rate_query(matcher, window)})"
+
+
+def service_count_query(matcher: str = "") -> str:
+    return f"count(count by (service_name) ({CALLS_METRIC}{_selector(matcher)}))"
+
+
+def language_matcher(language: str) -> str:
+    """Label matcher for the telemetry.sdk.language dimension."""
+    return f'telemetry_sdk_language="{language}"'
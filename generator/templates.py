@@ -0,0 +1,29 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+TEMPLATE_DIR = Path("templates")
+
+# Compiled template bytecode, reused across runs. Entries are keyed by template
+# name and source checksum, so an edited template is recompiled automatically.
+TEMPLATE_CACHE_DIR = Path(os.environ.get("OTEL_INTEGRATOR_TEMPLATE_CACHE", "output/.template-cache"))
+
+
+@lru_cache(maxsize=None)
+def get_environment() -> Environment:
+    """The single Jinja environment shared by every generator, created on first use."""
+    options = {}
+    try:
+        TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        options["bytecode_cache"] = FileSystemBytecodeCache(str(TEMPLATE_CACHE_DIR))
+    except OSError:
+        # Read-only checkout: compile in memory only.
+        pass
+    return Environment(loader=FileSystemLoader(TEMPLATE_DIR), **options)
+
+
+def get_template(name: str) -> Template:
+    """Load a template through the shared environment (compiled once per process)."""
+    return get_environment().get_template(name)
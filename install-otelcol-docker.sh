@@ -25,6 +25,8 @@ docker run -d \
   --name otel-collector \
   -p 4317:4317 \
   -p 4318:4318 \
+  -p 13133:13133 \
+  -p 55679:55679 \
   -v "$CONFIG_PATH:/etc/otel/config.yaml" \
   otel/opentelemetry-collector-contrib:latest \
   --config /etc/otel/config.yaml
@@ -113,6 +113,10 @@ Type=simple
 User=otel-collector
 Group=otel-collector
 ExecStart=/usr/local/bin/otelcol --config {config_path}
+# SIGHUP makes the collector reload its config in-process (used by `main.py reload`)
+ExecReload=/bin/kill -HUP $MAINPID
+# Give exporters time to drain their queues on stop
+TimeoutStopSec=30
 Restart=always
 RestartSec=5
 
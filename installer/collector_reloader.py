@@ -0,0 +1,236 @@
+import os
+import re
+import shutil
+import signal
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import psutil
+import requests
+
+from validators.config_diff import format_diff, is_empty, load_config, semantic_diff
+from validators.validate_enhanced_config import validate_enhanced_config
+
+# Copy of the last config successfully applied to the collector, kept next to the generated one.
+APPLIED_CONFIG_NAME = ".applied-otel-collector-config.yaml"
+
+COLLECTOR_METRICS_URL = "http://localhost:8888/metrics"
+
+# Collector self-metrics counting items that never reached a backend.
+DROPPED_ITEM_METRICS = [
+    "otelcol_receiver_refused_spans",
+    "otelcol_receiver_refused_metric_points",
+    "otelcol_receiver_refused_log_records",
+    "otelcol_processor_dropped_spans",
+    "otelcol_processor_dropped_metric_points",
+    "otelcol_processor_dropped_log_records",
+    "otelcol_exporter_send_failed_spans",
+    "otelcol_exporter_send_failed_metric_points",
+    "otelcol_exporter_send_failed_log_records",
+    "otelcol_exporter_enqueue_failed_spans",
+    "otelcol_exporter_enqueue_failed_metric_points",
+    "otelcol_exporter_enqueue_failed_log_records",
+]
+
+_SAMPLE_LINE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)")
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_samples(text: str) -> List[Tuple[str, Dict[str, str], float]]:
+    """Parse Prometheus text exposition into (name, labels, value) samples."""
+    samples = []
+    for line in text.splitlines():
+        match = _SAMPLE_LINE.match(line)
+        if not match:
+            continue
+        # Newer collectors append _total to counters.
+        name = match.group(1)
+        if name.endswith("_total"):
+            name = name[:-len("_total")]
+        try:
+            value = float(match.group(3))
+        except ValueError:
+            continue
+        labels = dict(_LABEL.findall(match.group(2) or ""))
+        samples.append((name, labels, value))
+    return samples
+
+
+def scrape_samples(url: str = COLLECTOR_METRICS_URL, timeout: float = 2.0) -> Optional[List[Tuple[str, Dict[str, str], float]]]:
+    """Labelled samples from the collector's metrics endpoint; None if it is unreachable."""
+    try:
+        response = requests.get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    return parse_samples(response.text)
+
+
+def scrape_counters(url: str = COLLECTOR_METRICS_URL, names: Optional[List[str]] = None,
+                    timeout: float = 2.0) -> Optional[Dict[str, float]]:
+    """Sum Prometheus samples by metric name (labels dropped); None if the endpoint is unreachable."""
+    samples = scrape_samples(url, timeout)
+    if samples is None:
+        return None
+    totals: Dict[str, float] = {}
+    for name, _, value in samples:
+        if names is not None and name not in names:
+            continue
+        totals[name] = totals.get(name, 0.0) + value
+    return totals
+
+
+class CollectorReloader:
+    """Apply a regenerated collector config without reinstalling the collector.
+
+    The new config is compared semantically with the last applied one and, only
+    if something changed and validation passes, the running collector is told to
+    reload: SIGHUP makes otelcol rebuild its pipelines in-process, and through
+    systemd `reload-or-restart` uses the unit's ExecReload (SIGHUP) or falls back
+    to a graceful SIGTERM restart. Receiver ports are probed throughout to
+    measure downtime, and the collector's refused/dropped/failed counters are
+    compared before and after to count lost items.
+    """
+
+    def __init__(self, service_name: str = "otel-collector", host: str = "localhost",
+                 ports: Optional[List[int]] = None, metrics_url: str = COLLECTOR_METRICS_URL):
+        self.service_name = service_name
+        self.host = host
+        self.ports = ports or [4317, 4318]
+        self.metrics_url = metrics_url
+
+    def applied_config_path(self, config_path: str) -> Path:
+        return Path(config_path).parent / APPLIED_CONFIG_NAME
+
+    def record_applied(self, config_path: str) -> None:
+        shutil.copyfile(config_path, self.applied_config_path(config_path))
+
+    def diff(self, config_path: str, running_config: Optional[str] = None) -> Dict[str, Dict[str, List[str]]]:
+        running = load_config(running_config or str(self.applied_config_path(config_path)))
+        return semantic_diff(running, load_config(config_path) or {})
+
+    def validate(self, config_path: str) -> bool:
+        if not validate_enhanced_config(config_path):
+            return False
+        # Let the collector itself check component settings when the binary is available.
+        binary = shutil.which("otelcol") or shutil.which("otelcol-contrib")
+        if binary:
+            result = subprocess.run([binary, "validate", "--config", config_path], capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"❌ {Path(binary).name} validate failed: {result.stderr.strip() or result.stdout.strip()}")
+                return False
+            print(f"✅ {Path(binary).name} validate passed")
+        return True
+
+    def _systemd_pid(self) -> Optional[int]:
+        if not shutil.which("systemctl"):
+            return None
+        result = subprocess.run(["systemctl", "show", "-p", "MainPID", "--value", self.service_name],
+                                capture_output=True, text=True)
+        pid = result.stdout.strip()
+        return int(pid) if result.returncode == 0 and pid.isdigit() and int(pid) > 0 else None
+
+    def _process_pid(self) -> Optional[int]:
+        for proc in psutil.process_iter(["pid", "name"]):
+            if proc.info["name"] in ("otelcol", "otelcol-contrib"):
+                return proc.info["pid"]
+        return None
+
+    def _signal(self, method: str) -> str:
+        """Ask the collector to reload; returns the method actually used."""
+        systemd_pid = self._systemd_pid()
+        if method in ("auto", "systemd") and systemd_pid:
+            subprocess.run(["systemctl", "reload-or-restart", self.service_name], check=True)
+            return "systemd"
+        if method == "systemd":
+            raise RuntimeError(f"systemd unit {self.service_name} is not running")
+        pid = systemd_pid or self._process_pid()
+        if pid is None:
+            raise RuntimeError("No running collector process found")
+        os.kill(pid, signal.SIGHUP)
+        return "sighup"
+
+    def _listening(self) -> bool:
+        for port in self.ports:
+            try:
+                with socket.create_connection((self.host, port), timeout=0.2):
+                    pass
+            except OSError:
+                return False
+        return True
+
+    def _measure_downtime(self, started: float, timeout: float, settle: float, interval: float = 0.02) -> float:
+        """Probe the receiver ports until they stay up for `settle` seconds; return seconds spent down."""
+        downtime = 0.0
+        last = started
+        up_since = started if self._listening() else None
+        while time.monotonic() - started < timeout:
+            time.sleep(interval)
+            now = time.monotonic()
+            if self._listening():
+                if up_since is None:
+                    up_since = now
+                if now - up_since >= settle:
+                    break
+            else:
+                downtime += now - last
+                up_since = None
+            last = now
+        return downtime
+
+    def _dropped(self, before: Optional[Dict[str, float]], after: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        if before is None or after is None:
+            return None
+        dropped = {}
+        for name in DROPPED_ITEM_METRICS:
+            previous, current = before.get(name, 0.0), after.get(name, 0.0)
+            # A restart resets counters; everything counted since then was lost during/after the reload.
+            delta = current - previous if current >= previous else current
+            if delta:
+                dropped[name] = delta
+        return dropped
+
+    def reload(self, config_path: str, running_config: Optional[str] = None, method: str = "auto",
+               dry_run: bool = False, timeout: float = 30.0, settle: float = 2.0) -> Dict[str, Any]:
+        """Diff, validate and, if anything changed, reload the collector."""
+        result: Dict[str, Any] = {"config": config_path, "reloaded": False}
+        diff = self.diff(config_path, running_config)
+        result["diff"] = diff
+        if is_empty(diff):
+            print("✅ No semantic changes; collector left untouched")
+            return result
+
+        print(f"📝 {len(format_diff(diff))} config changes:")
+        for line in format_diff(diff):
+            print(f"   {line}")
+
+        if not self.validate(config_path):
+            result["error"] = "validation failed"
+            return result
+        if dry_run:
+            print("ℹ️  Dry run: collector not signalled")
+            return result
+
+        before = scrape_counters(self.metrics_url, DROPPED_ITEM_METRICS)
+        started = time.monotonic()
+        result["method"] = self._signal(method)
+        print(f"🔄 Reload requested via {result['method']}")
+        downtime = self._measure_downtime(started, timeout, settle)
+        result["downtime_ms"] = round(downtime * 1000, 1)
+        result["dropped_items"] = self._dropped(before, scrape_counters(self.metrics_url, DROPPED_ITEM_METRICS))
+        result["reloaded"] = self._listening()
+
+        if result["reloaded"]:
+            self.record_applied(config_path)
+            print(f"✅ Collector reloaded ({result['downtime_ms']} ms with receivers unavailable)")
+        else:
+            print(f"❌ Collector not listening on {self.ports} {timeout}s after reload")
+        if result["dropped_items"] is None:
+            print(f"⚠️  Could not read collector metrics from {self.metrics_url}; dropped items unknown")
+        else:
+            total = int(sum(result["dropped_items"].values()))
+            print(f"{'✅' if total == 0 else '⚠️ '} Dropped items during reload: {total}")
+        return result
@@ -1,92 +1,139 @@
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 import typer
-from discovery.scanner import detect_services
-from generator.config_generator import generate_configs
-from installer.collector_installer import CollectorInstaller
-from discovery.enhanced_scanner import EnhancedServiceScanner
-from jinja2 import Environment, FileSystemLoader
-from validators.validate_enhanced_config import validate_enhanced_config
-from validators.health_check import run_full_health_check
-from validators.exporter_health_check import ExporterHealthChecker
-from validators.instrumentation_check import InstrumentationChecker
-from validators.tls_validator import TLSValidator
-from validators.resilience_manager import ResilienceManager
-from generator.env_generator import generate_all_env_outputs
-from generator.dashboard_generator import DashboardGenerator
-from installer.sdk_installer import SDKInstaller
+from generator.query_cost import DEFAULT_MAX_QUERY_COST
+
+# Subsystem imports live inside each command: the OpenTelemetry SDK, requests,
+# psutil, docker and jinja2 together cost hundreds of ms, and a command should
+# only pay for what it uses. benchmarks/bench_importtime.py guards the budget.
 
 app = typer.Typer()
 
 BASE_OUTPUT_DIR = Path("output/generated-configs")
-TEMPLATE_DIR = Path("templates")
+PIPELINE_REPORT = Path("output/run-pipeline-report.json")
 
-ENHANCED_EXPORTERS = ["grafana", "influxdb", "loki", "elastic"]
+# Set by the --profile callback; commands hand it to their stages.
+_profiler = None
+
+@app.callback()
+def cli(
+    ctx: typer.Context,
+    profile: bool = typer.Option(False, "--profile", help="Record per-stage time, memory, file and network activity"),
+    profile_output: str = typer.Option("output/profile-report.json", help="JSON report written with --profile"),
+    profile_dump: Optional[str] = typer.Option(None, help="With --profile, also write <path>.prof (cProfile) and <path>.folded (flamegraph stacks)"),
+):
+    """
+    OpenTelemetry integrator: discovery, config generation and collector checks.
+    """
+    global _profiler
+    if not profile:
+        return
+    from pipeline.profiler import Profiler, format_stage_table
+    
+    _profiler = Profiler(cprofile=bool(profile_dump), sample_stacks=bool(profile_dump))
+    _profiler.start()
+    record = _profiler.enter(ctx.invoked_subcommand or "cli")
+    
+    def finish():
+        _profiler.exit(record)
+        report = _profiler.stop()
+        report["command"] = ctx.invoked_subcommand
+        typer.echo("\n🔬 Profile:")
+        for line in format_stage_table(report):
+            typer.echo(line)
+        for path in _profiler.save(report, profile_output, profile_dump):
+            typer.echo(f"   Written: {path}")
+    
+    ctx.call_on_close(finish)
+
+def _print_pipeline_report(pipeline) -> None:
+    import json
+    from pipeline.dag import format_report
+    typer.echo("\n⏱️  Stage timings:")
+    for line in format_report(pipeline):
+        typer.echo(line)
+    PIPELINE_REPORT.parent.mkdir(parents=True, exist_ok=True)
+    with open(PIPELINE_REPORT, "w") as f:
+        json.dump(pipeline.to_dict(), f, indent=2)
+    typer.echo(f"   Report written to: {PIPELINE_REPORT}")
 
 @app.command()
-def run(scan_path: str = ".", output_dir: str = str(BASE_OUTPUT_DIR), install: bool = False, enhanced: bool = False):
+def run(scan_path: str = ".", output_dir: str = str(BASE_OUTPUT_DIR), install: bool = False, enhanced: bool = False,
+        watch: bool = typer.Option(False, help="Keep running and regenerate only the outputs affected by changes"),
+        interval: float = typer.Option(1.0, help="With --watch, seconds between polls"),
+        debounce: float = typer.Option(2.0, help="With --watch, quiet seconds before regenerating")):
     """
     Run discovery and generate OTel + Grafana Agent config files.
     Use --enhanced for comprehensive service discovery and config.
+    Use --watch to keep the enhanced outputs up to date as services and files change.
     """
+    from discovery.scanner import detect_services
+    from generator.config_generator import generate_configs
+    from pipeline.enhanced_run import build_enhanced_pipeline
+    if watch:
+        from pipeline.watch import Watcher
+        typer.echo("🚀 Generating enhanced outputs, then watching for changes (Ctrl+C to stop)...")
+        try:
+            Watcher(scan_path, output_dir, interval=interval, debounce=debounce).run()
+        except KeyboardInterrupt:
+            typer.echo("\n👋 Stopped watching")
+        return
     if enhanced:
         typer.echo("🚀 Using enhanced service discovery...")
-        scanner = EnhancedServiceScanner()
-        services = scanner.detect_services(scan_path)
-        typer.echo(f"✅ Enhanced detected services: {services}")
+        # Discovery, config render/validation, env files, dashboards and the backend
+        # and instrumentation checks run as a dependency graph, concurrently where possible.
+        dag = build_enhanced_pipeline(scan_path, output_dir)
+        if _profiler is not None:
+            dag.stage_hook = _profiler.stage
+        pipeline = dag.run()
+        if _profiler is not None:
+            for name, stage in pipeline.stages.items():
+                if stage.kind == "cpu" and stage.end:
+                    _profiler.add_external(name, stage.duration)
         
-        # Use comprehensive template with fixed exporters
-        env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-        template = env.get_template("comprehensive-otel-collector.j2")
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-        config_path = output_path / "otel-collector-config.yaml"
+        if not pipeline.ok("discover"):
+            typer.echo(f"❌ Discovery failed: {pipeline.stages['discover'].error}")
+            return
+        services = pipeline.result("discover")
+        typer.echo(f"✅ Enhanced detected services: {services}")
         
-        with open(config_path, "w") as f:
-            f.write(template.render(services=services, exporters=ENHANCED_EXPORTERS))
-        typer.echo(f"✅ Comprehensive configuration written to: {config_path}")
+        if pipeline.ok("render_config"):
+            config = pipeline.result("render_config")
+            state = "written to" if config["written"] else "unchanged"
+            typer.echo(f"✅ Comprehensive configuration {state}: {config['path']}")
         
-        # Validate the enhanced config
-        if validate_enhanced_config(str(config_path)):
-            typer.echo("✅ Enhanced configuration validation passed")
-        else:
+        if not pipeline.ok("validate_config"):
             typer.echo("❌ Enhanced configuration validation failed")
+            _print_pipeline_report(pipeline)
             return
+        typer.echo("✅ Enhanced configuration validation passed")
         
-        # Generate environment files
-        env_outputs = generate_all_env_outputs(services, "output")
-        typer.echo(f"✅ Environment files generated:")
-        typer.echo(f"   - {env_outputs['env_file']}")
-        typer.echo(f"   - {env_outputs['instructions_file']}")
+        if pipeline.ok("env_files"):
+            env_outputs = pipeline.result("env_files")
+            typer.echo(f"✅ Environment files generated:")
+            typer.echo(f"   - {env_outputs['env_file']}")
+            typer.echo(f"   - {env_outputs['instructions_file']}")
         
-        # Generate dashboards
-        typer.echo("\n📊 Generating dashboards...")
-        dashboard_generator = DashboardGenerator()
-        dashboard_files = dashboard_generator.generate_all_dashboards(services, "output/dashboards")
-        typer.echo(f"✅ Generated {len(dashboard_files)} dashboard files")
-        
-        # Check backend services health
-        typer.echo("\n🏥 Checking backend services...")
-        backend_checker = ExporterHealthChecker()
-        backend_results = backend_checker.check_all_backends()
-        
-        # Check instrumentation
-        typer.echo("\n🔧 Checking instrumentation...")
-        instrumentation_checker = InstrumentationChecker()
-        instrumentation_results = instrumentation_checker.check_all_services(services)
+        if pipeline.ok("dashboards"):
+            typer.echo(f"✅ Generated {len(pipeline.result('dashboards'))} dashboard files")
+        else:
+            typer.echo(f"❌ Dashboard generation failed: {pipeline.stages['dashboards'].error}")
         
         # Show recommendations
         typer.echo("\n💡 Recommendations:")
-        backend_recs = backend_checker.get_recommendations(backend_results)
-        for rec in backend_recs:
-            typer.echo(f"   • {rec}")
+        if pipeline.ok("backend_health"):
+            for rec in pipeline.result("backend_health")["recommendations"]:
+                typer.echo(f"   • {rec}")
+        
+        if pipeline.ok("instrumentation"):
+            for service_name, result in pipeline.result("instrumentation").items():
+                if result["status"] != "instrumented":
+                    typer.echo(f"\n📦 {service_name} instrumentation:")
+                    for rec in result["recommendations"]:
+                        typer.echo(f"   • {rec}")
         
-        for service_name, result in instrumentation_results.items():
-            if result["status"] != "instrumented":
-                typer.echo(f"\n📦 {service_name} instrumentation:")
-                for rec in result["recommendations"]:
-                    typer.echo(f"   • {rec}")
+        _print_pipeline_report(pipeline)
         
     else:
         typer.echo("🔍 Starting discovery...")
@@ -100,10 +147,14 @@ def run(scan_path: str = ".", output_dir: str = str(BASE_OUTPUT_DIR), install: b
     if install:
         config_path = Path(output_dir) / "otel-collector-config.yaml"
         if config_path.exists():
+            from installer.collector_installer import CollectorInstaller
+            from installer.collector_reloader import CollectorReloader
+            from validators.health_check import run_full_health_check
             typer.echo("🚀 Installing and starting OpenTelemetry Collector...")
             installer = CollectorInstaller()
             try:
                 installer.install_and_start(str(config_path))
+                CollectorReloader().record_applied(str(config_path))
                 typer.echo("✅ OpenTelemetry Collector installed and running!")
                 
                 # Run health check
@@ -123,6 +174,9 @@ def install(output_dir: str = str(BASE_OUTPUT_DIR)):
     """
     Install and start the OpenTelemetry Collector with the generated config.
     """
+    from installer.collector_installer import CollectorInstaller
+    from installer.collector_reloader import CollectorReloader
+    from validators.health_check import run_full_health_check
     config_path = Path(output_dir) / "otel-collector-config.yaml"
     if not config_path.exists():
         typer.echo("❌ Configuration file not found. Run 'python main.py run' first.")
@@ -132,6 +186,7 @@ def install(output_dir: str = str(BASE_OUTPUT_DIR)):
     installer = CollectorInstaller()
     try:
         installer.install_and_start(str(config_path))
+        CollectorReloader().record_applied(str(config_path))
         typer.echo("✅ OpenTelemetry Collector installed and running!")
         
         # Run health check
@@ -144,11 +199,138 @@ def install(output_dir: str = str(BASE_OUTPUT_DIR)):
     except Exception as e:
         typer.echo(f"❌ Failed to install collector: {e}")
 
+@app.command()
+def snapshot(scan_path: str = ".", host: Optional[str] = None, snapshot_dir: str = "output/snapshots"):
+    """
+    Save this host's enhanced discovery result for later fleet rendering with batch-render.
+    """
+    from discovery.enhanced_scanner import EnhancedServiceScanner
+    from generator.batch_render import save_snapshot
+    services = EnhancedServiceScanner().detect_services(scan_path)
+    typer.echo(f"✅ Snapshot written to: {save_snapshot(services, host, snapshot_dir)}")
+
+@app.command()
+def batch_render(
+    snapshot_dir: str = "output/snapshots",
+    output_dir: str = "output/fleet",
+    workers: int = typer.Option(0, help="Worker processes (0 = one per CPU)"),
+    chunksize: int = 16,
+):
+    """
+    Render configs, env files and dashboards for every host snapshot in a process pool.
+    """
+    from generator.batch_render import BatchRenderer, load_snapshots
+    snapshots = load_snapshots(snapshot_dir)
+    if not snapshots:
+        typer.echo(f"❌ No snapshots found in {snapshot_dir}. Run 'python main.py snapshot' on each host first.")
+        raise typer.Exit(code=1)
+    
+    typer.echo(f"🏭 Rendering {len(snapshots)} hosts...")
+    summary = BatchRenderer(workers=workers or None, chunksize=chunksize).render(snapshots, output_dir)
+    typer.echo(f"✅ Rendered {summary['hosts']} hosts in {summary['seconds']}s "
+               f"({summary['hosts_per_sec']} hosts/sec, {summary['workers']} workers)")
+    typer.echo(f"📦 {summary['files']} files, {summary['unique_objects']} unique in {output_dir}/store "
+               f"({summary['new_objects']} new, {summary['pruned_objects']} pruned)")
+
+@app.command()
+def reload(
+    output_dir: str = str(BASE_OUTPUT_DIR),
+    running_config: Optional[str] = typer.Option(None, help="Config the collector is running with (defaults to the last applied copy)"),
+    method: str = typer.Option("auto", help="auto, systemd (reload-or-restart the unit) or sighup"),
+    service_name: str = "otel-collector",
+    dry_run: bool = False,
+):
+    """
+    Apply the regenerated collector config with a zero-downtime reload, only if it changed.
+    """
+    import subprocess
+    from installer.collector_reloader import CollectorReloader
+    config_path = Path(output_dir) / "otel-collector-config.yaml"
+    if not config_path.exists():
+        typer.echo("❌ Configuration file not found. Run 'python main.py run' first.")
+        raise typer.Exit(code=1)
+    
+    reloader = CollectorReloader(service_name=service_name)
+    try:
+        result = reloader.reload(str(config_path), running_config=running_config, method=method, dry_run=dry_run)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        typer.echo(f"❌ Reload failed: {e}")
+        raise typer.Exit(code=1)
+    if result.get("error") or (not dry_run and "method" in result and not result["reloaded"]):
+        raise typer.Exit(code=1)
+
+@app.command()
+def analyze_collector(
+    metrics_url: str = typer.Option("http://localhost:8888/metrics", help="Collector internal metrics endpoint"),
+    window: float = typer.Option(60.0, help="Seconds to observe the collector"),
+    interval: float = typer.Option(5.0, help="Seconds between scrapes"),
+    output_dir: str = str(BASE_OUTPUT_DIR),
+    stand_in: Optional[str] = typer.Option(None, help="Analyze a local stand-in instead: healthy, saturated-exporter, undersized-batch, memory-limited"),
+    apply: bool = typer.Option(False, help="Save the recommended sending_queue and batch sizes to output/exporter-settings.json"),
+):
+    """
+    Scrape the collector's own metrics over a window and name the bottleneck:
+    saturated exporter queues, undersized batches or memory_limiter throttling.
+    """
+    from validators.collector_telemetry import CollectorTelemetryAnalyzer, print_analysis
+    config_path = str(Path(output_dir) / "otel-collector-config.yaml")
+    stand_in_server = None
+    if stand_in:
+        from simulators.collector_metrics import CollectorMetricsStandIn
+        try:
+            stand_in_server = CollectorMetricsStandIn(stand_in, ramp_seconds=window / 2).start()
+        except ValueError as e:
+            typer.echo(f"❌ {e}")
+            raise typer.Exit(code=1)
+        metrics_url = stand_in_server.metrics_url
+        typer.echo(f"🧪 Using collector metrics stand-in ({stand_in}) at {metrics_url}")
+
+    analyzer = CollectorTelemetryAnalyzer(metrics_url=metrics_url, window=window, interval=interval, config_path=config_path)
+    typer.echo(f"🔍 Observing collector metrics for {window:.0f}s...")
+    try:
+        result = analyzer.run()
+    finally:
+        if stand_in_server:
+            stand_in_server.stop()
+    if "error" in result:
+        typer.echo(f"❌ {result['error']}")
+        raise typer.Exit(code=1)
+    print_analysis(result)
+    typer.echo(f"✅ Analysis written to: {analyzer.save_results(result)}")
+
+    if apply and result["exporter_settings"]:
+        from generator.exporter_settings import save_exporter_settings
+        settings_file = save_exporter_settings(result["exporter_settings"], source="analyze-collector")
+        typer.echo(f"✅ Exporter settings saved to: {settings_file} (used by 'run --enhanced')")
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Interface to bind (keep local unless fronted by a proxy)"),
+    port: int = typer.Option(8765, help="Port to listen on"),
+    scan_path: str = typer.Option(".", help="Default scan path; requests can pass ?scan_path="),
+    discovery_ttl: float = typer.Option(30.0, help="Seconds a discovery result is reused"),
+    render_ttl: float = typer.Option(300.0, help="Seconds unused rendered configs/dashboards are kept"),
+):
+    """
+    Serve discovery, config rendering, validation and dashboards over a local HTTP API.
+    """
+    from pipeline.api_server import IntegratorAPI, serve as serve_api
+    
+    def ready(server):
+        typer.echo(f"🌐 Serving on http://{host}:{server.server_address[1]} "
+                   f"(/discovery, /config, /validate, /dashboards[/<key>], /health)")
+    
+    try:
+        serve_api(IntegratorAPI(scan_path, discovery_ttl, render_ttl), host, port, ready)
+    except KeyboardInterrupt:
+        typer.echo("\n👋 Server stopped")
+
 @app.command()
 def validate(output_dir: str = str(BASE_OUTPUT_DIR)):
     """
     Validate the generated OpenTelemetry Collector configuration.
     """
+    from validators.validate_enhanced_config import validate_enhanced_config
     config_path = Path(output_dir) / "otel-collector-config.yaml"
     if not config_path.exists():
         typer.echo("❌ Configuration file not found. Run 'python main.py run' first.")
@@ -160,35 +342,221 @@ def validate(output_dir: str = str(BASE_OUTPUT_DIR)):
         typer.echo("❌ Configuration validation failed")
 
 @app.command()
-def health_check():
+def health_check(
+    timeout: float = typer.Option(10.0, help="Seconds to wait for the collector to become ready"),
+):
     """
     Run health check on the OpenTelemetry Collector.
     """
+    from validators.health_check import run_full_health_check
     typer.echo("🏥 Running health check...")
-    if run_full_health_check():
+    if run_full_health_check(timeout=timeout):
         typer.echo("✅ Health check passed - collector is working correctly!")
     else:
         typer.echo("❌ Health check failed - collector may have issues")
 
 @app.command()
-def check_backends():
+def watch_logs(
+    source: str = typer.Option("docker", help="docker, journald or file"),
+    target: str = typer.Option("otel-collector", help="Container name, systemd unit or log file path"),
+    follow: bool = typer.Option(True, help="Keep reading new lines; --no-follow analyzes recent history and exits"),
+    since: Optional[float] = typer.Option(None, help="Seconds of history to read first"),
+    duration: Optional[float] = typer.Option(None, help="Stop following after this many seconds"),
+    window: float = typer.Option(60.0, help="Sliding window for event rates, in seconds"),
+    bucket: float = typer.Option(5.0, help="Bucket size within the window, in seconds"),
+    sustain: float = typer.Option(30.0, help="Seconds of a window an event class must appear in to be reported"),
+):
+    """
+    Follow the collector's logs, classify dropped data, retry exhaustion, full queues,
+    memory limiter refusals and TLS failures, and report only sustained anomalies.
+    """
+    from validators.collector_logs import CollectorLogAnalyzer, open_source, print_change
+    try:
+        reader = open_source(source, target, follow=follow, since=since)
+    except (OSError, ValueError) as e:
+        typer.echo(f"❌ Could not read logs: {e}")
+        raise typer.Exit(code=1)
+    
+    analyzer = CollectorLogAnalyzer(window=window, bucket=bucket, sustain=sustain)
+    typer.echo(f"📋 {'Following' if follow else 'Reading'} {source} logs for {target} (Ctrl+C to stop)...")
+    try:
+        summary = analyzer.follow(reader, duration=duration, on_change=print_change)
+    except KeyboardInterrupt:
+        summary = analyzer.summary()
+    finally:
+        reader.close()
+    if reader.error:
+        typer.echo(f"❌ Could not read logs: {reader.error}")
+        raise typer.Exit(code=1)
+    
+    typer.echo("\n📊 Event rates over the last window:")
+    for name, rate in sorted(summary["rates"].items()):
+        dropped = f", {rate['dropped_items']} items dropped" if rate["dropped_items"] else ""
+        typer.echo(f"   • {name}: {summary['totals'][name]} total, {rate['per_minute']}/min{dropped}"
+                   f"{' (sustained)' if rate['sustained'] else ''}")
+    if summary["anomalies"]:
+        raise typer.Exit(code=1)
+    typer.echo("✅ No sustained anomalies")
+
+@app.command()
+def verify_pipeline(
+    count: int = typer.Option(100, help="Spans, metric points and log records to send per signal"),
+    timeout: float = typer.Option(10.0, help="Seconds to wait for every item to arrive"),
+    collector_binary: Optional[str] = typer.Option(None, help="Collector to run with the debug pipeline (default: otelcol or otelcol-contrib on PATH)"),
+    output: Optional[str] = typer.Option(None, help="Write the result as JSON"),
+):
+    """
+    Verify telemetry end to end: send a tagged burst through a collector debug
+    pipeline into a local OTLP sink and report delivery ratio and latency.
+    """
+    import json
+    from validators.round_trip import RoundTripVerifier, print_round_trip
+    result = RoundTripVerifier(count=count, timeout=timeout, collector_binary=collector_binary).run()
+    print_round_trip(result)
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(result, indent=2))
+        typer.echo(f"   Written: {output}")
+    if result["ok"]:
+        typer.echo("✅ Every item made the round trip")
+    else:
+        typer.echo("❌ Telemetry was lost on the way")
+        raise typer.Exit(1)
+
+@app.command()
+def check_backends(
+    probes: int = typer.Option(5, help="Requests per backend; latency is reported as p50/p95/p99"),
+    deadline: float = typer.Option(5.0, help="Overall time limit for all backends, in seconds"),
+    fresh_connections: bool = typer.Option(False, help="Open a new connection per probe to measure connect/TLS every time"),
+    output: Optional[str] = typer.Option(None, help="Also write the results as JSON to this file"),
+):
     """
     Check health of backend services (Elastic APM, Loki, InfluxDB, Grafana).
     """
+    from validators.exporter_health_check import ExporterHealthChecker
     typer.echo("🏥 Checking backend services...")
-    checker = ExporterHealthChecker()
+    checker = ExporterHealthChecker(probes=probes, deadline=deadline, fresh_connections=fresh_connections)
     results = checker.check_all_backends()
+    if output:
+        import json
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(results, indent=2) + "\n")
+        typer.echo(f"📄 Results written to: {output}")
     
     recommendations = checker.get_recommendations(results)
     typer.echo("\n💡 Recommendations:")
     for rec in recommendations:
         typer.echo(f"   • {rec}")
 
+@app.command()
+def monitor_backends(
+    interval: float = typer.Option(15.0, help="Mean seconds between probes of each backend"),
+    jitter: float = typer.Option(0.2, help="Random ± fraction applied to every interval"),
+    window: int = typer.Option(240, help="Probes kept per backend for availability and percentiles"),
+    otlp_endpoint: str = typer.Option("http://localhost:4318/v1/metrics", help="OTLP/HTTP metrics endpoint of the local collector"),
+    export_interval: float = typer.Option(15.0, help="Seconds between metric exports"),
+    duration: Optional[float] = typer.Option(None, help="Stop after this many seconds (default: run until Ctrl+C)"),
+    no_export: bool = typer.Option(False, help="Only print reports, do not export metrics"),
+):
+    """
+    Continuously probe backends and export availability and latency as OTLP metrics.
+    """
+    from validators.backend_monitor import BackendMonitor
+    monitor = BackendMonitor(interval=interval, jitter=jitter, window=window,
+                             otlp_endpoint=None if no_export else otlp_endpoint, export_interval=export_interval)
+    target = "not exporting" if no_export else f"exporting to {otlp_endpoint}"
+    typer.echo(f"📡 Monitoring backends every ~{interval}s ({target}), Ctrl+C to stop...")
+    try:
+        monitor.run(duration=duration, report_every=max(interval, 60.0))
+    except KeyboardInterrupt:
+        monitor.stop()
+    monitor.print_report()
+
+@app.command()
+def benchmark_exporters(
+    payload: Optional[List[str]] = typer.Option(None, help="Captured OTLP payload file or directory (traces-*.bin, metrics-*.bin, logs-*.bin)"),
+    iterations: int = 20,
+    scale: int = 1,
+    cpu_weight: float = 0.5,
+    output_dir: str = "output/benchmarks",
+    apply: bool = True,
+):
+    """
+    Benchmark exporter codecs (gzip, zstd, snappy, none) and HTTP vs gRPC transport
+    against a local OTLP sink, then select the best settings per exporter.
+    """
+    from generator.exporter_settings import save_exporter_settings
+    from validators.exporter_codec_benchmark import ExporterCodecBenchmark
+    benchmark = ExporterCodecBenchmark(iterations=iterations, cpu_weight=cpu_weight)
+    results = benchmark.run(payload, scale=scale)
+    results_file = benchmark.save_results(results, output_dir)
+    typer.echo(f"✅ Benchmark results written to: {results_file}")
+
+    typer.echo("\n💡 Selected exporter settings:")
+    for exporter, settings in results["selection"].items():
+        typer.echo(f"   • {exporter}: {settings['transport']} with {settings['compression']} compression")
+
+    if apply:
+        settings_file = save_exporter_settings(results["selection"], source="benchmark-exporters")
+        typer.echo(f"✅ Exporter settings saved to: {settings_file} (used by 'run --enhanced')")
+
+@app.command()
+def probe_capacity(
+    exporter: Optional[List[str]] = typer.Option(None, help="Exporter to probe (elastic, grafana, influxdb); default all"),
+    live: bool = typer.Option(False, help="Probe the real backends from ELASTIC_APM_ENDPOINT, GRAFANA_CLOUD_OTLP_ENDPOINT, INFLUXDB_URL"),
+    batch_size: Optional[List[int]] = typer.Option(None, help="Batch sizes (items per export) to try; default 256, 1024, 4096"),
+    max_concurrency: int = 32,
+    step_seconds: float = 1.0,
+    latency_budget_ms: float = 1000.0,
+    buffer_seconds: float = typer.Option(300.0, help="Seconds of sustained ingest the sending queue should hold"),
+    memory_budget_mib: float = typer.Option(256.0, help="Upper bound for each exporter's queued payload"),
+    stand_in_workers: int = typer.Option(4, help="Concurrent exports the local stand-in backend processes"),
+    output_dir: str = "output/benchmarks",
+    apply: bool = typer.Option(True, help="With --live, save the recommended settings to output/exporter-settings.json"),
+):
+    """
+    Send OTLP bursts of increasing size and concurrency to each backend (or a local
+    stand-in), find the sustainable ingest rate and latency knee, and size each
+    exporter's sending queue and batches from it.
+    """
+    from generator.exporter_settings import EXPORTER_CAPABILITIES, save_exporter_settings
+    from validators.ingest_capacity_probe import IngestCapacityProbe
+    unknown = [name for name in exporter or [] if name not in EXPORTER_CAPABILITIES]
+    if unknown:
+        typer.echo(f"❌ Unknown exporter {', '.join(unknown)}; choose from {', '.join(EXPORTER_CAPABILITIES)}")
+        raise typer.Exit(code=1)
+    probe = IngestCapacityProbe(batch_sizes=batch_size, max_concurrency=max_concurrency, step_seconds=step_seconds,
+                                latency_budget_ms=latency_budget_ms, buffer_seconds=buffer_seconds,
+                                memory_budget_mib=memory_budget_mib)
+    results = probe.run(exporter, live=live, stand_in_workers=stand_in_workers)
+    results_file = probe.save_results(results, output_dir)
+    typer.echo(f"✅ Capacity results written to: {results_file}")
+
+    typer.echo("\n💡 Measured capacity:")
+    for name, result in results["exporters"].items():
+        if "error" in result:
+            typer.echo(f"   ❌ {name}: {result['error']}")
+            continue
+        settings = result["settings"]
+        typer.echo(f"   • {name}: {result['sustainable_items_per_second']:.0f} {result['signal']} items/s "
+                   f"(knee at x{result['knee_concurrency']}, p95 {result['knee_latency_ms']['p95']} ms) → "
+                   f"num_consumers {settings['num_consumers']}, queue_size {settings['queue_size']}, "
+                   f"send_batch_size {settings['send_batch_size']}")
+
+    if apply and results["selection"] and not live:
+        # The stand-in's capacity says nothing about the real backends.
+        typer.echo("ℹ️  Stand-in measurements are not saved; re-run with --live to apply them")
+    elif apply and results["selection"]:
+        settings_file = save_exporter_settings(results["selection"], source="probe-capacity")
+        typer.echo(f"✅ Exporter settings saved to: {settings_file} (used by 'run --enhanced')")
+
 @app.command()
 def check_instrumentation(scan_path: str = "."):
     """
     Check OpenTelemetry instrumentation for discovered services.
     """
+    from discovery.enhanced_scanner import EnhancedServiceScanner
+    from validators.instrumentation_check import InstrumentationChecker
     typer.echo("🔧 Checking instrumentation...")
     
     # Use enhanced scanner to discover services
@@ -211,10 +579,17 @@ def check_instrumentation(scan_path: str = "."):
                 typer.echo(f"   • {rec}")
 
 @app.command()
-def check_tls():
+def check_tls(
+    cache_ttl: float = typer.Option(0.0, help="Reuse an endpoint's last healthy result for this many seconds instead of connecting (never within 14 days of certificate expiry); 0 always connects"),
+    performance: bool = typer.Option(False, help="Also measure DNS/connect/handshake/TTFB, session resumption, 0-RTT, keepalive and HTTP/2"),
+    samples: int = typer.Option(5, help="With --performance, connections timed per endpoint"),
+    apply: bool = typer.Option(True, help="With --performance, save the recommended exporter HTTP client settings"),
+):
     """
     Check TLS certificate validity for exporter endpoints.
+    Use --performance to analyze connection setup cost and tune exporter HTTP clients.
     """
+    from validators.tls_validator import EndpointResultCache, TLSValidator
     typer.echo("🔒 Checking TLS certificates...")
     
     # Get exporter endpoints from environment
@@ -225,7 +600,7 @@ def check_tls():
         "grafana": os.environ.get("GRAFANA_CLOUD_OTLP_ENDPOINT", "https://otlp-gateway-prod-us-central-0.grafana.net/otlp")
     }
     
-    tls_validator = TLSValidator()
+    tls_validator = TLSValidator(cache=EndpointResultCache(cache_ttl) if cache_ttl > 0 else None)
     
     # Check if custom CA cert is provided
     ca_cert = os.environ.get("CA_CERT_PATH")
@@ -251,11 +626,38 @@ def check_tls():
             typer.echo(f"\n🔒 {exporter_name}:")
             typer.echo(f"   • {result.get('recommendation', 'Check endpoint configuration')}")
 
+    if not performance:
+        return
+    from generator.exporter_settings import load_exporter_settings, save_exporter_settings
+    from validators.exporter_health_check import format_latency
+    exporter_settings = load_exporter_settings()
+    typer.echo("\n⏱️  Connection performance:")
+    selection = {}
+    for exporter_name, endpoint in exporters.items():
+        num_consumers = exporter_settings.get(exporter_name, {}).get("num_consumers", 10)
+        analysis = tls_validator.analyze_performance(endpoint, samples=samples, num_consumers=num_consumers)
+        if analysis["status"] != "ok":
+            typer.echo(f"   ❌ {exporter_name}: {analysis['error']}")
+            continue
+        typer.echo(f"\n🔌 {exporter_name} ({endpoint}):")
+        for line in format_latency({"latency_ms": analysis["timing_ms"]}, phases=list(analysis["timing_ms"])):
+            typer.echo(f"   {line}")
+        for rec in analysis["recommendations"]:
+            typer.echo(f"   • {rec}")
+        if analysis["exporter_settings"] and exporter_name in exporter_settings:
+            selection[exporter_name] = {"http_client": analysis["exporter_settings"]}
+            settings = ", ".join(f"{k}: {v}" for k, v in sorted(analysis["exporter_settings"].items()))
+            typer.echo(f"   ⚙️  {settings}")
+    if apply and selection:
+        settings_file = save_exporter_settings(selection, source="check-tls")
+        typer.echo(f"✅ Exporter HTTP client settings saved to: {settings_file} (used by 'run --enhanced')")
+
 @app.command()
 def check_resilience():
     """
     Check resilience status of monitored services.
     """
+    from validators.resilience_manager import ResilienceManager
     typer.echo("🛡️ Checking resilience status...")
     
     resilience_manager = ResilienceManager()
@@ -281,16 +683,22 @@ def reset_circuit_breaker(service_name: str):
     """
     Reset circuit breaker for a specific service.
     """
+    from validators.resilience_manager import ResilienceManager
     typer.echo(f"🔄 Resetting circuit breaker for {service_name}...")
     
     resilience_manager = ResilienceManager()
     resilience_manager.reset_circuit_breaker(service_name)
 
 @app.command()
-def generate_dashboards(scan_path: str = ".", output_dir: str = "output/dashboards"):
+def generate_dashboards(scan_path: str = ".", output_dir: str = "output/dashboards",
+                        max_query_cost: float = DEFAULT_MAX_QUERY_COST):
     """
     Generate Grafana dashboards based on discovered services.
+    Fails if any panel query is estimated to cost more than --max-query-cost samples per refresh.
     """
+    from discovery.enhanced_scanner import EnhancedServiceScanner
+    from generator.dashboard_generator import DashboardGenerator
+    from generator.query_cost import QueryCostExceeded
     typer.echo("📊 Generating dashboards...")
     
     # Use enhanced scanner to discover services
@@ -302,8 +710,12 @@ def generate_dashboards(scan_path: str = ".", output_dir: str = "output/dashboar
         return
     
     # Generate dashboards
-    dashboard_generator = DashboardGenerator()
-    generated_files = dashboard_generator.generate_all_dashboards(services, output_dir)
+    dashboard_generator = DashboardGenerator(max_query_cost=max_query_cost)
+    try:
+        generated_files = dashboard_generator.generate_all_dashboards(services, output_dir)
+    except QueryCostExceeded as e:
+        typer.echo(f"❌ Dashboard generation failed: {e}")
+        raise typer.Exit(code=1)
     
     typer.echo(f"\n✅ Generated {len(generated_files)} dashboard files:")
     for file_path in generated_files:
@@ -321,6 +733,8 @@ def install_sdks(scan_path: str = "."):
     Automatically install OpenTelemetry SDKs for detected Python, Node.js, and Java projects.
     Installs system-wide (Python) and in each project directory (Node.js, Java). Silent, no prompts.
     """
+    from discovery.enhanced_scanner import EnhancedServiceScanner
+    from installer.sdk_installer import SDKInstaller
     typer.echo("🔎 Discovering services for SDK installation...")
     scanner = EnhancedServiceScanner()
     services = scanner.detect_services(scan_path)
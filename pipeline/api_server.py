@@ -0,0 +1,335 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DISCOVERY_TTL = 30.0
+# Renders are keyed by the discovery ETag, so this only bounds how long unused entries live.
+DEFAULT_RENDER_TTL = 300.0
+MAX_CACHE_ENTRIES = 256
+
+JSON = "application/json"
+YAML = "application/yaml"
+
+
+def _json(data: Any) -> bytes:
+    # Stable serialisation, so equal results get equal ETags.
+    return (json.dumps(data, indent=2, ensure_ascii=False, default=str) + "\n").encode()
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    content_type: str
+    etag: str
+    created: float
+    expires: float
+    # Extra data kept alongside the body (e.g. the parsed discovery result).
+    value: Any = None
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires
+
+
+class TTLCache:
+    """Thread-safe TTL cache with single-flight computation.
+
+    Concurrent requests for a missing or expired key wait for one computation
+    instead of each running it (so a burst of requests triggers one discovery).
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: Dict[Tuple, CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        # Threads holding or waiting for each key lock; the lock is removed when this drops to zero.
+        self._key_users: Dict[Tuple, int] = {}
+
+    def get(self, key: Tuple, ttl: float, compute: Callable[[], Tuple[bytes, str, Any]],
+            refresh: bool = False) -> Tuple[CacheEntry, bool]:
+        """Return (entry, hit). `compute` returns (body, content_type, value)."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry.fresh(time.monotonic()) and not refresh:
+                self.hits += 1
+                return entry, True
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+            self._key_users[key] = self._key_users.get(key, 0) + 1
+        requested = time.monotonic()
+        try:
+            with key_lock:
+                with self._lock:
+                    entry = self.entries.get(key)
+                    # Another thread computed it while we waited for the key lock.
+                    if entry and entry.fresh(time.monotonic()) and (not refresh or entry.created >= requested):
+                        self.hits += 1
+                        return entry, True
+                body, content_type, value = compute()
+                now = time.monotonic()
+                entry = CacheEntry(body, content_type, f'"{hashlib.sha256(body).hexdigest()[:32]}"', now, now + ttl, value)
+                with self._lock:
+                    self.misses += 1
+                    self.entries[key] = entry
+                    self._evict(now)
+                return entry, False
+        finally:
+            with self._lock:
+                self._key_users[key] -= 1
+                if not self._key_users[key]:
+                    del self._key_users[key]
+                    del self._key_locks[key]
+
+    def invalidate(self, prefix: Tuple = ()) -> int:
+        with self._lock:
+            keys = [k for k in self.entries if k[:len(prefix)] == prefix]
+            for key in keys:
+                del self.entries[key]
+            return len(keys)
+
+    def _evict(self, now: float) -> None:
+        for key in [k for k, e in self.entries.items() if not e.fresh(now)]:
+            del self.entries[key]
+        while len(self.entries) > self.max_entries:
+            oldest = min(self.entries, key=lambda k: self.entries[k].created)
+            del self.entries[oldest]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+class _ThreadStdout(io.TextIOBase):
+    """sys.stdout replacement that sends a thread's output to its capture buffer, if any.
+
+    contextlib.redirect_stdout swaps the process-wide stream, which is unsafe
+    with concurrent request threads.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+@contextmanager
+def captured_output():
+    """Capture what the current thread prints (discovery and validation progress)."""
+    stdout = sys.stdout
+    if not isinstance(stdout, _ThreadStdout):
+        yield io.StringIO()
+        return
+    buffer = io.StringIO()
+    stdout.local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        stdout.local.buffer = None
+
+
+class IntegratorAPI:
+    """Discovery, config rendering, validation and dashboards behind a cache.
+
+    Discovery results are cached per scan path for `discovery_ttl` seconds;
+    everything rendered from them is keyed by the discovery ETag, so it is
+    reused until discovery actually changes.
+    """
+
+    def __init__(self, scan_path: str = ".", discovery_ttl: float = DEFAULT_DISCOVERY_TTL,
+                 render_ttl: float = DEFAULT_RENDER_TTL):
+        self.scan_path = scan_path
+        self.discovery_ttl = discovery_ttl
+        self.render_ttl = render_ttl
+        self.cache = TTLCache()
+        self.started = time.time()
+
+    def discovery(self, scan_path: str, refresh: bool = False) -> Tuple[CacheEntry, bool]:
+        def compute():
+            from discovery.enhanced_scanner import EnhancedServiceScanner
+            with captured_output():
+                services = EnhancedServiceScanner().detect_services(scan_path)
+            return _json(services), JSON, services
+        return self.cache.get(("discovery", scan_path), self.discovery_ttl, compute, refresh)
+
+    def config(self, scan_path: str, refresh: bool = False) -> Tuple[CacheEntry, bool]:
+        from generator.exporter_settings import load_exporter_settings
+        discovered, _ = self.discovery(scan_path, refresh)
+        # Measured exporter settings are a render input too; a new probe result re-renders.
+        settings = load_exporter_settings()
+        settings_key = hashlib.sha256(_json(settings)).hexdigest()
+
+        def compute():
+            from generator.config_generator import ENHANCED_EXPORTERS, ENHANCED_TEMPLATE
+            from generator.spanmetrics import spanmetrics_settings
+            from generator.templates import get_template
+            services = discovered.value
+            rendered = get_template(ENHANCED_TEMPLATE).render(
+                services=services, exporters=ENHANCED_EXPORTERS, exporter_settings=settings,
+                spanmetrics=spanmetrics_settings(services))
+            return rendered.encode(), YAML, rendered
+        return self.cache.get(("config", scan_path, discovered.etag, settings_key), self.render_ttl, compute)
+
+    def validation(self, scan_path: str, refresh: bool = False) -> Tuple[CacheEntry, bool]:
+        config, _ = self.config(scan_path, refresh)
+
+        def compute():
+            from validators.validate_enhanced_config import validate_enhanced_config
+            fd, path = tempfile.mkstemp(suffix=".yaml", prefix="otel-serve-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(config.body)
+                with captured_output() as output:
+                    valid = validate_enhanced_config(path)
+            finally:
+                os.unlink(path)
+            result = {"valid": valid, "config_etag": config.etag,
+                      "messages": [line for line in output.getvalue().splitlines() if line.strip()]}
+            return _json(result), JSON, result
+        return self.cache.get(("validate", scan_path, config.etag), self.render_ttl, compute)
+
+    def dashboards(self, scan_path: str, refresh: bool = False) -> Tuple[CacheEntry, bool]:
+        discovered, _ = self.discovery(scan_path, refresh)
+
+        def compute():
+            from generator.dashboard_generator import DashboardGenerator
+            generator = DashboardGenerator()
+            with captured_output():
+                built = {spec.key: dashboard for spec, dashboard in generator.build_dashboards(discovered.value)}
+            result = {"dashboards": built, "recording_rules": generator.recording_rules.to_dict()}
+            return _json(result), JSON, result
+        return self.cache.get(("dashboards", scan_path, discovered.etag), self.render_ttl, compute)
+
+    def dashboard(self, scan_path: str, key: str, refresh: bool = False) -> Optional[Tuple[CacheEntry, bool]]:
+        all_dashboards, _ = self.dashboards(scan_path, refresh)
+        if key not in all_dashboards.value["dashboards"]:
+            return None
+
+        def compute():
+            dashboard = all_dashboards.value["dashboards"][key]
+            return _json(dashboard), JSON, dashboard
+        return self.cache.get(("dashboard", scan_path, key, all_dashboards.etag), self.render_ttl, compute)
+
+    def health(self) -> Dict[str, Any]:
+        return {"status": "ok", "uptime_seconds": round(time.time() - self.started, 1),
+                "scan_path": self.scan_path, "cache": self.cache.stats()}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "otel-integrator"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def api(self) -> IntegratorAPI:
+        return self.server.api
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        scan_path = params.get("scan_path", self.api.scan_path)
+        refresh = params.get("refresh") in ("1", "true")
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            if parts == ["health"]:
+                self._send(200, _json(self.api.health()), JSON, cache="bypass")
+                return
+            routes = {
+                ("discovery",): lambda: self.api.discovery(scan_path, refresh),
+                ("config",): lambda: self.api.config(scan_path, refresh),
+                ("validate",): lambda: self.api.validation(scan_path, refresh),
+                ("dashboards",): lambda: self.api.dashboards(scan_path, refresh),
+            }
+            if len(parts) == 2 and parts[0] == "dashboards":
+                found = self.api.dashboard(scan_path, parts[1], refresh)
+            elif tuple(parts) in routes:
+                found = routes[tuple(parts)]()
+            else:
+                self._error(404, f"Unknown endpoint: {url.path}")
+                return
+            if found is None:
+                self._error(404, f"No such dashboard: {parts[1]}")
+                return
+            self._send_entry(*found)
+        except Exception as e:
+            self._error(500, f"{type(e).__name__}: {e}")
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path.rstrip("/") != "/cache/invalidate":
+            self._error(404, f"Unknown endpoint: {url.path}")
+            return
+        removed = self.api.cache.invalidate()
+        self._send(200, _json({"invalidated": removed}), JSON, cache="bypass")
+
+    def _send_entry(self, entry: CacheEntry, hit: bool) -> None:
+        max_age = max(0, int(entry.expires - time.monotonic()))
+        tags = [t.strip() for t in self.headers.get("If-None-Match", "").split(",") if t.strip()]
+        if entry.etag in tags or "*" in tags:
+            self._send(304, b"", entry.content_type, etag=entry.etag, max_age=max_age, cache="hit" if hit else "miss")
+            return
+        self._send(200, entry.body, entry.content_type, etag=entry.etag, max_age=max_age,
+                   cache="hit" if hit else "miss")
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, _json({"error": message}), JSON, cache="bypass")
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: Optional[str] = None,
+              max_age: int = 0, cache: str = "") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)) if status != 304 else "0")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"max-age={max_age}")
+        if cache:
+            self.send_header("X-Cache", cache)
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def log_request(self, code: Any = "-", size: Any = "-") -> None:
+        print(f"📨 {self.command} {self.path} {code}")
+
+
+class APIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, api: IntegratorAPI, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        super().__init__((host, port), _Handler)
+        self.api = api
+
+
+def serve(api: IntegratorAPI, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          ready: Optional[Callable[[APIServer], None]] = None) -> None:
+    """Serve until interrupted. Per-thread stdout capture is installed for the server's lifetime."""
+    original = sys.stdout
+    sys.stdout = _ThreadStdout(original)
+    server = APIServer(api, host, port)
+    try:
+        if ready:
+            ready(server)
+        server.serve_forever()
+    finally:
+        server.server_close()
+        sys.stdout = original
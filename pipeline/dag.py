@@ -0,0 +1,208 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Stage kinds: "io" stages run on threads (network, disk, subprocess waits),
+# "cpu" stages run in worker processes so they are not serialised by the GIL.
+STAGE_KINDS = ("io", "cpu")
+
+
+@dataclass
+class Stage:
+    name: str
+    # Called with {dependency name: result}. CPU stages must be module-level
+    # functions with picklable inputs and results.
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    kind: str = "io"
+
+
+@dataclass
+class StageResult:
+    name: str
+    kind: str
+    status: str = "pending"  # ok, failed, skipped
+    result: Any = None
+    error: Optional[str] = None
+    start: float = 0.0
+    end: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+@dataclass
+class PipelineRun:
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+    wall: float = 0.0
+    critical_path: List[str] = field(default_factory=list)
+
+    def ok(self, name: str) -> bool:
+        return name in self.stages and self.stages[name].status == "ok"
+
+    def result(self, name: str) -> Any:
+        return self.stages[name].result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall, 4),
+            "serial_seconds": round(sum(s.duration for s in self.stages.values()), 4),
+            "critical_path": self.critical_path,
+            "critical_path_seconds": round(sum(self.stages[n].duration for n in self.critical_path), 4),
+            "stages": {
+                name: {"kind": s.kind, "status": s.status, "start": round(s.start, 4),
+                       "seconds": round(s.duration, 4), "error": s.error}
+                for name, s in self.stages.items()
+            },
+        }
+
+
+class StageDAG:
+    """Run named stages concurrently as soon as their dependencies have finished.
+
+    A stage whose dependency failed or was skipped is skipped. Each stage's
+    start/end (relative to the start of the run) is recorded, and the critical
+    path - the dependency chain with the largest total duration, which bounds
+    the wall time no matter how much parallelism is available - is reported.
+    """
+
+    def __init__(self, max_threads: int = 8, max_processes: int = 2):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.stages: Dict[str, Stage] = {}
+        # Optional callable(stage_name) -> context manager wrapped around each
+        # stage run in this process (io stages), e.g. for profiling.
+        self.stage_hook: Optional[Callable[[str], Any]] = None
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Tuple[str, ...] = (),
+            kind: str = "io") -> None:
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind {kind!r}; expected one of {STAGE_KINDS}")
+        if name in self.stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        self.stages[name] = Stage(name, func, tuple(deps), kind)
+
+    def topological_order(self) -> List[str]:
+        """Stage names in dependency order; raises ValueError on unknown deps or cycles."""
+        for stage in self.stages.values():
+            unknown = [d for d in stage.deps if d not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {unknown}")
+        order, state = [], {}
+
+        def visit(name: str, chain: List[str]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+            state[name] = "visiting"
+            for dep in self.stages[name].deps:
+                visit(dep, chain + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def _run_stage(self, stage: Stage, inputs: Dict[str, Any]) -> Any:
+        if self.stage_hook is None:
+            return stage.func(inputs)
+        with self.stage_hook(stage.name):
+            return stage.func(inputs)
+
+    def run(self) -> PipelineRun:
+        order = self.topological_order()
+        run = PipelineRun(stages={name: StageResult(name, self.stages[name].kind) for name in order})
+        needs_processes = any(s.kind == "cpu" for s in self.stages.values())
+        started = time.perf_counter()
+
+        threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="stage")
+        processes = None
+        if needs_processes:
+            # forkserver children are forked from a clean single-threaded server,
+            # so they never inherit locks held by our io threads.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+            processes = ProcessPoolExecutor(max_workers=self.max_processes, mp_context=context)
+
+        running: Dict[Future, str] = {}
+        try:
+            pending = list(order)
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    dep_states = [run.stages[d].status for d in stage.deps]
+                    if any(s in ("failed", "skipped") for s in dep_states):
+                        run.stages[name].status = "skipped"
+                        pending.remove(name)
+                        continue
+                    if any(s != "ok" for s in dep_states):
+                        continue
+                    inputs = {d: run.stages[d].result for d in stage.deps}
+                    run.stages[name].start = time.perf_counter() - started
+                    if stage.kind == "cpu":
+                        future = processes.submit(stage.func, inputs)
+                    else:
+                        future = threads.submit(self._run_stage, stage, inputs)
+                    running[future] = name
+                    pending.remove(name)
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = run.stages[name]
+                    result.end = time.perf_counter() - started
+                    try:
+                        result.result = future.result()
+                        result.status = "ok"
+                    except Exception as e:
+                        result.status = "failed"
+                        result.error = f"{type(e).__name__}: {e}"
+        finally:
+            threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+
+        run.wall = time.perf_counter() - started
+        run.critical_path = self.critical_path(run)
+        return run
+
+    def critical_path(self, run: PipelineRun) -> List[str]:
+        """Longest chain of executed stages by summed duration."""
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.topological_order():
+            result = run.stages[name]
+            if result.status not in ("ok", "failed"):
+                continue
+            chains = [best[d] for d in self.stages[name].deps if d in best]
+            length, path = max(chains, key=lambda c: c[0]) if chains else (0.0, [])
+            best[name] = (length + result.duration, path + [name])
+        if not best:
+            return []
+        return max(best.values(), key=lambda c: c[0])[1]
+
+
+def format_report(run: PipelineRun) -> List[str]:
+    """Per-stage timing lines followed by the critical-path summary."""
+    lines = []
+    width = max((len(name) for name in run.stages), default=0)
+    icons = {"ok": "✅", "failed": "❌", "skipped": "⏭️ ", "pending": "⏸️ "}
+    for name, s in sorted(run.stages.items(), key=lambda item: (item[1].start, item[0])):
+        timing = f"{s.start * 1000:8.1f} → {s.end * 1000:8.1f} ms ({s.duration * 1000:8.1f} ms)" if s.end else "-"
+        line = f"   {icons.get(s.status, '?')} {name:<{width}} [{s.kind:>3}] {timing}"
+        if s.error:
+            line += f"  {s.error}"
+        lines.append(line)
+    summary = run.to_dict()
+    serial = summary["serial_seconds"]
+    lines.append(f"   ⏱️  Wall {run.wall * 1000:.1f} ms vs {serial * 1000:.1f} ms serial "
+                 f"({serial / run.wall if run.wall else 0:.2f}x)")
+    if run.critical_path:
+        lines.append(f"   🧭 Critical path: {' → '.join(run.critical_path)} "
+                     f"({summary['critical_path_seconds'] * 1000:.1f} ms)")
+    return lines
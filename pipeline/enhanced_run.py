@@ -0,0 +1,79 @@
+from functools import partial
+from typing import Any, Dict
+
+from pipeline.dag import StageDAG
+
+# Stage functions for `run --enhanced`. They are module-level (and bound with
+# functools.partial) so "cpu" stages can be pickled into worker processes.
+
+
+def discover(inputs: Dict[str, Any], scan_path: str) -> Dict[str, Any]:
+    from discovery.enhanced_scanner import EnhancedServiceScanner
+    return EnhancedServiceScanner().detect_services(scan_path)
+
+
+def render_config(inputs: Dict[str, Any], output_dir: str) -> Dict[str, Any]:
+    from generator.config_generator import ENHANCED_EXPORTERS, ENHANCED_TEMPLATE
+    from generator.exporter_settings import load_exporter_settings
+    from generator.output_writer import OutputWriter
+    from generator.spanmetrics import spanmetrics_settings
+    from generator.templates import get_template
+
+    services = inputs["discover"]
+    rendered = get_template(ENHANCED_TEMPLATE).render(
+        services=services, exporters=ENHANCED_EXPORTERS,
+        exporter_settings=load_exporter_settings(),
+        spanmetrics=spanmetrics_settings(services))
+    with OutputWriter(output_dir) as writer:
+        config_path = writer.write("otel-collector-config.yaml", rendered)
+    return {"path": config_path, "written": bool(writer.written)}
+
+
+def validate_config(inputs: Dict[str, Any]) -> bool:
+    from validators.validate_enhanced_config import validate_enhanced_config
+    if not validate_enhanced_config(inputs["render_config"]["path"]):
+        raise ValueError("enhanced configuration validation failed")
+    return True
+
+
+def env_files(inputs: Dict[str, Any]) -> Dict[str, str]:
+    from generator.env_generator import generate_all_env_outputs
+    return generate_all_env_outputs(inputs["discover"], "output")
+
+
+def dashboards(inputs: Dict[str, Any], output_dir: str) -> Any:
+    from generator.dashboard_generator import DashboardGenerator
+    return DashboardGenerator().generate_all_dashboards(inputs["discover"], output_dir)
+
+
+def backend_health(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    from validators.exporter_health_check import ExporterHealthChecker
+    checker = ExporterHealthChecker()
+    results = checker.check_all_backends()
+    return {"results": results, "recommendations": checker.get_recommendations(results)}
+
+
+def instrumentation(inputs: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    from validators.instrumentation_check import InstrumentationChecker
+    return InstrumentationChecker().check_all_services(inputs["discover"])
+
+
+def build_enhanced_pipeline(scan_path: str, output_dir: str, dashboards_dir: str = "output/dashboards",
+                            max_threads: int = 8, max_processes: int = 2) -> StageDAG:
+    """The run --enhanced stages and their dependencies.
+
+    Backend health checks need nothing from discovery and start immediately.
+    Env files and dashboards wait for a valid config, as before; instrumentation
+    checks only need the discovered services. Dashboard generation is the CPU
+    heavy stage (it scales with the number of services) and runs in a process.
+    """
+    dag = StageDAG(max_threads=max_threads, max_processes=max_processes)
+    dag.add("discover", partial(discover, scan_path=scan_path))
+    dag.add("backend_health", backend_health)
+    dag.add("render_config", partial(render_config, output_dir=output_dir), deps=("discover",))
+    dag.add("validate_config", validate_config, deps=("render_config",))
+    dag.add("env_files", env_files, deps=("discover", "validate_config"))
+    dag.add("dashboards", partial(dashboards, output_dir=dashboards_dir), deps=("discover", "validate_config"),
+            kind="cpu")
+    dag.add("instrumentation", instrumentation, deps=("discover",))
+    return dag
@@ -0,0 +1,289 @@
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+PROFILE_REPORT = Path("output/profile-report.json")
+
+# Sampler period for RSS / traced memory and, when a dump is requested, stacks.
+SAMPLE_INTERVAL = 0.005
+
+_active: Optional["Profiler"] = None
+_hook_installed = False
+# Set on threads while the profiler itself reads /proc, so its own opens are not counted.
+_local = threading.local()
+_thread_start = threading.Thread.start
+
+
+@contextmanager
+def _internal():
+    _local.internal = True
+    try:
+        yield
+    finally:
+        _local.internal = False
+
+
+def _audit(event: str, args: tuple) -> None:
+    profiler = _active
+    if profiler is None or getattr(_local, "internal", False):
+        return
+    if event == "open":
+        path, mode, flags = args
+        if isinstance(path, int):
+            return
+        if mode is not None:
+            reading = not any(c in mode for c in "wax+")
+        else:
+            reading = (flags or 0) & os.O_ACCMODE == os.O_RDONLY
+        if reading:
+            profiler._count("files_read")
+    elif event == "socket.connect":
+        profiler._count("network_calls")
+    elif event == "socket.getaddrinfo":
+        profiler._count("dns_lookups")
+
+
+def _start_in_stage(thread: threading.Thread) -> None:
+    # Helper threads (pool workers, background readers) inherit the stage of the thread that starts them.
+    profiler = _active
+    if profiler is not None:
+        thread._profiler_stage = profiler._current_record()
+    _thread_start(thread)
+
+
+def _io_counters(process: psutil.Process) -> Dict[str, int]:
+    try:
+        io = process.io_counters()
+    except (AttributeError, psutil.Error):
+        return {}
+    # read_chars counts every read() including sockets and page-cache hits; not on all platforms.
+    return {
+        "read_bytes": getattr(io, "read_chars", io.read_bytes),
+        "read_syscalls": io.read_count,
+        "write_syscalls": io.write_count,
+    }
+
+
+class _StageRecord:
+    def __init__(self, name: str, thread_id: int, process: psutil.Process):
+        self.name = name
+        self.thread_id = thread_id
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        with _internal():
+            self.io_start = _io_counters(process)
+            self.rss_peak = process.memory_info().rss
+        self.counts: Counter = Counter()
+        self.traced_peak = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        self.profile: Optional[cProfile.Profile] = None
+        self.result: Dict[str, Any] = {}
+
+
+class Profiler:
+    """Per-stage wall/CPU time, memory peaks, file/network activity and optional stack dumps.
+
+    A stage is any block wrapped in `stage(name)`: a whole CLI command, or each
+    stage of the run --enhanced DAG (stages on other threads are attributed via
+    the thread that entered them, and threads a stage starts inherit it). Counts
+    of files opened for reading, socket connects and DNS lookups come from audit
+    hooks and are per stage; events on threads with no open stage, such as a
+    pool worker reused after its stage ended, are reported as unattributed. RSS and
+    traced-memory peaks are sampled in the background and are the process peak
+    while the stage was running, so overlapping stages share them. Bytes read and
+    read/write syscall counts are process-wide deltas (psutil io_counters).
+    """
+
+    def __init__(self, cprofile: bool = False, sample_stacks: bool = False):
+        self.process = psutil.Process()
+        self.cprofile = cprofile
+        self.sample_stacks = sample_stacks
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.folded: Counter = Counter()
+        self.unattributed: Counter = Counter()
+        self._open: Dict[int, List[_StageRecord]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._stats: Optional[pstats.Stats] = None
+        self._started = 0.0
+        self._cpu_started = 0.0
+        self.rss_peak = 0
+
+    def start(self) -> None:
+        global _active, _hook_installed
+        if not _hook_installed:
+            sys.addaudithook(_audit)
+            _hook_installed = True
+        tracemalloc.start()
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        with _internal():
+            self.rss_peak = self.process.memory_info().rss
+        _active = self
+        threading.Thread.start = _start_in_stage
+        self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+    def _current_record(self) -> Optional[_StageRecord]:
+        """The innermost open stage of this thread, or of the thread that started it."""
+        with self._lock:
+            records = self._open.get(threading.get_ident())
+            if records:
+                return records[-1]
+            inherited = getattr(threading.current_thread(), "_profiler_stage", None)
+            if inherited is not None and inherited in self._open.get(inherited.thread_id, []):
+                return inherited
+        return None
+
+    def _count(self, key: str) -> None:
+        record = self._current_record()
+        with self._lock:
+            if record is not None:
+                record.counts[key] += 1
+            else:
+                self.unattributed[key] += 1
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        _local.internal = True
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            try:
+                rss = self.process.memory_info().rss
+            except psutil.Error:
+                continue
+            traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+            with self._lock:
+                self.rss_peak = max(self.rss_peak, rss)
+                for stack in self._open.values():
+                    for record in stack:
+                        record.rss_peak = max(record.rss_peak, rss)
+                        record.traced_peak = max(record.traced_peak, traced)
+            if self.sample_stacks:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own:
+                        continue
+                    frames = []
+                    while frame is not None:
+                        code = frame.f_code
+                        frames.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                        frame = frame.f_back
+                    self.folded[";".join(reversed(frames))] += 1
+
+    def enter(self, name: str) -> _StageRecord:
+        record = _StageRecord(name, threading.get_ident(), self.process)
+        if self.cprofile:
+            record.profile = cProfile.Profile()
+            try:
+                record.profile.enable()
+            except ValueError:
+                # Another profiler is already active on this thread (nested stage).
+                record.profile = None
+        with self._lock:
+            self._open.setdefault(record.thread_id, []).append(record)
+        return record
+
+    def exit(self, record: _StageRecord) -> None:
+        if record.profile is not None:
+            record.profile.disable()
+            with self._lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(record.profile)
+                else:
+                    self._stats.add(record.profile)
+        with _internal():
+            io_end = _io_counters(self.process)
+        with self._lock:
+            self._open[record.thread_id].remove(record)
+        self.stages[record.name] = {
+            "wall_seconds": round(time.perf_counter() - record.wall_start, 4),
+            "cpu_seconds": round(time.thread_time() - record.cpu_start, 4),
+            "peak_rss_bytes": record.rss_peak,
+            "tracemalloc_peak_bytes": record.traced_peak,
+            "files_read": record.counts["files_read"],
+            "network_calls": record.counts["network_calls"],
+            "dns_lookups": record.counts["dns_lookups"],
+            **{f"process_{k}": io_end[k] - record.io_start.get(k, 0) for k in io_end},
+        }
+
+    @contextmanager
+    def stage(self, name: str):
+        record = self.enter(name)
+        try:
+            yield record
+        finally:
+            self.exit(record)
+
+    def add_external(self, name: str, wall_seconds: float, **fields: Any) -> None:
+        """Record a stage that ran outside this process (e.g. a cpu stage in a worker)."""
+        self.stages.setdefault(name, {"wall_seconds": round(wall_seconds, 4), "external": True, **fields})
+
+    def stop(self) -> Dict[str, Any]:
+        global _active
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        _active = None
+        threading.Thread.start = _thread_start
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            "argv": sys.argv,
+            "wall_seconds": round(time.perf_counter() - self._started, 4),
+            "cpu_seconds": round(time.process_time() - self._cpu_started, 4),
+            "peak_rss_bytes": self.rss_peak,
+            "tracemalloc_peak_bytes": traced_peak,
+            "stages": self.stages,
+            "unattributed": dict(self.unattributed),
+        }
+
+    def save(self, report: Dict[str, Any], path: str = str(PROFILE_REPORT),
+             dump: Optional[str] = None) -> List[str]:
+        """Write the JSON report and, with `dump`, <dump>.prof (pstats) and <dump>.folded (flamegraph stacks)."""
+        written = []
+        report_path = Path(path)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        written.append(str(report_path))
+        if dump:
+            Path(dump).parent.mkdir(parents=True, exist_ok=True)
+            if self._stats is not None:
+                self._stats.dump_stats(f"{dump}.prof")
+                written.append(f"{dump}.prof")
+            if self.folded:
+                with open(f"{dump}.folded", "w") as f:
+                    for stack, count in sorted(self.folded.items()):
+                        f.write(f"{stack} {count}\n")
+                written.append(f"{dump}.folded")
+        return written
+
+
+def format_stage_table(report: Dict[str, Any]) -> List[str]:
+    lines = []
+    width = max((len(name) for name in report["stages"]), default=0)
+    for name, stage in report["stages"].items():
+        if stage.get("external"):
+            lines.append(f"   {name:<{width}} {stage['wall_seconds'] * 1000:8.1f} ms wall (worker process)")
+            continue
+        lines.append(
+            f"   {name:<{width}} {stage['wall_seconds'] * 1000:8.1f} ms wall {stage['cpu_seconds'] * 1000:8.1f} ms cpu "
+            f"{stage['peak_rss_bytes'] / 2**20:7.1f} MiB rss {stage['tracemalloc_peak_bytes'] / 2**20:6.1f} MiB py "
+            f"{stage['files_read']:>5} files {stage['network_calls']:>3} net")
+    unattributed = report.get("unattributed") or {}
+    if unattributed:
+        lines.append(f"   (no stage) {unattributed.get('files_read', 0)} files {unattributed.get('network_calls', 0)} net "
+                     f"{unattributed.get('dns_lookups', 0)} dns")
+    lines.append(f"   total {report['wall_seconds'] * 1000:.1f} ms wall, {report['cpu_seconds'] * 1000:.1f} ms cpu, "
+                 f"peak {report['peak_rss_bytes'] / 2**20:.1f} MiB rss")
+    return lines
@@ -0,0 +1,286 @@
+import io
+import os
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from discovery.enhanced_scanner import COMPOSE_FILES, K8S_EXTENSIONS, LOG_EXTENSIONS, EnhancedServiceScanner
+from generator.dashboard_specs import DASHBOARD_SPECS
+from generator.spanmetrics import LANGUAGE_KEYS
+
+# Files the instrumentation checks read, by name and by suffix.
+DEPENDENCY_FILES = {
+    "requirements.txt", "requirements-dev.txt", "pyproject.toml", "setup.py",
+    "package.json", "package-lock.json", "yarn.lock",
+    "pom.xml", "build.gradle", "build.gradle.kts", "go.mod",
+}
+DEPENDENCY_SUFFIXES = (".csproj", ".vbproj")
+SKIP_DIRS = {".git", "__pycache__"}
+
+# Pseudo discovery key for changed dependency files (they only affect instrumentation).
+DEPENDENCIES = "dependencies"
+
+
+def output_dependencies() -> Dict[str, Set[str]]:
+    """Which discovery keys each generated output is derived from.
+
+    The collector config only depends on services through the spanmetrics
+    settings (sized by the number of language services); each dashboard on its
+    spec's discovery keys, the overview on every language; the env file lists
+    every category.
+    """
+    deps = {
+        "config": set(LANGUAGE_KEYS),
+        "env": set(EnhancedServiceScanner().services),
+        "instrumentation": set(LANGUAGE_KEYS) | {DEPENDENCIES},
+    }
+    for spec in DASHBOARD_SPECS:
+        deps[f"dashboard:{spec.key}"] = set(spec.service_keys or LANGUAGE_KEYS)
+    return deps
+
+
+def affected_outputs(changed_keys: Set[str]) -> List[str]:
+    return [output for output, keys in output_dependencies().items() if keys & changed_keys]
+
+
+def _quiet():
+    return redirect_stdout(io.StringIO())
+
+
+class Watcher:
+    """Poll processes and files under scan_path; regenerate only the outputs a change affects.
+
+    Discovery state is kept per source (process table, compose files, one entry
+    per Kubernetes manifest, log file names) so a change re-reads only what
+    changed. Changes are debounced: outputs are regenerated once nothing has
+    changed for `debounce` seconds, or at the latest `max_wait` seconds after the
+    first change of a burst. Ports and cloud metadata are scanned once at start.
+    """
+
+    def __init__(self, scan_path: str = ".", output_dir: str = "output/generated-configs",
+                 dashboards_dir: str = "output/dashboards", env_dir: str = "output",
+                 interval: float = 1.0, debounce: float = 2.0, max_wait: float = 10.0):
+        self.scan_path = os.path.abspath(scan_path)
+        self.output_dir = output_dir
+        self.dashboards_dir = dashboards_dir
+        self.env_dir = env_dir
+        self.interval = interval
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.scanner = EnhancedServiceScanner()
+        self.processes: Dict[str, List[Any]] = {}
+        self.compose: List[Dict[str, Any]] = []
+        self.kubernetes: Dict[str, Dict[str, Any]] = {}
+        self.static: Dict[str, List[Any]] = {"ports": [], "cloud": []}
+        self.files: Dict[str, Optional[Tuple[int, int]]] = {}
+        self.changed_dependencies: Set[str] = set()
+        self.checked: Dict[Tuple[str, Any], str] = {}
+        self.dashboard_specs: Set[str] = set()
+        # Generated outputs live under the scan path by default; never react to them.
+        self._skip = {os.path.abspath(d) for d in (output_dir, dashboards_dir, env_dir)}
+
+    def services(self) -> Dict[str, List[Any]]:
+        """Merged discovery result, in the shape EnhancedServiceScanner.detect_services returns."""
+        services = {key: list(self.processes.get(key, [])) for key in self.scanner.services}
+        services["docker"].extend(self.compose)
+        services["kubernetes"] = [self.kubernetes[path] for path in sorted(self.kubernetes)]
+        services["logs"] = sorted(path for path in self.files if path.endswith(LOG_EXTENSIONS))
+        services.update(self.static)
+        return services
+
+    def _relevant(self, directory: str, name: str) -> bool:
+        return (name.endswith(K8S_EXTENSIONS) or name.endswith(LOG_EXTENSIONS) or name in DEPENDENCY_FILES
+                or name.endswith(DEPENDENCY_SUFFIXES) or (name in COMPOSE_FILES and directory == self.scan_path))
+
+    def _walk(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.scan_path):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and os.path.join(root, d) not in self._skip]
+            for name in files:
+                if not self._relevant(root, name):
+                    continue
+                path = os.path.join(root, name)
+                if name.endswith(LOG_EXTENSIONS):
+                    # Logs grow constantly; only their existence is discovery input.
+                    snapshot[path] = None
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll_processes(self) -> Set[str]:
+        scanner = EnhancedServiceScanner(self.scanner.extra_processes, self.scanner.extra_ports)
+        with _quiet():
+            scanner.scan_processes()
+        current = {key: found for key, found in scanner.services.items() if found}
+        changed = {key for key in set(current) | set(self.processes) if current.get(key) != self.processes.get(key)}
+        self.processes = current
+        return changed
+
+    def poll_files(self) -> Set[str]:
+        snapshot = self._walk()
+        changed_paths = [p for p in set(snapshot) | set(self.files) if snapshot.get(p, 0) != self.files.get(p, 0)]
+        self.files = snapshot
+        changed = set()
+        for path in changed_paths:
+            directory, name = os.path.split(path)
+            if name.endswith(LOG_EXTENSIONS):
+                changed.add("logs")
+            if name in COMPOSE_FILES and directory == self.scan_path:
+                compose = self._read_compose()
+                if compose != self.compose:
+                    self.compose = compose
+                    changed.add("docker")
+            if name.endswith(K8S_EXTENSIONS):
+                resource = self.scanner.kubernetes_resource(Path(path)) if path in snapshot else None
+                if resource != self.kubernetes.get(path):
+                    if resource:
+                        self.kubernetes[path] = resource
+                    else:
+                        self.kubernetes.pop(path, None)
+                    changed.add("kubernetes")
+            if name in DEPENDENCY_FILES or name.endswith(DEPENDENCY_SUFFIXES):
+                self.changed_dependencies.add(path)
+                changed.add(DEPENDENCIES)
+        return changed
+
+    def _read_compose(self) -> List[Dict[str, Any]]:
+        found = []
+        for name in COMPOSE_FILES:
+            path = os.path.join(self.scan_path, name)
+            if os.path.exists(path):
+                try:
+                    found.extend(self.scanner.compose_services(Path(path)))
+                except Exception as e:
+                    print(f"⚠️  Error parsing {name}: {e}")
+        return found
+
+    def start(self) -> Dict[str, Any]:
+        """Initial discovery and a full generation of every output."""
+        with _quiet():
+            self.scanner.scan_ports()
+            self.scanner.scan_cloud()
+        self.static = {"ports": self.scanner.services["ports"], "cloud": self.scanner.services["cloud"]}
+        self.poll_processes()
+        self.poll_files()
+        self.changed_dependencies.clear()
+        return self.regenerate(list(output_dependencies()))
+
+    def regenerate(self, outputs: List[str]) -> Dict[str, Any]:
+        """Regenerate the given outputs from the current discovery state; returns {output: status}."""
+        services = self.services()
+        results: Dict[str, Any] = {}
+        if "config" in outputs:
+            results["config"] = self._config(services)
+        if "env" in outputs:
+            results["env"] = self._env(services)
+        dashboards = [o.split(":", 1)[1] for o in outputs if o.startswith("dashboard:")]
+        if dashboards:
+            results.update(self._dashboards(services, dashboards))
+        if "instrumentation" in outputs:
+            results["instrumentation"] = self._instrumentation(services)
+        self.changed_dependencies.clear()
+        return results
+
+    def _config(self, services: Dict[str, List[Any]]) -> str:
+        from pipeline.enhanced_run import render_config, validate_config
+        with _quiet():
+            config = render_config({"discover": services}, self.output_dir)
+        if not config["written"]:
+            return "unchanged"
+        try:
+            with _quiet():
+                validate_config({"render_config": config})
+        except ValueError:
+            return "written, validation failed"
+        return "written"
+
+    def _env(self, services: Dict[str, List[Any]]) -> str:
+        from generator.env_generator import generate_env_file, generate_setup_instructions
+        from generator.output_writer import OutputWriter
+        with OutputWriter(self.env_dir) as writer:
+            generate_env_file(services, self.env_dir, writer)
+            generate_setup_instructions(services, self.env_dir, writer)
+        return "written" if writer.written else "unchanged"
+
+    def _dashboards(self, services: Dict[str, List[Any]], keys: List[str]) -> Dict[str, str]:
+        from generator.dashboard_generator import DashboardGenerator, applicable_specs, render_json
+        from generator.output_writer import OutputWriter
+        generator = DashboardGenerator()
+        applicable = {spec.key for spec in applicable_specs(services)}
+        if applicable != self.dashboard_specs:
+            # The set of dashboards changed, and with it the recording rules,
+            # cost report and import instructions: regenerate them all.
+            self.dashboard_specs = applicable
+            with _quiet():
+                generator.generate_all_dashboards(services, self.dashboards_dir)
+            return {f"dashboard:{key}": "regenerated (dashboard set changed)" for key in sorted(applicable)}
+        results = {}
+        with OutputWriter(self.dashboards_dir) as writer:
+            with _quiet():
+                built = generator.build_dashboards(services, keys)
+            for spec, dashboard in built:
+                before = len(writer.written)
+                writer.write(spec.file_name, render_json(dashboard))
+                results[f"dashboard:{spec.key}"] = "written" if len(writer.written) > before else "unchanged"
+        return results
+
+    def _instrumentation(self, services: Dict[str, List[Any]]) -> Dict[str, str]:
+        """Check services not checked before and those whose project has a changed dependency file."""
+        from validators.instrumentation_check import InstrumentationChecker
+        checker = InstrumentationChecker()
+        changed_dirs = {os.path.dirname(p) for p in self.changed_dependencies}
+        todo: Dict[str, List[Any]] = {}
+        current = {}
+        for key in LANGUAGE_KEYS:
+            for info in services.get(key, []):
+                identity = (key, info.get("pid"))
+                path = os.path.abspath(checker.service_path(info))
+                current[identity] = path
+                if identity not in self.checked or any(d == path or d.startswith(path + os.sep)
+                                                       for d in changed_dirs):
+                    todo.setdefault(key, []).append(info)
+        self.checked = current
+        if not todo:
+            return {}
+        with _quiet():
+            results = checker.check_all_services(todo)
+        return {name: result["status"] for name, result in results.items()}
+
+    def run(self, max_cycles: Optional[int] = None) -> None:
+        """Poll until interrupted (or for `max_cycles` polls), regenerating debounced changes."""
+        self._print_results(self.start())
+        print(f"👀 Watching {self.scan_path} (poll {self.interval}s, debounce {self.debounce}s)...")
+        pending: Set[str] = set()
+        first = last = 0.0
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            time.sleep(self.interval)
+            cycles += 1
+            changed = self.poll_processes() | self.poll_files()
+            now = time.monotonic()
+            if changed:
+                if not pending:
+                    first = now
+                pending |= changed
+                last = now
+            if pending and (now - last >= self.debounce or now - first >= self.max_wait):
+                outputs = affected_outputs(pending)
+                print(f"\n🔁 Changed: {', '.join(sorted(pending))} → {', '.join(outputs)}")
+                started = time.perf_counter()
+                self._print_results(self.regenerate(outputs))
+                print(f"   ⏱️  {(time.perf_counter() - started) * 1000:.1f} ms")
+                pending = set()
+
+    def _print_results(self, results: Dict[str, Any]) -> None:
+        for output, status in results.items():
+            if output == "instrumentation":
+                for service, state in status.items():
+                    print(f"   {'✅' if state == 'instrumented' else '❌'} {service}: {state}")
+                continue
+            print(f"   {'✅' if status in ('written', 'unchanged') or status.startswith('regenerated') else '❌'} "
+                  f"{output}: {status}")
@@ -0,0 +1,81 @@
+import gzip
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+# zstd and snappy are optional: the collector supports them, but the Python
+# bindings are not part of requirements.txt.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import snappy
+except ImportError:
+    snappy = None
+
+try:
+    import cramjam
+except ImportError:
+    cramjam = None
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return bytes(cramjam.zstd.compress(data, level=3))
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=256 * 1024 * 1024)
+    return bytes(cramjam.zstd.decompress(data))
+
+
+def _snappy_compress(data: bytes) -> bytes:
+    if snappy is not None:
+        return snappy.compress(data)
+    return bytes(cramjam.snappy.compress_raw(data))
+
+
+def _snappy_decompress(data: bytes) -> bytes:
+    if snappy is not None:
+        return snappy.decompress(data)
+    return bytes(cramjam.snappy.decompress_raw(data))
+
+
+# codec name (as used by the collector's `compression` setting) -> (compress, decompress)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (lambda data: data, lambda data: data),
+    "gzip": (lambda data: gzip.compress(data, compresslevel=6), gzip.decompress),
+    "deflate": (lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if zstandard is not None or cramjam is not None:
+    CODECS["zstd"] = (_zstd_compress, _zstd_decompress)
+if snappy is not None or cramjam is not None:
+    CODECS["snappy"] = (_snappy_compress, _snappy_decompress)
+
+# Install hints for codecs the collector supports but this interpreter cannot exercise.
+MISSING_CODEC_HINTS = {
+    "zstd": "pip install zstandard",
+    "snappy": "pip install python-snappy",
+}
+
+
+def available_codecs() -> Dict[str, bool]:
+    """Report which of the collector-supported codecs can be benchmarked here."""
+    return {name: name in CODECS for name in ["none", "gzip", "zstd", "snappy", "deflate"]}
+
+
+def compress(codec: str, data: bytes) -> bytes:
+    return CODECS[codec][0](data)
+
+
+def decompress(content_encoding: Optional[str], data: bytes) -> bytes:
+    """Decode a request body according to its Content-Encoding header."""
+    codec = (content_encoding or "none").strip().lower() or "none"
+    if codec == "identity":
+        codec = "none"
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported content encoding: {codec}")
+    return CODECS[codec][1](data)
@@ -0,0 +1,153 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+# Buckets of the collector's otelcol_processor_batch_batch_send_size histogram.
+BATCH_SIZE_BUCKETS = [10, 25, 50, 75, 100, 250, 500, 750, 1000, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000,
+                      10000, 20000, 30000, 50000, 100000]
+
+_HEALTHY_EXPORTER = {"items_per_second": 500.0, "queue_fill": 0.02, "capacity": 10000,
+                     "send_failed_per_second": 0.0, "enqueue_failed_per_second": 0.0}
+
+# Collector behaviours the stand-in can imitate. Rates are per second of uptime;
+# queue_fill is the fraction of the sending queue in use at the end of a ramp.
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "healthy": {
+        "exporters": {"otlphttp/elastic": _HEALTHY_EXPORTER, "otlphttp/influxdb": _HEALTHY_EXPORTER},
+        "batch": {"send_size": 300, "batches_per_second": 3.0, "size_trigger_ratio": 0.1},
+        "memory_limiter_refused_per_second": 0.0,
+        "rss_mib": 420,
+    },
+    "saturated-exporter": {
+        "exporters": {
+            "otlphttp/elastic": {"items_per_second": 2000.0, "queue_fill": 0.97, "capacity": 10000,
+                                 "send_failed_per_second": 0.0, "enqueue_failed_per_second": 150.0},
+            "otlphttp/influxdb": _HEALTHY_EXPORTER,
+        },
+        "batch": {"send_size": 700, "batches_per_second": 4.0, "size_trigger_ratio": 0.3},
+        "memory_limiter_refused_per_second": 0.0,
+        "rss_mib": 900,
+    },
+    "undersized-batch": {
+        "exporters": {"otlphttp/elastic": _HEALTHY_EXPORTER, "otlphttp/influxdb": _HEALTHY_EXPORTER},
+        "batch": {"send_size": 1024, "batches_per_second": 40.0, "size_trigger_ratio": 0.98},
+        "memory_limiter_refused_per_second": 0.0,
+        "rss_mib": 600,
+    },
+    "memory-limited": {
+        "exporters": {"otlphttp/elastic": _HEALTHY_EXPORTER, "otlphttp/influxdb": _HEALTHY_EXPORTER},
+        "batch": {"send_size": 500, "batches_per_second": 5.0, "size_trigger_ratio": 0.4},
+        "memory_limiter_refused_per_second": 250.0,
+        "rss_mib": 1480,
+    },
+}
+
+
+class CollectorMetricsStandIn:
+    """Local stand-in for the collector's internal metrics endpoint (:8888/metrics).
+
+    Serves Prometheus text in the collector's own metric names and labels, with
+    counters growing at the scenario's rates since start, so the telemetry
+    analyzer can be exercised without a running collector.
+    """
+
+    def __init__(self, scenario: str = "healthy", host: str = "127.0.0.1", port: int = 0, ramp_seconds: float = 10.0):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {scenario!r}; choose from {', '.join(SCENARIOS)}")
+        self.scenario = SCENARIOS[scenario]
+        self.host = host
+        self.port = port
+        self.ramp_seconds = ramp_seconds
+        self._server = None
+        self._started = time.monotonic()
+
+    @property
+    def metrics_url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def render(self) -> str:
+        uptime = time.monotonic() - self._started
+        ramp = min(1.0, uptime / self.ramp_seconds) if self.ramp_seconds else 1.0
+        base = 'service_name="otelcol-contrib",service_version="0.96.0"'
+        lines: List[str] = []
+
+        def sample(name: str, labels: str, value: float):
+            lines.append(f"{name}{{{labels},{base}}} {value:g}")
+
+        for exporter, model in self.scenario["exporters"].items():
+            labels = f'exporter="{exporter}"'
+            sample("otelcol_exporter_queue_capacity", labels, model["capacity"])
+            sample("otelcol_exporter_queue_size", labels, round(model["capacity"] * model["queue_fill"] * ramp))
+            sample("otelcol_exporter_sent_spans", labels, round(model["items_per_second"] * uptime))
+            sample("otelcol_exporter_send_failed_spans", labels, round(model["send_failed_per_second"] * uptime))
+            sample("otelcol_exporter_enqueue_failed_spans", labels, round(model["enqueue_failed_per_second"] * uptime))
+
+        batch = self.scenario["batch"]
+        batches = batch["batches_per_second"] * uptime
+        labels = 'processor="batch"'
+        for bound in BATCH_SIZE_BUCKETS:
+            sample("otelcol_processor_batch_batch_send_size_bucket", f'{labels},le="{bound}"',
+                   round(batches) if batch["send_size"] <= bound else 0)
+        sample("otelcol_processor_batch_batch_send_size_bucket", f'{labels},le="+Inf"', round(batches))
+        sample("otelcol_processor_batch_batch_send_size_sum", labels, round(batches) * batch["send_size"])
+        sample("otelcol_processor_batch_batch_send_size_count", labels, round(batches))
+        sample("otelcol_processor_batch_batch_size_trigger_send", labels, round(batches * batch["size_trigger_ratio"]))
+        sample("otelcol_processor_batch_timeout_trigger_send", labels,
+               round(batches) - round(batches * batch["size_trigger_ratio"]))
+
+        refused = round(self.scenario["memory_limiter_refused_per_second"] * uptime)
+        sample("otelcol_processor_refused_spans", 'processor="memory_limiter"', refused)
+        sample("otelcol_receiver_refused_spans", 'receiver="otlp",transport="http"', refused)
+        sample("otelcol_process_memory_rss", 'service_instance_id="stand-in"', self.scenario["rss_mib"] * 1024 * 1024)
+        return "\n".join(lines) + "\n"
+
+    def start(self) -> "CollectorMetricsStandIn":
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = stand_in.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._started = time.monotonic()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "CollectorMetricsStandIn":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import sys
+    scenario = sys.argv[1] if len(sys.argv) > 1 else "healthy"
+    with CollectorMetricsStandIn(scenario, port=8888) as stand_in:
+        print(f"📊 Collector metrics stand-in ({scenario}) serving {stand_in.metrics_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,156 @@
+import logging
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from opentelemetry.exporter.otlp.proto.common._log_encoder import encode_logs
+from opentelemetry.exporter.otlp.proto.common.metrics_encoder import encode_metrics
+from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+from opentelemetry.sdk._logs.export import SimpleLogRecordProcessor
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+try:
+    from opentelemetry.sdk._logs.export import InMemoryLogRecordExporter as InMemoryLogExporter
+except ImportError:  # older SDK releases
+    from opentelemetry.sdk._logs.export import InMemoryLogExporter
+
+SIGNALS = ["traces", "metrics", "logs"]
+
+DEFAULT_SERVICES = [
+    ("checkout", "python"),
+    ("frontend", "nodejs"),
+    ("inventory", "java"),
+]
+
+HTTP_ROUTES = ["/api/orders", "/api/orders/{id}", "/api/cart", "/api/users/{id}", "/health"]
+
+
+def _resource(service_name: str, language: str) -> Resource:
+    return Resource.create({
+        "service.name": service_name,
+        "service.version": "1.0.0",
+        "deployment.environment": "dev",
+        "telemetry.sdk.language": language,
+        "host.name": "bench-host",
+    })
+
+
+def build_trace_payload(spans_per_service: int = 200, services=None, seed: int = 7) -> bytes:
+    """Build a serialized ExportTraceServiceRequest resembling real HTTP service traffic."""
+    rng = random.Random(seed)
+    finished = []
+    for service_name, language in services or DEFAULT_SERVICES:
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider(resource=_resource(service_name, language))
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = provider.get_tracer("otel-integrator.simulator")
+        for _ in range(spans_per_service):
+            route = rng.choice(HTTP_ROUTES)
+            status = rng.choice([200, 200, 200, 201, 404, 500])
+            with tracer.start_as_current_span(f"GET {route}") as span:
+                span.set_attribute("http.method", "GET")
+                span.set_attribute("http.route", route)
+                span.set_attribute("http.status_code", status)
+                span.set_attribute("net.peer.name", f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}")
+                with tracer.start_as_current_span("db.query") as child:
+                    child.set_attribute("db.system", "postgresql")
+                    child.set_attribute("db.operation", rng.choice(["SELECT", "INSERT", "UPDATE"]))
+        finished.extend(exporter.get_finished_spans())
+        provider.shutdown()
+    return encode_spans(finished).SerializeToString()
+
+
+def build_metrics_payload(series_per_service: int = 50, services=None, seed: int = 7) -> bytes:
+    """Build a serialized ExportMetricsServiceRequest with counters and histograms."""
+    rng = random.Random(seed)
+    payload = b""
+    for service_name, language in services or DEFAULT_SERVICES:
+        reader = InMemoryMetricReader()
+        provider = MeterProvider(resource=_resource(service_name, language), metric_readers=[reader])
+        meter = provider.get_meter("otel-integrator.simulator")
+        requests_total = meter.create_counter("http.server.requests")
+        duration = meter.create_histogram("http.server.duration", unit="ms")
+        for i in range(series_per_service):
+            attributes = {
+                "http.route": HTTP_ROUTES[i % len(HTTP_ROUTES)],
+                "http.status_code": rng.choice([200, 404, 500]),
+                "instance": f"worker-{i}",
+            }
+            requests_total.add(rng.randint(1, 100), attributes)
+            for _ in range(5):
+                duration.record(rng.expovariate(1 / 40.0), attributes)
+        payload += encode_metrics(reader.get_metrics_data()).SerializeToString()
+        provider.shutdown()
+    return payload
+
+
+def build_logs_payload(records_per_service: int = 200, services=None, seed: int = 7) -> bytes:
+    """Build a serialized ExportLogsServiceRequest from structured application logs."""
+    rng = random.Random(seed)
+    finished = []
+    for service_name, language in services or DEFAULT_SERVICES:
+        exporter = InMemoryLogExporter()
+        provider = LoggerProvider(resource=_resource(service_name, language))
+        provider.add_log_record_processor(SimpleLogRecordProcessor(exporter))
+        logger = logging.getLogger(f"otel-integrator.simulator.{service_name}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = LoggingHandler(logger_provider=provider)
+        logger.addHandler(handler)
+        try:
+            for _ in range(records_per_service):
+                route = rng.choice(HTTP_ROUTES)
+                logger.info(
+                    "handled request %s in %.1fms", route, rng.expovariate(1 / 40.0),
+                    extra={"http.route": route, "request.id": f"{rng.getrandbits(64):016x}"},
+                )
+        finally:
+            logger.removeHandler(handler)
+        finished.extend(exporter.get_finished_logs())
+        provider.shutdown()
+    return encode_logs(finished).SerializeToString()
+
+
+def build_sample_payloads(scale: int = 1) -> Dict[str, bytes]:
+    """Build one representative payload per signal, scaled by `scale`."""
+    return {
+        "traces": build_trace_payload(200 * scale),
+        "metrics": build_metrics_payload(50 * scale),
+        "logs": build_logs_payload(200 * scale),
+    }
+
+
+def load_payload_files(paths: List[str]) -> Dict[str, bytes]:
+    """Load captured protobuf payloads; the signal is taken from the file name (e.g. traces-0001.bin)."""
+    payloads: Dict[str, bytes] = {}
+    for path in paths:
+        file_path = Path(path)
+        files = sorted(file_path.glob("*.bin")) if file_path.is_dir() else [file_path]
+        for payload_file in files:
+            signal = _signal_from_name(payload_file.name)
+            if signal is None:
+                print(f"⚠️  Skipping {payload_file}: cannot tell which signal it holds")
+                continue
+            payloads[signal] = payloads.get(signal, b"") + payload_file.read_bytes()
+    return payloads
+
+
+def _signal_from_name(name: str) -> Optional[str]:
+    for signal in SIGNALS:
+        if name.startswith(signal):
+            return signal
+    return None
+
+
+if __name__ == "__main__":
+    start = time.time()
+    for signal, data in build_sample_payloads().items():
+        print(f"✅ {signal}: {len(data)} bytes")
+    print(f"⏱️  Built payloads in {time.time() - start:.2f}s")
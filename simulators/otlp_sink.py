@@ -0,0 +1,218 @@
+import threading
+import time
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from opentelemetry.proto.collector.logs.v1 import logs_service_pb2
+from opentelemetry.proto.collector.metrics.v1 import metrics_service_pb2
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+
+from simulators.codecs import decompress
+
+try:
+    import grpc
+    from opentelemetry.proto.collector.logs.v1 import logs_service_pb2_grpc
+    from opentelemetry.proto.collector.metrics.v1 import metrics_service_pb2_grpc
+    from opentelemetry.proto.collector.trace.v1 import trace_service_pb2_grpc
+except ImportError:
+    grpc = None
+
+# OTLP/HTTP path -> (signal, request message, response message)
+SIGNAL_PATHS = {
+    "/v1/traces": ("traces", trace_service_pb2.ExportTraceServiceRequest, trace_service_pb2.ExportTraceServiceResponse),
+    "/v1/metrics": ("metrics", metrics_service_pb2.ExportMetricsServiceRequest, metrics_service_pb2.ExportMetricsServiceResponse),
+    "/v1/logs": ("logs", logs_service_pb2.ExportLogsServiceRequest, logs_service_pb2.ExportLogsServiceResponse),
+}
+
+GRPC_FRAME_HEADER_BYTES = 5  # compressed flag + 4-byte length prefix per message
+
+
+def count_items(signal: str, request: Any) -> int:
+    """Count spans, metric data points or log records in an OTLP export request."""
+    total = 0
+    if signal == "traces":
+        for resource_spans in request.resource_spans:
+            for scope_spans in resource_spans.scope_spans:
+                total += len(scope_spans.spans)
+    elif signal == "metrics":
+        for resource_metrics in request.resource_metrics:
+            for scope_metrics in resource_metrics.scope_metrics:
+                for metric in scope_metrics.metrics:
+                    data = getattr(metric, metric.WhichOneof("data") or "gauge")
+                    total += len(data.data_points)
+    elif signal == "logs":
+        for resource_logs in request.resource_logs:
+            for scope_logs in resource_logs.scope_logs:
+                total += len(scope_logs.log_records)
+    return total
+
+
+class OTLPSink:
+    """Local OTLP receiver (HTTP and optionally gRPC) that records what it was sent.
+
+    Used as a stand-in for the collector or a backend by the benchmark and
+    verification commands. Listeners registered with `add_listener` are called
+    with (signal, decoded request, received_at) for every accepted export.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", http_port: int = 0, grpc_port: Optional[int] = None,
+                 capture_dir: Optional[str] = None):
+        self.host = host
+        self.http_port = http_port
+        self.grpc_port = grpc_port
+        self.capture_dir = Path(capture_dir) if capture_dir else None
+        self.listeners: List[Callable[[str, Any, float], None]] = []
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self._http_server = None
+        self._http_thread = None
+        self._grpc_server = None
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {
+                signal: {"requests": 0, "items": 0, "wire_bytes": 0, "raw_bytes": 0, "errors": 0}
+                for signal in ["traces", "metrics", "logs"]
+            }
+            self._capture_seq = 0
+
+    def add_listener(self, listener: Callable[[str, Any, float], None]):
+        self.listeners.append(listener)
+
+    @property
+    def http_endpoint(self) -> str:
+        return f"http://{self.host}:{self.http_port}"
+
+    @property
+    def grpc_endpoint(self) -> str:
+        return f"{self.host}:{self.grpc_port}"
+
+    def start(self) -> "OTLPSink":
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                route = SIGNAL_PATHS.get(self.path.split("?", 1)[0])
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if route is None:
+                    self._reply(404, b"")
+                    return
+                signal, request_type, response_type = route
+                try:
+                    raw = decompress(self.headers.get("Content-Encoding"), body)
+                    request = request_type.FromString(raw)
+                except Exception:
+                    sink._record_error(signal)
+                    self._reply(400, b"")
+                    return
+                sink._record(signal, request, wire_bytes=len(body), raw_bytes=len(raw), raw=raw)
+                self._reply(200, response_type().SerializeToString())
+
+            def _reply(self, status: int, payload: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/x-protobuf")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer((self.host, self.http_port), Handler)
+        self._http_server.daemon_threads = True
+        self.http_port = self._http_server.server_address[1]
+        self._http_thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        self._http_thread.start()
+
+        if self.grpc_port is not None:
+            self._start_grpc()
+        return self
+
+    def _start_grpc(self):
+        if grpc is None:
+            raise RuntimeError("grpcio is not installed; cannot start the gRPC sink")
+        sink = self
+
+        def make_servicer(base, signal, response_type):
+            class Servicer(base):
+                def Export(self, request, context):
+                    size = request.ByteSize()
+                    sink._record(signal, request, wire_bytes=size + GRPC_FRAME_HEADER_BYTES, raw_bytes=size)
+                    return response_type()
+            return Servicer()
+
+        self._grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=16))
+        trace_service_pb2_grpc.add_TraceServiceServicer_to_server(
+            make_servicer(trace_service_pb2_grpc.TraceServiceServicer, "traces", trace_service_pb2.ExportTraceServiceResponse),
+            self._grpc_server)
+        metrics_service_pb2_grpc.add_MetricsServiceServicer_to_server(
+            make_servicer(metrics_service_pb2_grpc.MetricsServiceServicer, "metrics", metrics_service_pb2.ExportMetricsServiceResponse),
+            self._grpc_server)
+        logs_service_pb2_grpc.add_LogsServiceServicer_to_server(
+            make_servicer(logs_service_pb2_grpc.LogsServiceServicer, "logs", logs_service_pb2.ExportLogsServiceResponse),
+            self._grpc_server)
+        self.grpc_port = self._grpc_server.add_insecure_port(f"{self.host}:{self.grpc_port}")
+        self._grpc_server.start()
+
+    def stop(self):
+        if self._http_server:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+        if self._grpc_server:
+            self._grpc_server.stop(grace=0)
+            self._grpc_server = None
+
+    def __enter__(self) -> "OTLPSink":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _record(self, signal: str, request: Any, wire_bytes: int, raw_bytes: int, raw: Optional[bytes] = None):
+        received_at = time.time()
+        items = count_items(signal, request)
+        with self.condition:
+            stats = self.stats[signal]
+            stats["requests"] += 1
+            stats["items"] += items
+            stats["wire_bytes"] += wire_bytes
+            stats["raw_bytes"] += raw_bytes
+            seq = self._capture_seq = self._capture_seq + 1
+            self.condition.notify_all()
+        if self.capture_dir is not None:
+            self.capture_dir.mkdir(parents=True, exist_ok=True)
+            data = raw if raw is not None else request.SerializeToString()
+            (self.capture_dir / f"{signal}-{seq:06d}.bin").write_bytes(data)
+        for listener in self.listeners:
+            listener(signal, request, received_at)
+
+    def _record_error(self, signal: str):
+        with self.lock:
+            self.stats[signal]["errors"] += 1
+
+    def wait_for(self, predicate: Callable[[Dict[str, Dict[str, int]]], bool], timeout: float) -> bool:
+        """Block until `predicate(stats)` holds or `timeout` seconds pass."""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while not predicate(self.stats):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            return True
+
+
+if __name__ == "__main__":
+    with OTLPSink(http_port=4318, capture_dir="output/captured-payloads") as sink:
+        print(f"📥 OTLP sink listening on {sink.http_endpoint}, capturing to output/captured-payloads")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"📊 Received: {sink.stats}")
@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from validators.exporter_health_check import PHASES, ExporterHealthChecker, percentiles
+
+DEFAULT_INTERVAL = 15.0
+# Each probe is scheduled interval * (1 ± jitter) after the previous one, so
+# monitors on many hosts (and the backends on one host) do not probe in lockstep.
+DEFAULT_JITTER = 0.2
+# Samples kept per backend: 240 x 15s = one hour of rolling history.
+DEFAULT_WINDOW = 240
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318/v1/metrics"
+DEFAULT_EXPORT_INTERVAL = 15.0
+METER_NAME = "otel-integrator.backend-monitor"
+# Explicit histogram buckets (ms) for probe latency.
+LATENCY_BUCKETS_MS = [1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class BackendWindow:
+    """Rolling per-backend probe results in fixed-size ring buffers."""
+
+    def __init__(self, size: int = DEFAULT_WINDOW):
+        self.outcomes: Deque[bool] = deque(maxlen=size)
+        self.latency: Dict[str, Deque[float]] = {phase: deque(maxlen=size) for phase in PHASES}
+        self.last_status = "unknown"
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def add(self, ok: bool, phases: Dict[str, float], status: str, error: Optional[str]) -> None:
+        with self._lock:
+            self.outcomes.append(ok)
+            for phase, value in phases.items():
+                self.latency[phase].append(value)
+            self.last_status = status
+            self.last_error = error
+
+    def availability(self) -> Optional[float]:
+        with self._lock:
+            return sum(self.outcomes) / len(self.outcomes) if self.outcomes else None
+
+    def latency_percentiles(self) -> Dict[str, Optional[Dict[str, float]]]:
+        with self._lock:
+            return {phase: percentiles(list(values)) for phase, values in self.latency.items()}
+
+    def summary(self) -> Dict[str, Any]:
+        availability = self.availability()
+        return {
+            "status": self.last_status,
+            "samples": len(self.outcomes),
+            "availability": round(availability, 4) if availability is not None else None,
+            "latency_ms": self.latency_percentiles(),
+            "error": self.last_error,
+        }
+
+
+class BackendMonitor:
+    """Probe every backend on a jittered schedule and export rolling health as OTLP metrics.
+
+    Probes go through ExporterHealthChecker (one fresh connection per probe, so
+    connect and TLS are measured each time). Each probe is also recorded in a
+    latency histogram; availability and windowed p50/p95/p99 are exported as
+    observable gauges read from the ring buffers at export time.
+    """
+
+    def __init__(self, checker: Optional[ExporterHealthChecker] = None, interval: float = DEFAULT_INTERVAL,
+                 jitter: float = DEFAULT_JITTER, window: int = DEFAULT_WINDOW,
+                 otlp_endpoint: Optional[str] = DEFAULT_OTLP_ENDPOINT,
+                 export_interval: float = DEFAULT_EXPORT_INTERVAL, seed: Optional[int] = None):
+        self.checker = checker or ExporterHealthChecker(probes=1, fresh_connections=True)
+        self.interval = interval
+        self.jitter = jitter
+        self.windows = {name: BackendWindow(window) for name in self.checker.backend_endpoints}
+        self.otlp_endpoint = otlp_endpoint
+        self.export_interval = export_interval
+        self.random = random.Random(seed)
+        self.meter_provider = None
+        self._histogram = None
+        self._stop = threading.Event()
+
+    def next_delay(self) -> float:
+        return max(0.0, self.interval * (1 + self.random.uniform(-self.jitter, self.jitter)))
+
+    def probe(self, name: str) -> Dict[str, Any]:
+        # A probe may not outlive its slot in the schedule.
+        timeout = min(self.checker.timeout, self.interval)
+        result = self.checker.check_backend(name, probes=1, deadline_at=time.monotonic() + timeout)
+        phases = {phase: stats["p50"] for phase, stats in result["latency_ms"].items() if stats}
+        ok = result["status"] == "healthy"
+        self.windows[name].add(ok, phases, result["status"], result.get("error"))
+        if self._histogram is not None:
+            for phase, value in phases.items():
+                self._histogram.record(value, {"backend": name, "phase": phase, "outcome": "ok" if ok else "failed"})
+        return result
+
+    def start_export(self) -> None:
+        """Set up a meter provider exporting to the local collector over OTLP/HTTP."""
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        from opentelemetry.metrics import CallbackOptions, Observation
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+
+        reader = PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=self.otlp_endpoint),
+                                               export_interval_millis=self.export_interval * 1000)
+        self.meter_provider = MeterProvider(
+            resource=Resource.create({SERVICE_NAME: "otel-integrator-backend-monitor"}),
+            metric_readers=[reader],
+            views=[View(instrument_name="backend.probe.duration",
+                        aggregation=ExplicitBucketHistogramAggregation(LATENCY_BUCKETS_MS))],
+        )
+        meter = self.meter_provider.get_meter(METER_NAME)
+        self._histogram = meter.create_histogram(
+            "backend.probe.duration", unit="ms", description="Backend health probe latency by phase")
+
+        def availability(options: CallbackOptions) -> Iterable[Observation]:
+            for name, window in self.windows.items():
+                value = window.availability()
+                if value is not None:
+                    yield Observation(value, {"backend": name})
+
+        def latency(options: CallbackOptions) -> Iterable[Observation]:
+            for name, window in self.windows.items():
+                for phase, stats in window.latency_percentiles().items():
+                    for quantile, value in (stats or {}).items():
+                        yield Observation(value, {"backend": name, "phase": phase, "quantile": quantile})
+
+        meter.create_observable_gauge("backend.availability", [availability], unit="1",
+                                      description="Share of successful probes over the rolling window")
+        meter.create_observable_gauge("backend.latency", [latency], unit="ms",
+                                      description="Rolling probe latency percentiles by phase")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self, duration: Optional[float] = None, report_every: float = 60.0) -> Dict[str, Dict[str, Any]]:
+        """Probe until stopped (or for `duration` seconds); returns the final per-backend summary."""
+        if self.otlp_endpoint:
+            self.start_export()
+        started = time.monotonic()
+        # Spread the first probes over one interval instead of firing them together.
+        due = {name: started + self.random.uniform(0, self.interval) for name in self.windows}
+        in_flight: Dict[str, Any] = {}
+        next_report = started + report_every
+        executor = ThreadPoolExecutor(max_workers=len(self.windows), thread_name_prefix="backend-monitor")
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if duration is not None and now - started >= duration:
+                    break
+                for name, when in due.items():
+                    # A slow backend never delays the others, nor gets a second probe in flight.
+                    if when <= now and not (name in in_flight and not in_flight[name].done()):
+                        in_flight[name] = executor.submit(self.probe, name)
+                        due[name] = now + self.next_delay()
+                if now >= next_report:
+                    self.print_report()
+                    next_report = now + report_every
+                wake = min(due.values())
+                if duration is not None:
+                    wake = min(wake, started + duration)
+                self._stop.wait(max(0.0, min(wake, next_report) - time.monotonic()))
+        finally:
+            executor.shutdown(wait=True)
+            if self.meter_provider is not None:
+                self.meter_provider.force_flush()
+                self.meter_provider.shutdown()
+        return {name: window.summary() for name, window in self.windows.items()}
+
+    def print_report(self) -> None:
+        print(f"📈 Backend health ({time.strftime('%H:%M:%S')}):")
+        for name, window in self.windows.items():
+            summary = window.summary()
+            total = summary["latency_ms"]["total"]
+            availability = summary["availability"]
+            icon = "✅" if availability == 1.0 else "⚠️" if availability else "❌"
+            latency = f"p50 {total['p50']} ms, p95 {total['p95']} ms, p99 {total['p99']} ms" if total else "no latency samples"
+            ratio = f"{availability:.1%}" if availability is not None else "n/a"
+            print(f"   {icon} {name:<9} availability {ratio} over {summary['samples']} probes, {latency}")
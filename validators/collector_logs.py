@@ -0,0 +1,319 @@
+import json
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_BUCKET = 5.0
+# A class must show up for this long within the window (in separate buckets) to count as sustained.
+DEFAULT_SUSTAIN = 30.0
+SOURCES = ("docker", "journald", "file")
+
+# Checked in order; the first match wins. Patterns match the message and the error field.
+EVENT_CLASSES = [
+    ("tls_failure", re.compile(r"x509:|tls:|certificate|handshake failure", re.I)),
+    ("retry_exhausted", re.compile(r"no more retries left|max elapsed time expired|retries exhausted", re.I)),
+    ("queue_full", re.compile(r"sending_queue is full|queue is full", re.I)),
+    ("memory_limiter", re.compile(r"memory usage is above (soft|hard) limit|data refused due to high memory usage", re.I)),
+    ("dropped_data", re.compile(r"dropping data|dropped", re.I)),
+]
+ERROR_LEVELS = ("error", "dpanic", "panic", "fatal")
+
+_CONSOLE_TS = re.compile(r"^\d{4}-\d{2}-\d{2}T\S+$")
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one collector log line (zap JSON or console encoding) into ts, level, msg and fields."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            fields = {key: value for key, value in record.items() if key not in ("ts", "level", "msg", "caller")}
+            return {"ts": _timestamp(record.get("ts")), "level": str(record.get("level", "")).lower(),
+                    "msg": str(record.get("msg", "")), "fields": fields}
+    # Console encoding: ts \t level \t caller \t msg \t {json fields}
+    parts = line.split("\t")
+    if len(parts) >= 3 and _CONSOLE_TS.match(parts[0]):
+        fields: Dict[str, Any] = {}
+        if parts[-1].startswith("{"):
+            try:
+                fields = json.loads(parts[-1])
+            except ValueError:
+                pass
+            else:
+                parts = parts[:-1]
+        return {"ts": _timestamp(parts[0]), "level": parts[1].lower(), "msg": parts[-1], "fields": fields}
+    return {"ts": None, "level": "", "msg": line, "fields": {}}
+
+
+def classify(entry: Dict[str, Any]) -> Optional[str]:
+    """Event class of a parsed log entry, or None for routine lines."""
+    fields = entry["fields"]
+    # Routine startup lines mention certificates and queues too; only errors and drops count.
+    if entry["level"] in ("debug", "info") and "error" not in fields and not fields.get("dropped_items"):
+        return None
+    text = f"{entry['msg']} {fields.get('error', '')}"
+    for name, pattern in EVENT_CLASSES:
+        if pattern.search(text):
+            return name
+    if fields.get("dropped_items"):
+        return "dropped_data"
+    if entry["level"] in ERROR_LEVELS:
+        return "other_error"
+    return None
+
+
+class _ProcessSource:
+    """Lines from a subprocess (docker logs / journalctl), read on a background thread."""
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.finished = False
+        self.error: Optional[str] = None
+        self._last = ""
+        # The collector logs to stderr.
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                        errors="replace")
+        threading.Thread(target=self._pump, daemon=True).start()
+
+    def _pump(self):
+        for line in self.process.stdout:
+            self._last = line.strip() or self._last
+            self.lines.put(line)
+        if self.process.wait() != 0:
+            self.error = self._last or f"{self.command[0]} exited with {self.process.returncode}"
+        self.lines.put(None)
+
+    def read(self, timeout: float) -> List[str]:
+        lines = []
+        try:
+            line = self.lines.get(timeout=timeout)
+            while True:
+                if line is None:
+                    self.finished = True
+                    break
+                lines.append(line)
+                line = self.lines.get_nowait()
+        except queue.Empty:
+            pass
+        return lines
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+class _FileSource:
+    """Lines appended to a log file, following rotation and truncation like `tail -F`."""
+
+    def __init__(self, path: str, follow: bool, from_end: bool):
+        self.path = path
+        self.follow = follow
+        self.finished = False
+        self.error: Optional[str] = None
+        self._file = None
+        self._inode = None
+        self._partial = ""
+        self._open(from_end=from_end)
+
+    def _open(self, from_end: bool):
+        try:
+            self._file = open(self.path, "r", errors="replace")
+        except OSError:
+            self._file = None
+            return
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        if from_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def _rotated(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_ino != self._inode or stat.st_size < self._file.tell()
+
+    def read(self, timeout: float) -> List[str]:
+        if self._file is None:
+            self._open(from_end=False)
+            if self._file is None:
+                if not self.follow:
+                    self.error = f"cannot read {self.path}"
+                    self.finished = True
+                time.sleep(timeout)
+                return []
+        chunk = self._file.read()
+        if not chunk:
+            if not self.follow:
+                self.finished = True
+                return [self._partial] if self._partial else []
+            if self._rotated():
+                self._file.close()
+                self._open(from_end=False)
+            else:
+                time.sleep(timeout)
+            return []
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        return lines
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def open_source(source: str, target: str, follow: bool = True, since: Optional[float] = None):
+    """Incremental reader for a docker container, a journald unit or a log file.
+
+    `since` is the seconds of history to read first; by default a follower
+    starts at the end and a one-shot read covers two windows.
+    """
+    if since is None and not follow:
+        since = DEFAULT_WINDOW * 2
+    if source == "docker":
+        command = ["docker", "logs"] + (["--since", f"{int(since)}s"] if since else ["--tail", "0"])
+        return _ProcessSource(command + (["-f"] if follow else []) + [target])
+    if source == "journald":
+        command = ["journalctl", "-u", target, "-o", "cat", "--no-pager"]
+        command += ["--since", f"-{int(since)}s"] if since else ["-n", "0"]
+        return _ProcessSource(command + (["-f"] if follow else []))
+    if source == "file":
+        return _FileSource(target, follow, from_end=follow and not since)
+    raise ValueError(f"Unknown log source {source!r}; choose from {', '.join(SOURCES)}")
+
+
+class CollectorLogAnalyzer:
+    """Classify collector log events and report only anomalies that persist.
+
+    Events are counted per class in fixed-size time buckets (timestamps come
+    from the log lines when present). A class is a sustained anomaly when it
+    appears in enough distinct buckets of the sliding window to cover
+    `sustain` seconds, so a single burst after a restart or a one-off retry
+    is counted but not reported.
+    """
+
+    def __init__(self, window: float = DEFAULT_WINDOW, bucket: float = DEFAULT_BUCKET, sustain: float = DEFAULT_SUSTAIN):
+        self.window = window
+        self.bucket = bucket
+        self.buckets_in_window = max(1, int(round(window / bucket)))
+        self.required_buckets = max(1, min(self.buckets_in_window, int(round(sustain / bucket))))
+        self.events: Dict[str, Counter] = {}
+        self.items: Dict[str, Counter] = {}
+        self.totals: Counter = Counter()
+        self.samples: Dict[str, Dict[str, Any]] = {}
+        self.active: Dict[str, Dict[str, Any]] = {}
+        self.now = 0.0
+
+    def feed(self, line: str, now: Optional[float] = None) -> Optional[str]:
+        """Count one log line; returns its event class, if any."""
+        entry = parse_line(line)
+        if entry is None:
+            return None
+        ts = entry["ts"] or now or time.time()
+        self.now = max(self.now, ts)
+        event_class = classify(entry)
+        if event_class is None:
+            return None
+        index = int(ts // self.bucket)
+        self.events.setdefault(event_class, Counter())[index] += 1
+        dropped = entry["fields"].get("dropped_items")
+        if isinstance(dropped, (int, float)):
+            self.items.setdefault(event_class, Counter())[index] += int(dropped)
+        self.totals[event_class] += 1
+        self.samples[event_class] = {
+            "msg": entry["msg"],
+            "component": entry["fields"].get("name") or entry["fields"].get("exporter"),
+            "error": entry["fields"].get("error"),
+        }
+        return event_class
+
+    def rates(self, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Per-class events/min, dropped items and active buckets over the trailing window."""
+        now = now or self.now or time.time()
+        current = int(now // self.bucket)
+        oldest = current - self.buckets_in_window + 1
+        rates = {}
+        for event_class, counts in self.events.items():
+            for index in [index for index in counts if index < oldest]:
+                del counts[index]
+                self.items.get(event_class, Counter()).pop(index, None)
+            in_window = sum(counts.values())
+            rates[event_class] = {
+                "per_minute": round(in_window * 60 / self.window, 2),
+                "dropped_items": sum(self.items.get(event_class, Counter()).values()),
+                "active_buckets": len(counts),
+                "sustained": len(counts) >= self.required_buckets,
+            }
+        return rates
+
+    def tick(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Sustained anomalies that started or cleared since the last tick."""
+        changes = []
+        for event_class, rate in self.rates(now).items():
+            if rate["sustained"] and event_class not in self.active:
+                self.active[event_class] = {"class": event_class, "state": "sustained", **rate, **self.samples[event_class]}
+                changes.append(self.active[event_class])
+            elif not rate["sustained"] and event_class in self.active:
+                del self.active[event_class]
+                changes.append({"class": event_class, "state": "cleared", **rate})
+        return changes
+
+    def follow(self, source, duration: Optional[float] = None,
+               on_change: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Read `source` incrementally until it ends or `duration` seconds pass, ticking every bucket."""
+        started = time.monotonic()
+        last_tick = started
+        while not source.finished:
+            if duration is not None and time.monotonic() - started >= duration:
+                break
+            for line in source.read(timeout=min(1.0, self.bucket)):
+                self.feed(line)
+            if time.monotonic() - last_tick >= self.bucket or source.finished:
+                last_tick = time.monotonic()
+                # Live sources tick on the wall clock so quiet periods age events out.
+                for change in self.tick(None if source.finished else max(self.now, time.time())):
+                    if on_change:
+                        on_change(change)
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        return {"totals": dict(self.totals), "rates": self.rates(), "anomalies": list(self.active.values())}
+
+
+def print_change(change: Dict[str, Any]):
+    if change["state"] == "cleared":
+        print(f"✅ {change['class']} cleared ({change['per_minute']}/min over the window)")
+        return
+    detail = f" [{change['component']}]" if change.get("component") else ""
+    dropped = f", {change['dropped_items']} items dropped" if change["dropped_items"] else ""
+    print(f"❌ Sustained {change['class']}{detail}: {change['per_minute']}/min in "
+          f"{change['active_buckets']} buckets{dropped} - {change['msg']}")
+    if change.get("error"):
+        print(f"   {change['error']}")
@@ -0,0 +1,214 @@
+import html
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+OTLP_PORTS = [4317, 4318]
+HEALTH_CHECK_PORT = 13133
+ZPAGES_PORT = 55679
+DEFAULT_TIMEOUT = 30.0
+INITIAL_BACKOFF = 0.05
+MAX_BACKOFF = 1.0
+# Once the OTLP ports are up, a collector running an older config without the
+# extensions would otherwise hold every probe for the whole timeout.
+EXTENSION_GRACE = 2.0
+
+_ROW = re.compile(r"<tr[^>]*>(.*?)</tr>", re.S | re.I)
+_CELL = re.compile(r"<t[hd][^>]*>(.*?)</t[hd]>", re.S | re.I)
+_LINK = re.compile(r"<a[^>]*>(.*?)</a>", re.S | re.I)
+_TAG = re.compile(r"<[^>]+>")
+_SIGNAL_SUFFIX = re.compile(r"/(traces|metrics|logs)$")
+
+
+def _text(fragment: str) -> str:
+    return " ".join(html.unescape(_TAG.sub(" ", fragment)).split())
+
+
+def _table_rows(page: str) -> List[List[List[str]]]:
+    """Rows of every HTML table on a zpages page; each cell is the list of its link texts, or its text."""
+    rows = []
+    for row in _ROW.findall(page):
+        cells = []
+        for cell in _CELL.findall(row):
+            items = [_text(link) for link in _LINK.findall(cell)] or [_text(cell)]
+            cells.append([item for item in items if item])
+        rows.append(cells)
+    return rows
+
+
+def parse_pipelinez(page: str) -> Dict[str, Dict[str, List[str]]]:
+    """Pipelines with their receivers, processors and exporters from /debug/pipelinez."""
+    pipelines: Dict[str, Dict[str, List[str]]] = {}
+    columns: Dict[str, int] = {}
+    for cells in _table_rows(page):
+        headers = [cell[0].lower().replace(" ", "") if cell else "" for cell in cells]
+        if "receivers" in headers and "exporters" in headers:
+            columns = {header: index for index, header in enumerate(headers) if header}
+            continue
+        if not columns or not cells or not cells[0]:
+            continue
+        name_column = next((index for header, index in columns.items() if "name" in header), 0)
+        pipelines[cells[name_column][0]] = {
+            kind: cells[columns[kind]] if columns.get(kind, len(cells)) < len(cells) else []
+            for kind in ("receivers", "processors", "exporters")
+        }
+    return pipelines
+
+
+def parse_tracez(page: str) -> Dict[str, Dict[str, int]]:
+    """Exporter span and error counts from the /debug/tracez summary, keyed by exporter id."""
+    exporters: Dict[str, Dict[str, int]] = {}
+    for cells in _table_rows(page):
+        if not cells or not cells[0] or not cells[0][0].startswith("exporter/"):
+            continue
+        exporter_id = _SIGNAL_SUFFIX.sub("", cells[0][0][len("exporter/"):])
+        counts = [int(cell[0]) for cell in cells[1:] if cell and cell[0].isdigit()]
+        entry = exporters.setdefault(exporter_id, {"spans": 0, "errors": 0})
+        # The summary's last column is the error count; the others are running spans and latency buckets.
+        if counts:
+            entry["spans"] += sum(counts[:-1])
+            entry["errors"] += counts[-1]
+    return exporters
+
+
+class CollectorReadinessProbe:
+    """Poll a starting collector until it is ready, then read its pipeline state from zpages.
+
+    The OTLP ports, the health_check extension and zpages are polled at the
+    same time, each with exponential backoff, and the probe returns as soon as
+    the collector reports ready instead of after fixed sleeps.
+    """
+
+    def __init__(self, host: str = "localhost", ports: Optional[List[int]] = None,
+                 health_port: int = HEALTH_CHECK_PORT, zpages_port: int = ZPAGES_PORT,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.host = host
+        self.ports = list(ports or OTLP_PORTS)
+        self.health_url = f"http://{host}:{health_port}/"
+        self.zpages_url = f"http://{host}:{zpages_port}/debug"
+        self.timeout = timeout
+        self._ports_up = threading.Event()
+        self._ports_up_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._open_ports = 0
+
+    def _poll(self, check: Callable[[float], Tuple[bool, str]], deadline: float,
+              extension: bool = False, stop: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Retry `check` with exponential backoff until it succeeds, the deadline passes or `stop` is set.
+
+        Extension probes also stop EXTENSION_GRACE seconds after the ports came
+        up if the extension still refuses connections (it is not configured).
+        """
+        started = time.perf_counter()
+        attempts, delay = 0, INITIAL_BACKOFF
+        ok, detail = False, "not checked"
+        while True:
+            attempts += 1
+            remaining = deadline - time.perf_counter()
+            ok, detail = check(max(0.05, min(MAX_BACKOFF, remaining)))
+            if ok:
+                break
+            now = time.perf_counter()
+            if extension and detail == "unreachable" and self._ports_up.is_set() \
+                    and now - self._ports_up_at >= EXTENSION_GRACE:
+                break
+            if now >= deadline or (stop is not None and stop.is_set()):
+                break
+            if stop is not None:
+                stop.wait(min(delay, deadline - now))
+            else:
+                time.sleep(min(delay, deadline - now))
+            delay = min(MAX_BACKOFF, delay * 2)
+        return {"ok": ok, "detail": detail, "attempts": attempts,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    def _port_check(self, port: int) -> Callable[[float], Tuple[bool, str]]:
+        def check(timeout: float) -> Tuple[bool, str]:
+            try:
+                socket.create_connection((self.host, port), timeout=timeout).close()
+            except OSError:
+                return False, "not listening"
+            with self._lock:
+                self._open_ports += 1
+                if self._open_ports == len(self.ports):
+                    self._ports_up_at = time.perf_counter()
+                    self._ports_up.set()
+            return True, "listening"
+        return check
+
+    def _http_check(self, url: str, session: requests.Session) -> Callable[[float], Tuple[bool, str]]:
+        def check(timeout: float) -> Tuple[bool, str]:
+            try:
+                response = session.get(url, timeout=timeout)
+            except requests.RequestException:
+                return False, "unreachable"
+            if response.status_code == 200:
+                return True, "ready"
+            # health_check answers 503 until every component has started.
+            return False, f"HTTP {response.status_code}"
+        return check
+
+    def _fetch(self, session: requests.Session, path: str) -> Optional[str]:
+        try:
+            response = session.get(f"{self.zpages_url}/{path}", timeout=2)
+            response.raise_for_status()
+            return response.text
+        except requests.RequestException:
+            return None
+
+    def pipeline_states(self, session: Optional[requests.Session] = None) -> Dict[str, Any]:
+        """Pipelines from /debug/pipelinez and per-exporter state from /debug/tracez."""
+        session = session or requests.Session()
+        pipelinez = self._fetch(session, "pipelinez")
+        tracez = self._fetch(session, "tracez")
+        pipelines = parse_pipelinez(pipelinez) if pipelinez else {}
+        spans = parse_tracez(tracez) if tracez else {}
+        exporters: Dict[str, Dict[str, Any]] = {}
+        for name in sorted({exporter for pipeline in pipelines.values() for exporter in pipeline["exporters"]} | set(spans)):
+            counts = spans.get(name, {"spans": 0, "errors": 0})
+            state = "failing" if counts["errors"] else "ok" if counts["spans"] else "idle"
+            exporters[name] = {"state": state, **counts}
+        return {"pipelines": pipelines, "exporters": exporters}
+
+    def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        self._open_ports = 0
+        self._ports_up.clear()
+        health_session, zpages_session = requests.Session(), requests.Session()
+        probes = {f"otlp:{port}": (self._port_check(port), False) for port in self.ports}
+        probes["health_check"] = (self._http_check(self.health_url, health_session), True)
+        zpages_check = self._http_check(f"{self.zpages_url}/servicez", zpages_session)
+        probes["zpages"] = (zpages_check, True)
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(probes)) as pool:
+            futures = {name: pool.submit(self._poll, check, deadline, extension, stop if name == "zpages" else None)
+                       for name, (check, extension) in probes.items()}
+            checks = {name: future.result() for name, future in futures.items() if name != "zpages"}
+            # Readiness depends only on the ports and health_check; stop waiting on zpages.
+            stop.set()
+            checks["zpages"] = futures["zpages"].result()
+
+        health = checks["health_check"]
+        ports_ok = all(checks[f"otlp:{port}"]["ok"] for port in self.ports)
+        # Without the extension, listening receivers are the best available signal.
+        ready = ports_ok and (health["ok"] or health["detail"] == "unreachable")
+        if ready and not checks["zpages"]["ok"]:
+            # zpages may not have answered yet when the poll was stopped; ask once more.
+            ok, detail = zpages_check(2.0)
+            checks["zpages"].update(ok=ok, detail=detail, attempts=checks["zpages"]["attempts"] + 1)
+        result: Dict[str, Any] = {
+            "ready": ready,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "checks": checks,
+            "pipelines": {},
+            "exporters": {},
+        }
+        if checks["zpages"]["ok"]:
+            result.update(self.pipeline_states(zpages_session))
+        return result
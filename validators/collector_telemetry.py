@@ -0,0 +1,297 @@
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from generator.exporter_settings import DEFAULT_EXPORTER_SETTINGS, load_exporter_settings
+from installer.collector_reloader import COLLECTOR_METRICS_URL, scrape_samples
+from validators.config_diff import load_config
+
+DEFAULT_CONFIG = "output/generated-configs/otel-collector-config.yaml"
+DEFAULT_WINDOW = 60.0
+DEFAULT_INTERVAL = 5.0
+SIGNAL_SUFFIXES = ("spans", "metric_points", "log_records")
+# Average sending-queue fill above which an exporter counts as saturated.
+QUEUE_SATURATION = 0.8
+# Share of batches sent because send_batch_size was reached; above this, batches are the limiting factor.
+SIZE_TRIGGER_RATIO = 0.9
+MIN_BATCHES_PER_SECOND = 1.0
+MAX_SEND_BATCH_SIZE = 8192
+MAX_NUM_CONSUMERS = 64
+
+
+def _delta(first: float, last: float) -> float:
+    # A collector restart resets counters; everything counted since then is new.
+    return last - first if last >= first else last
+
+
+def _settings_key(exporter: str) -> Optional[str]:
+    """Map a collector exporter id (e.g. otlphttp/elastic) to its exporter-settings entry."""
+    name = exporter.split("/")[-1]
+    return name if name in DEFAULT_EXPORTER_SETTINGS else None
+
+
+class CollectorTelemetryAnalyzer:
+    """Find where a running collector is losing or holding back data, from its own metrics.
+
+    The collector's internal metrics endpoint is scraped every `interval`
+    seconds for `window` seconds. Exporter queues, failed sends and enqueues,
+    batch sizes and triggers, and memory_limiter refusals are compared across
+    the window to name the bottleneck and the config change that relieves it.
+    """
+
+    def __init__(self, metrics_url: str = COLLECTOR_METRICS_URL, window: float = DEFAULT_WINDOW,
+                 interval: float = DEFAULT_INTERVAL, config_path: str = DEFAULT_CONFIG):
+        self.metrics_url = metrics_url
+        self.window = window
+        self.interval = interval
+        self.config_path = config_path
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """One scrape, aggregated per exporter and processor; None if the endpoint is unreachable."""
+        samples = scrape_samples(self.metrics_url)
+        if samples is None:
+            return None
+        snapshot: Dict[str, Any] = {
+            "at": time.monotonic(), "exporters": {}, "processors": {},
+            "batch": {"size_sum": 0.0, "size_count": 0.0, "size_triggers": 0.0, "timeout_triggers": 0.0},
+            "receiver_refused": 0.0, "rss_bytes": None,
+        }
+        for name, labels, value in samples:
+            if name.startswith("otelcol_exporter_") and "exporter" in labels:
+                exporter = snapshot["exporters"].setdefault(labels["exporter"], {
+                    "queue_size": 0.0, "queue_capacity": None, "sent": 0.0, "send_failed": 0.0, "enqueue_failed": 0.0,
+                })
+                metric = name[len("otelcol_exporter_"):]
+                if metric in ("queue_size", "queue_capacity"):
+                    exporter[metric] = (exporter[metric] or 0.0) + value
+                else:
+                    for field in ("sent", "send_failed", "enqueue_failed"):
+                        if metric in (f"{field}_{suffix}" for suffix in SIGNAL_SUFFIXES):
+                            exporter[field] += value
+            elif name.startswith("otelcol_processor_refused_") and "processor" in labels:
+                snapshot["processors"][labels["processor"]] = snapshot["processors"].get(labels["processor"], 0.0) + value
+            elif name == "otelcol_processor_batch_batch_send_size_sum":
+                snapshot["batch"]["size_sum"] += value
+            elif name == "otelcol_processor_batch_batch_send_size_count":
+                snapshot["batch"]["size_count"] += value
+            elif name == "otelcol_processor_batch_batch_size_trigger_send":
+                snapshot["batch"]["size_triggers"] += value
+            elif name == "otelcol_processor_batch_timeout_trigger_send":
+                snapshot["batch"]["timeout_triggers"] += value
+            elif name.startswith("otelcol_receiver_refused_"):
+                snapshot["receiver_refused"] += value
+            elif name == "otelcol_process_memory_rss":
+                snapshot["rss_bytes"] = value
+        return snapshot
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """Scrape every `interval` seconds until `window` seconds have passed (at least two scrapes)."""
+        snapshots: List[Dict[str, Any]] = []
+        started = time.monotonic()
+        while True:
+            snapshot = self.snapshot()
+            if snapshot is not None:
+                snapshots.append(snapshot)
+            elif not snapshots:
+                return []
+            elapsed = time.monotonic() - started
+            if elapsed >= self.window and len(snapshots) >= 2:
+                return snapshots
+            remaining = self.window - elapsed
+            time.sleep(min(self.interval, remaining) if remaining > 0 else self.interval)
+
+    def summarize(self, snapshots: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rates, deltas and queue fill over the window."""
+        first, last = snapshots[0], snapshots[-1]
+        seconds = max(last["at"] - first["at"], 1e-9)
+        exporters = {}
+        for name, current in last["exporters"].items():
+            previous = first["exporters"].get(name, {})
+            fills = [
+                snapshot["exporters"][name]["queue_size"] / snapshot["exporters"][name]["queue_capacity"]
+                for snapshot in snapshots
+                if snapshot["exporters"].get(name, {}).get("queue_capacity")
+            ]
+            exporters[name] = {
+                "queue_capacity": current["queue_capacity"],
+                "queue_fill_avg": round(sum(fills) / len(fills), 3) if fills else None,
+                "queue_fill_max": round(max(fills), 3) if fills else None,
+                "sent_per_second": round(_delta(previous.get("sent", 0.0), current["sent"]) / seconds, 1),
+                "send_failed": _delta(previous.get("send_failed", 0.0), current["send_failed"]),
+                "enqueue_failed": _delta(previous.get("enqueue_failed", 0.0), current["enqueue_failed"]),
+            }
+        batch_first, batch_last = first["batch"], last["batch"]
+        batches = _delta(batch_first["size_count"], batch_last["size_count"])
+        size_triggers = _delta(batch_first["size_triggers"], batch_last["size_triggers"])
+        timeout_triggers = _delta(batch_first["timeout_triggers"], batch_last["timeout_triggers"])
+        triggers = size_triggers + timeout_triggers
+        rss = [snapshot["rss_bytes"] for snapshot in snapshots if snapshot["rss_bytes"] is not None]
+        return {
+            "window_seconds": round(seconds, 1),
+            "scrapes": len(snapshots),
+            "exporters": exporters,
+            "batch": {
+                "batches_per_second": round(batches / seconds, 2),
+                "avg_send_size": round(_delta(batch_first["size_sum"], batch_last["size_sum"]) / batches, 1) if batches else None,
+                "size_trigger_ratio": round(size_triggers / triggers, 3) if triggers else None,
+            },
+            "refused": {
+                name: _delta(first["processors"].get(name, 0.0), value) for name, value in last["processors"].items()
+            },
+            "receiver_refused": _delta(first["receiver_refused"], last["receiver_refused"]),
+            "rss_mib_max": round(max(rss) / (1024 * 1024), 1) if rss else None,
+        }
+
+    def configured(self) -> Dict[str, Any]:
+        """Current batch, memory_limiter and sending_queue settings, from the config or the saved exporter settings."""
+        config = load_config(self.config_path) or {}
+        processors = config.get("processors") or {}
+        exporter_settings = load_exporter_settings()
+        exporters = {}
+        for name, settings in (config.get("exporters") or {}).items():
+            queue = (settings or {}).get("sending_queue") or {}
+            defaults = exporter_settings.get(_settings_key(name) or "", {})
+            exporters[name] = {
+                "num_consumers": queue.get("num_consumers", defaults.get("num_consumers")),
+                "queue_size": queue.get("queue_size", defaults.get("queue_size")),
+            }
+        return {
+            "send_batch_size": (processors.get("batch") or {}).get("send_batch_size"),
+            "limit_mib": (processors.get("memory_limiter") or {}).get("limit_mib"),
+            "spike_limit_mib": (processors.get("memory_limiter") or {}).get("spike_limit_mib"),
+            "exporters": exporters,
+        }
+
+    def _exporter_findings(self, summary: Dict[str, Any], configured: Dict[str, Any],
+                           findings: List[Dict[str, str]], changes: List[Dict[str, Any]],
+                           updates: Dict[str, Dict[str, Any]]):
+        exporter_settings = load_exporter_settings()
+        for name, stats in summary["exporters"].items():
+            current = configured["exporters"].get(name) or exporter_settings.get(_settings_key(name) or "", {})
+            saturated = (stats["queue_fill_avg"] or 0) >= QUEUE_SATURATION or stats["enqueue_failed"] > 0
+            if stats["send_failed"]:
+                findings.append({
+                    "component": f"exporter/{name}", "issue": "backend rejecting or unreachable",
+                    "detail": f"{stats['send_failed']:.0f} items failed to send in {summary['window_seconds']}s",
+                })
+                changes.append({"component": f"exporter/{name}", "setting": None,
+                                "reason": "More consumers will not help while sends fail; run 'python main.py check-backends'"})
+                continue
+            if not saturated:
+                continue
+            fill = f"{stats['queue_fill_avg']:.0%}" if stats["queue_fill_avg"] is not None else "unknown"
+            findings.append({
+                "component": f"exporter/{name}", "issue": "sending queue saturated",
+                "detail": f"queue {fill} full on average, {stats['enqueue_failed']:.0f} items dropped at enqueue, "
+                          f"{stats['sent_per_second']:.0f} items/s sent",
+            })
+            key = _settings_key(name)
+            consumers = current.get("num_consumers") or DEFAULT_EXPORTER_SETTINGS["elastic"]["num_consumers"]
+            recommended = {"num_consumers": min(MAX_NUM_CONSUMERS, consumers * 2)}
+            if stats["enqueue_failed"]:
+                queue_size = current.get("queue_size") or stats["queue_capacity"] or 0
+                recommended["queue_size"] = int(queue_size * 2)
+            for setting, value in recommended.items():
+                changes.append({"component": f"exporter/{name}", "setting": f"sending_queue.{setting}",
+                                "current": current.get(setting), "recommended": value,
+                                "reason": "drain the queue faster" if setting == "num_consumers"
+                                else "absorb bursts instead of dropping them"})
+            if key:
+                updates.setdefault(key, {}).update(recommended)
+
+    def diagnose(self, summary: Dict[str, Any], configured: Dict[str, Any]) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Findings, recommended config changes and exporter-settings updates for the window."""
+        findings: List[Dict[str, str]] = []
+        changes: List[Dict[str, Any]] = []
+        updates: Dict[str, Dict[str, Any]] = {}
+        self._exporter_findings(summary, configured, findings, changes, updates)
+
+        batch = summary["batch"]
+        if (batch["size_trigger_ratio"] or 0) >= SIZE_TRIGGER_RATIO and batch["batches_per_second"] >= MIN_BATCHES_PER_SECOND:
+            # Without a config, size-triggered batches are as large as send_batch_size.
+            current = configured["send_batch_size"] or int(round(batch["avg_send_size"] or 0)) or MAX_SEND_BATCH_SIZE
+            recommended = min(MAX_SEND_BATCH_SIZE, current * 2)
+            findings.append({
+                "component": "processor/batch", "issue": "batches undersized",
+                "detail": f"{batch['size_trigger_ratio']:.0%} of {batch['batches_per_second']} batches/s sent because "
+                          f"send_batch_size ({current}) was reached; average batch {batch['avg_send_size']}",
+            })
+            if recommended > current:
+                changes.append({"component": "processor/batch", "setting": "send_batch_size", "current": current,
+                                "recommended": recommended, "reason": "fewer, larger exports per second"})
+                # The template uses the smallest send_batch_size across exporters, so raise them all.
+                for key in DEFAULT_EXPORTER_SETTINGS:
+                    updates.setdefault(key, {})["send_batch_size"] = recommended
+
+        refused = summary["refused"].get("memory_limiter", 0.0)
+        if refused:
+            limit = configured["limit_mib"]
+            findings.append({
+                "component": "processor/memory_limiter", "issue": "memory limiter throttling",
+                "detail": f"{refused:.0f} items refused in {summary['window_seconds']}s "
+                          f"(peak RSS {summary['rss_mib_max']} MiB, limit_mib {limit if limit is not None else 'unset'})",
+            })
+            if any(finding["issue"] == "sending queue saturated" for finding in findings):
+                changes.append({"component": "processor/memory_limiter", "setting": None,
+                                "reason": "Full exporter queues are holding the memory; fix the saturated exporter first"})
+            elif limit or summary["rss_mib_max"]:
+                recommended = int(math.ceil((limit or summary["rss_mib_max"]) * 1.25))
+                changes.append({"component": "processor/memory_limiter", "setting": "limit_mib", "current": limit,
+                                "recommended": recommended,
+                                "reason": "leave headroom above peak RSS, if the host has the memory"})
+                changes.append({"component": "processor/memory_limiter", "setting": "spike_limit_mib",
+                                "current": configured["spike_limit_mib"], "recommended": int(math.ceil(recommended * 0.2)),
+                                "reason": "refuse only on sustained growth, not short spikes"})
+        elif summary["receiver_refused"]:
+            findings.append({
+                "component": "receivers", "issue": "receivers refusing data",
+                "detail": f"{summary['receiver_refused']:.0f} items refused without memory_limiter refusals",
+            })
+        return findings, changes, updates
+
+    def run(self) -> Dict[str, Any]:
+        snapshots = self.collect()
+        if not snapshots:
+            return {"error": f"Could not read collector metrics from {self.metrics_url}"}
+        summary = self.summarize(snapshots)
+        configured = self.configured()
+        findings, changes, updates = self.diagnose(summary, configured)
+        return {"metrics_url": self.metrics_url, "summary": summary, "configured": configured,
+                "findings": findings, "changes": changes, "exporter_settings": updates}
+
+    def save_results(self, result: Dict[str, Any], output_file: str = "output/collector-telemetry-analysis.json") -> str:
+        path = Path(output_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+        return str(path)
+
+
+def print_analysis(result: Dict[str, Any]):
+    summary = result["summary"]
+    print(f"📊 {summary['scrapes']} scrapes over {summary['window_seconds']}s from {result['metrics_url']}")
+    for name, stats in summary["exporters"].items():
+        fill = f"{stats['queue_fill_avg']:.0%} avg / {stats['queue_fill_max']:.0%} max" if stats["queue_fill_avg"] is not None else "n/a"
+        print(f"   • exporter {name}: {stats['sent_per_second']:.0f} items/s, queue {fill}, "
+              f"send_failed {stats['send_failed']:.0f}, enqueue_failed {stats['enqueue_failed']:.0f}")
+    batch = summary["batch"]
+    print(f"   • batch: {batch['batches_per_second']} batches/s, avg {batch['avg_send_size']} items, "
+          f"size-triggered {batch['size_trigger_ratio']}")
+    print(f"   • memory_limiter refused {summary['refused'].get('memory_limiter', 0):.0f}, peak RSS {summary['rss_mib_max']} MiB")
+
+    if not result["findings"]:
+        print("✅ No bottleneck found")
+        return
+    print("\n🔎 Bottlenecks:")
+    for finding in result["findings"]:
+        print(f"   ❌ {finding['component']}: {finding['issue']} ({finding['detail']})")
+    if result["changes"]:
+        print("\n💡 Recommended changes:")
+    for change in result["changes"]:
+        if change["setting"]:
+            current = "unset" if change["current"] is None else change["current"]
+            print(f"   • {change['component']} {change['setting']}: {current} → {change['recommended']} ({change['reason']})")
+        else:
+            print(f"   • {change['component']}: {change['reason']}")
@@ -0,0 +1,61 @@
+import yaml
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Top-level component sections compared entry by entry.
+COMPONENT_SECTIONS = ["receivers", "processors", "exporters", "connectors", "extensions"]
+
+
+def load_config(path: str) -> Optional[Dict[str, Any]]:
+    """Load a collector config, or None if the file does not exist."""
+    config_path = Path(path)
+    if not config_path.exists():
+        return None
+    with open(config_path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def _diff_section(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, List[str]]:
+    return {
+        "added": sorted(name for name in new if name not in old),
+        "removed": sorted(name for name in old if name not in new),
+        "changed": sorted(name for name in new if name in old and old[name] != new[name]),
+    }
+
+
+def semantic_diff(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+    """Compare two collector configs by component and pipeline rather than by text.
+
+    Key order, comments and formatting do not count as changes; a component is
+    "changed" when its parsed settings differ. `old=None` (nothing running yet)
+    reports everything as added.
+    """
+    old = old or {}
+    diff = {}
+    for section in COMPONENT_SECTIONS:
+        diff[section] = _diff_section(old.get(section) or {}, new.get(section) or {})
+
+    old_service = old.get("service") or {}
+    new_service = new.get("service") or {}
+    diff["pipelines"] = _diff_section(old_service.get("pipelines") or {}, new_service.get("pipelines") or {})
+    # Remaining service settings (enabled extensions, telemetry) compared as a whole.
+    diff["service"] = _diff_section(
+        {k: v for k, v in old_service.items() if k != "pipelines"},
+        {k: v for k, v in new_service.items() if k != "pipelines"},
+    )
+    return diff
+
+
+def is_empty(diff: Dict[str, Dict[str, List[str]]]) -> bool:
+    return not any(names for section in diff.values() for names in section.values())
+
+
+def format_diff(diff: Dict[str, Dict[str, List[str]]]) -> List[str]:
+    """Human-readable lines, one per added/removed/changed entry."""
+    symbols = {"added": "+", "removed": "-", "changed": "~"}
+    lines = []
+    for section, changes in diff.items():
+        for kind, symbol in symbols.items():
+            for name in changes[kind]:
+                lines.append(f"{symbol} {section}.{name}")
+    return lines
@@ -0,0 +1,205 @@
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from generator.exporter_settings import EXPORTER_CAPABILITIES
+from simulators.codecs import CODECS, MISSING_CODEC_HINTS, available_codecs, compress, decompress
+from simulators.otlp_payloads import build_sample_payloads, load_payload_files
+from simulators.otlp_sink import OTLPSink, SIGNAL_PATHS
+
+try:
+    import grpc
+    from opentelemetry.proto.collector.logs.v1 import logs_service_pb2_grpc
+    from opentelemetry.proto.collector.metrics.v1 import metrics_service_pb2_grpc
+    from opentelemetry.proto.collector.trace.v1 import trace_service_pb2_grpc
+except ImportError:
+    grpc = None
+
+# HTTP/2 framing used by OTLP/gRPC: 9-byte frame header per DATA frame (16 KiB max
+# payload by default) plus one HEADERS frame whose HPACK block shrinks to roughly
+# this size once the static request headers are indexed on a warm connection.
+HTTP2_FRAME_HEADER_BYTES = 9
+HTTP2_MAX_FRAME_BYTES = 16384
+HTTP2_WARM_HEADERS_BYTES = 40
+GRPC_MESSAGE_PREFIX_BYTES = 5
+
+# Codecs the grpc Python client can apply itself; the others are measured over HTTP only.
+GRPC_CODECS = {"none": None, "gzip": "Gzip", "deflate": "Deflate"}
+
+GRPC_KEEPALIVE = {"time": "30s", "timeout": "10s", "permit_without_stream": True}
+
+
+class ExporterCodecBenchmark:
+    """Measure compression and transport cost of representative OTLP payloads.
+
+    Every available codec is timed on each payload (CPU seconds via process_time,
+    so other load on the host does not skew it), then the compressed payload is
+    posted to a local OTLP sink over HTTP/1.1 and, when grpcio is installed, over
+    gRPC so framing overhead and request latency can be compared.
+    """
+
+    def __init__(self, iterations: int = 20, cpu_weight: float = 0.5):
+        self.iterations = max(1, iterations)
+        self.cpu_weight = min(max(cpu_weight, 0.0), 1.0)
+
+    def load_payloads(self, payload_files: Optional[List[str]] = None, scale: int = 1) -> Dict[str, bytes]:
+        if payload_files:
+            payloads = load_payload_files(payload_files)
+            if payloads:
+                return payloads
+            print("⚠️  No usable payload files, falling back to simulator payloads")
+        return build_sample_payloads(scale)
+
+    def measure_codec(self, codec: str, payload: bytes) -> Dict[str, Any]:
+        compressed = compress(codec, payload)
+        start = time.process_time()
+        for _ in range(self.iterations):
+            compress(codec, payload)
+        compress_cpu = (time.process_time() - start) / self.iterations
+
+        start = time.process_time()
+        for _ in range(self.iterations):
+            decompress(codec, compressed)
+        decompress_cpu = (time.process_time() - start) / self.iterations
+
+        raw_mib = len(payload) / (1024 * 1024)
+        return {
+            "raw_bytes": len(payload),
+            "compressed_bytes": len(compressed),
+            "ratio": round(len(payload) / len(compressed), 3) if compressed else 0.0,
+            "compress_cpu_ms_per_mib": round(compress_cpu * 1000 / raw_mib, 3) if raw_mib else 0.0,
+            "decompress_cpu_ms_per_mib": round(decompress_cpu * 1000 / raw_mib, 3) if raw_mib else 0.0,
+        }
+
+    def measure_http(self, sink: OTLPSink, signal: str, codec: str, payload: bytes) -> Dict[str, Any]:
+        path = next(p for p, route in SIGNAL_PATHS.items() if route[0] == signal)
+        body = compress(codec, payload)
+        headers = {"Content-Type": "application/x-protobuf"}
+        if codec != "none":
+            headers["Content-Encoding"] = codec
+        latencies = []
+        with requests.Session() as session:
+            request = requests.Request("POST", f"{sink.http_endpoint}{path}", headers=headers, data=body)
+            prepared = session.prepare_request(request)
+            for _ in range(self.iterations):
+                start = time.perf_counter()
+                response = session.send(prepared, timeout=10)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+        request_line = f"POST {path} HTTP/1.1\r\n"
+        header_block = "".join(f"{k}: {v}\r\n" for k, v in prepared.headers.items()) + "\r\n"
+        return {
+            "framing_bytes": len(request_line) + len(header_block),
+            "wire_bytes": len(request_line) + len(header_block) + len(body),
+            "latency_ms_p50": round(statistics.median(latencies) * 1000, 3),
+        }
+
+    def measure_grpc(self, sink: OTLPSink, signal: str, codec: str, payload: bytes) -> Optional[Dict[str, Any]]:
+        if grpc is None or codec not in GRPC_CODECS or sink.grpc_port is None:
+            return None
+        stubs = {
+            "traces": (trace_service_pb2_grpc.TraceServiceStub, SIGNAL_PATHS["/v1/traces"][1]),
+            "metrics": (metrics_service_pb2_grpc.MetricsServiceStub, SIGNAL_PATHS["/v1/metrics"][1]),
+            "logs": (logs_service_pb2_grpc.LogsServiceStub, SIGNAL_PATHS["/v1/logs"][1]),
+        }
+        stub_type, request_type = stubs[signal]
+        request = request_type.FromString(payload)
+        compression = getattr(grpc.Compression, GRPC_CODECS[codec]) if GRPC_CODECS[codec] else grpc.Compression.NoCompression
+        options = [("grpc.keepalive_time_ms", 30000), ("grpc.keepalive_permit_without_calls", 1)]
+        latencies = []
+        with grpc.insecure_channel(sink.grpc_endpoint, options=options, compression=compression) as channel:
+            stub = stub_type(channel)
+            stub.Export(request, timeout=10)  # warm the connection and HPACK tables
+            for _ in range(self.iterations):
+                start = time.perf_counter()
+                stub.Export(request, timeout=10)
+                latencies.append(time.perf_counter() - start)
+        body_bytes = len(compress(codec, payload)) + GRPC_MESSAGE_PREFIX_BYTES
+        data_frames = max(1, math.ceil(body_bytes / HTTP2_MAX_FRAME_BYTES))
+        framing = (GRPC_MESSAGE_PREFIX_BYTES + data_frames * HTTP2_FRAME_HEADER_BYTES
+                   + HTTP2_FRAME_HEADER_BYTES + HTTP2_WARM_HEADERS_BYTES)
+        return {
+            "framing_bytes": framing,
+            "wire_bytes": body_bytes - GRPC_MESSAGE_PREFIX_BYTES + framing,
+            "latency_ms_p50": round(statistics.median(latencies) * 1000, 3),
+        }
+
+    def run(self, payload_files: Optional[List[str]] = None, scale: int = 1) -> Dict[str, Any]:
+        """Benchmark every available codec on every signal against a local sink."""
+        print("🏁 Benchmarking exporter codecs and transports...")
+        payloads = self.load_payloads(payload_files, scale)
+        codecs = [name for name in ["none", "gzip", "zstd", "snappy"] if name in CODECS]
+        for name, available in available_codecs().items():
+            if not available and name in MISSING_CODEC_HINTS:
+                print(f"⚠️  {name} not available ({MISSING_CODEC_HINTS[name]}); skipping")
+
+        results: Dict[str, Any] = {"iterations": self.iterations, "signals": {}}
+        with OTLPSink(grpc_port=0 if grpc is not None else None) as sink:
+            for signal, payload in payloads.items():
+                print(f"📦 {signal}: {len(payload)} bytes")
+                signal_results = {}
+                for codec in codecs:
+                    entry = self.measure_codec(codec, payload)
+                    entry["http"] = self.measure_http(sink, signal, codec, payload)
+                    entry["grpc"] = self.measure_grpc(sink, signal, codec, payload)
+                    signal_results[codec] = entry
+                    grpc_latency = entry["grpc"]["latency_ms_p50"] if entry["grpc"] else "n/a"
+                    print(f"   {codec:>6}: ratio {entry['ratio']:>6}x, "
+                          f"{entry['compress_cpu_ms_per_mib']:>8} ms CPU/MiB, "
+                          f"http p50 {entry['http']['latency_ms_p50']} ms, grpc p50 {grpc_latency} ms")
+                results["signals"][signal] = signal_results
+        results["selection"] = self.select_exporter_settings(results)
+        return results
+
+    def _codec_cost(self, entry: Dict[str, Any], baseline: Dict[str, Any]) -> float:
+        # Unitless cost relative to gzip so CPU and bytes can be traded off with one weight.
+        cpu_base = baseline["compress_cpu_ms_per_mib"] or 1e-9
+        bytes_base = baseline["compressed_bytes"] or 1
+        return (self.cpu_weight * entry["compress_cpu_ms_per_mib"] / cpu_base
+                + (1 - self.cpu_weight) * entry["compressed_bytes"] / bytes_base)
+
+    def select_exporter_settings(self, results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Pick the cheapest codec and transport each exporter's backend accepts."""
+        selection = {}
+        for exporter, caps in EXPORTER_CAPABILITIES.items():
+            signals = [s for s in caps["signals"] if s in results["signals"]]
+            if not signals:
+                continue
+            best_codec, best_cost = None, None
+            for codec in caps["codecs"]:
+                if not all(codec in results["signals"][s] for s in signals):
+                    continue
+                cost = sum(
+                    self._codec_cost(results["signals"][s][codec], results["signals"][s]["gzip"])
+                    for s in signals
+                )
+                if best_cost is None or cost < best_cost:
+                    best_codec, best_cost = codec, cost
+            if best_codec is None:
+                continue
+
+            transport = "otlphttp"
+            if "otlp" in caps["transports"]:
+                http_ms = sum(results["signals"][s][best_codec]["http"]["latency_ms_p50"] for s in signals)
+                grpc_entries = [results["signals"][s][best_codec]["grpc"] for s in signals]
+                if all(grpc_entries) and sum(e["latency_ms_p50"] for e in grpc_entries) < http_ms:
+                    transport = "otlp"
+
+            settings: Dict[str, Any] = {"transport": transport, "compression": best_codec}
+            if transport == "otlp":
+                settings["keepalive"] = dict(GRPC_KEEPALIVE)
+            selection[exporter] = settings
+        return selection
+
+    def save_results(self, results: Dict[str, Any], output_dir: str = "output/benchmarks") -> str:
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        results_file = output_path / "exporter-codec-benchmark.json"
+        with open(results_file, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        return str(results_file)
@@ -1,9 +1,123 @@
-import requests
+import http.client
+import json
+import math
+import socket
+import ssl
 import time
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+DEFAULT_PROBES = 5
+# Whole check_all_backends run, not per backend: the old sequential checks could take 4 x 5s.
+DEFAULT_DEADLINE = 5.0
+PERCENTILES = (50, 95, 99)
+PHASES = ("connect", "tls", "ttfb", "total")
+
+
+@dataclass(frozen=True)
+class BackendProbe:
+    label: str
+    path: str
+    ok_statuses: tuple = (200,)
+    # Optional check of a decoded JSON body; returns an issue string or None.
+    body_check: Optional[Callable[[Any], Optional[str]]] = None
+
+
+def _grafana_database(body: Any) -> Optional[str]:
+    database = body.get("database") if isinstance(body, dict) else None
+    return None if database == "ok" else f"database status: {database}"
+
+
+BACKEND_PROBES = {
+    "elastic": BackendProbe("Elastic APM", "/"),
+    "loki": BackendProbe("Loki", "/ready"),
+    "influxdb": BackendProbe("InfluxDB", "/ping", (204,)),  # InfluxDB returns 204 for ping
+    "grafana": BackendProbe("Grafana", "/api/health", body_check=_grafana_database),
+}
+
+
+def percentiles(values: List[float], points=PERCENTILES) -> Optional[Dict[str, float]]:
+    """Linear-interpolated percentiles, e.g. {"p50": ..., "p95": ..., "p99": ...}; None without samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        rank = (len(ordered) - 1) * point / 100
+        low, high = math.floor(rank), math.ceil(rank)
+        value = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+        result[f"p{point}"] = round(value, 3)
+    return result
+
+
+class _PooledConnection:
+    """One keep-alive HTTP(S) connection per backend, with connect and TLS handshake timed separately.
+
+    The socket is opened here rather than by http.client so the TCP connect
+    (including DNS) and the TLS handshake can be measured; http.client then
+    reuses it for every request until the server closes it.
+    """
+
+    def __init__(self, url: str, ssl_context: Optional[ssl.SSLContext] = None):
+        parsed = urlparse(url)
+        self.https = parsed.scheme == "https"
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if self.https else 80)
+        self.base_path = parsed.path.rstrip("/")
+        self.ssl_context = ssl_context or (ssl.create_default_context() if self.https else None)
+        self.conn: Optional[http.client.HTTPConnection] = None
+        self.opened = 0
+
+    def _open(self, timeout: float) -> Dict[str, float]:
+        started = time.perf_counter()
+        sock = socket.create_connection((self.host, self.port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        phases = {"connect": (time.perf_counter() - started) * 1000}
+        if self.https:
+            handshake = time.perf_counter()
+            sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host)
+            phases["tls"] = (time.perf_counter() - handshake) * 1000
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        self.conn.sock = sock
+        self.opened += 1
+        return phases
+
+    def request(self, path: str, timeout: float):
+        """GET `path`; returns (status, body bytes, phase timings in ms)."""
+        started = time.perf_counter()
+        phases: Dict[str, float] = {}
+        if self.conn is None:
+            phases = self._open(timeout)
+        else:
+            self.conn.sock.settimeout(timeout)
+        sent = time.perf_counter()
+        try:
+            self.conn.request("GET", self.base_path + path, headers={"Connection": "keep-alive"})
+            response = self.conn.getresponse()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            # The server closed an idle keep-alive connection; reconnect once.
+            if phases:
+                raise
+            self.close()
+            return self.request(path, timeout)
+        phases["ttfb"] = (time.perf_counter() - sent) * 1000
+        body = response.read()
+        phases["total"] = (time.perf_counter() - started) * 1000
+        if response.will_close:
+            self.close()
+        return response.status, body, phases
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
 
 class ExporterHealthChecker:
-    def __init__(self):
+    def __init__(self, probes: int = DEFAULT_PROBES, deadline: float = DEFAULT_DEADLINE,
+                 fresh_connections: bool = False):
         self.backend_endpoints = {
             "elastic": "http://localhost:8200",
             "loki": "http://localhost:3100",
@@ -11,123 +125,191 @@ class ExporterHealthChecker:
             "grafana": "http://localhost:3000"
         }
         self.timeout = 5
+        self.probes = probes
+        self.deadline = deadline
+        # Reusing one connection per backend measures steady-state request latency;
+        # fresh connections measure connect/TLS on every probe.
+        self.fresh_connections = fresh_connections
+
+    def check_backend(self, name: str, probes: Optional[int] = None,
+                      deadline_at: Optional[float] = None) -> Dict[str, Any]:
+        """Probe one backend `probes` times and summarise status and latency percentiles."""
+        spec = BACKEND_PROBES[name]
+        endpoint = self.backend_endpoints[name]
+        probes = probes or self.probes
+        deadline_at = deadline_at or time.monotonic() + self.deadline
+        connection = _PooledConnection(endpoint)
+        samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+        statuses: List[int] = []
+        errors: List[str] = []
+        issues: List[str] = []
+        attempted = refused = 0
+        try:
+            for _ in range(probes):
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    errors.append("deadline exceeded")
+                    break
+                attempted += 1
+                try:
+                    status, body, phases = connection.request(spec.path, min(self.timeout, remaining))
+                except ConnectionRefusedError:
+                    refused += 1
+                    errors.append("connection refused")
+                    continue
+                except (OSError, http.client.HTTPException) as e:
+                    errors.append(f"{type(e).__name__}: {e}" if str(e) else type(e).__name__)
+                    connection.close()
+                    continue
+                finally:
+                    if self.fresh_connections:
+                        connection.close()
+                statuses.append(status)
+                for phase, value in phases.items():
+                    samples[phase].append(value)
+                if status not in spec.ok_statuses:
+                    issues.append(f"status {status}")
+                elif spec.body_check:
+                    try:
+                        issue = spec.body_check(json.loads(body or b"null"))
+                    except ValueError:
+                        issue = "invalid JSON response"
+                    if issue:
+                        issues.append(issue)
+        finally:
+            connection.close()
+
+        successes = len(statuses) - len(issues)
+        if successes == attempted and attempted:
+            status = "healthy"
+        elif statuses:
+            status = "warning"
+        elif refused == attempted and attempted:
+            status = "unhealthy"
+        else:
+            status = "error"
+        result = {
+            "status": status,
+            "endpoint": endpoint,
+            "probes": attempted,
+            "successes": successes,
+            "availability": round(successes / attempted, 3) if attempted else 0.0,
+            "connections_opened": connection.opened,
+            "latency_ms": {phase: percentiles(values) for phase, values in samples.items()},
+        }
+        if statuses:
+            result["status_code"] = statuses[-1]
+        if issues:
+            result["issues"] = sorted(set(issues))
+        if errors:
+            result["error"] = errors[-1]
+        return result
+
+    def _report(self, name: str, result: Dict[str, Any]) -> None:
+        label = BACKEND_PROBES[name].label
+        if result["status"] == "healthy":
+            total = result["latency_ms"]["total"]
+            print(f"✅ {label} is healthy ({result['probes']} probes, p50 {total['p50']} ms, p99 {total['p99']} ms)")
+        elif result["status"] == "warning":
+            print(f"⚠️  {label}: {', '.join(result.get('issues', [])) or result.get('error')} "
+                  f"({result['successes']}/{result['probes']} ok)")
+        elif result["status"] == "unhealthy":
+            print(f"❌ {label} is not reachable")
+        else:
+            print(f"❌ Error checking {label}: {result.get('error')}")
 
     def check_elastic_apm(self) -> Dict[str, Any]:
         """Check Elastic APM endpoint health."""
         print("🔍 Checking Elastic APM...")
-        try:
-            # Check if APM server is running
-            response = requests.get(f"{self.backend_endpoints['elastic']}/", timeout=self.timeout)
-            if response.status_code == 200:
-                print("✅ Elastic APM server is responding")
-                return {"status": "healthy", "endpoint": self.backend_endpoints['elastic']}
-            else:
-                print(f"⚠️  Elastic APM returned status {response.status_code}")
-                return {"status": "warning", "endpoint": self.backend_endpoints['elastic'], "status_code": response.status_code}
-        except requests.exceptions.ConnectionError:
-            print("❌ Elastic APM server is not reachable")
-            return {"status": "unhealthy", "endpoint": self.backend_endpoints['elastic'], "error": "connection refused"}
-        except Exception as e:
-            print(f"❌ Error checking Elastic APM: {e}")
-            return {"status": "error", "endpoint": self.backend_endpoints['elastic'], "error": str(e)}
+        result = self.check_backend("elastic")
+        self._report("elastic", result)
+        return result
 
     def check_loki(self) -> Dict[str, Any]:
         """Check Loki endpoint health."""
         print("🔍 Checking Loki...")
-        try:
-            # Check Loki ready endpoint
-            response = requests.get(f"{self.backend_endpoints['loki']}/ready", timeout=self.timeout)
-            if response.status_code == 200:
-                print("✅ Loki is ready")
-                return {"status": "healthy", "endpoint": self.backend_endpoints['loki']}
-            else:
-                print(f"⚠️  Loki returned status {response.status_code}")
-                return {"status": "warning", "endpoint": self.backend_endpoints['loki'], "status_code": response.status_code}
-        except requests.exceptions.ConnectionError:
-            print("❌ Loki is not reachable")
-            return {"status": "unhealthy", "endpoint": self.backend_endpoints['loki'], "error": "connection refused"}
-        except Exception as e:
-            print(f"❌ Error checking Loki: {e}")
-            return {"status": "error", "endpoint": self.backend_endpoints['loki'], "error": str(e)}
+        result = self.check_backend("loki")
+        self._report("loki", result)
+        return result
 
     def check_influxdb(self) -> Dict[str, Any]:
         """Check InfluxDB endpoint health."""
         print("🔍 Checking InfluxDB...")
-        try:
-            # Check InfluxDB ping endpoint
-            response = requests.get(f"{self.backend_endpoints['influxdb']}/ping", timeout=self.timeout)
-            if response.status_code == 204:  # InfluxDB returns 204 for ping
-                print("✅ InfluxDB is responding")
-                return {"status": "healthy", "endpoint": self.backend_endpoints['influxdb']}
-            else:
-                print(f"⚠️  InfluxDB returned status {response.status_code}")
-                return {"status": "warning", "endpoint": self.backend_endpoints['influxdb'], "status_code": response.status_code}
-        except requests.exceptions.ConnectionError:
-            print("❌ InfluxDB is not reachable")
-            return {"status": "unhealthy", "endpoint": self.backend_endpoints['influxdb'], "error": "connection refused"}
-        except Exception as e:
-            print(f"❌ Error checking InfluxDB: {e}")
-            return {"status": "error", "endpoint": self.backend_endpoints['influxdb'], "error": str(e)}
+        result = self.check_backend("influxdb")
+        self._report("influxdb", result)
+        return result
 
     def check_grafana(self) -> Dict[str, Any]:
         """Check Grafana endpoint health."""
         print("🔍 Checking Grafana...")
-        try:
-            # Check Grafana health endpoint
-            response = requests.get(f"{self.backend_endpoints['grafana']}/api/health", timeout=self.timeout)
-            if response.status_code == 200:
-                health_data = response.json()
-                if health_data.get("database") == "ok":
-                    print("✅ Grafana is healthy")
-                    return {"status": "healthy", "endpoint": self.backend_endpoints['grafana']}
-                else:
-                    print(f"⚠️  Grafana database status: {health_data.get('database')}")
-                    return {"status": "warning", "endpoint": self.backend_endpoints['grafana'], "database": health_data.get('database')}
-            else:
-                print(f"⚠️  Grafana returned status {response.status_code}")
-                return {"status": "warning", "endpoint": self.backend_endpoints['grafana'], "status_code": response.status_code}
-        except requests.exceptions.ConnectionError:
-            print("❌ Grafana is not reachable")
-            return {"status": "unhealthy", "endpoint": self.backend_endpoints['grafana'], "error": "connection refused"}
-        except Exception as e:
-            print(f"❌ Error checking Grafana: {e}")
-            return {"status": "error", "endpoint": self.backend_endpoints['grafana'], "error": str(e)}
+        result = self.check_backend("grafana")
+        self._report("grafana", result)
+        return result
 
     def check_all_backends(self) -> Dict[str, Dict[str, Any]]:
-        """Check all backend services."""
-        print("🏥 Checking all backend services...")
-        
-        results = {
-            "elastic": self.check_elastic_apm(),
-            "loki": self.check_loki(),
-            "influxdb": self.check_influxdb(),
-            "grafana": self.check_grafana()
-        }
-        
+        """Check all backend services concurrently under one overall deadline."""
+        print(f"🏥 Checking all backend services ({self.probes} probes each, {self.deadline}s deadline)...")
+        started = time.monotonic()
+        deadline_at = started + self.deadline
+        names = list(self.backend_endpoints)
+        executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="backend-check")
+        futures = {name: executor.submit(self.check_backend, name, self.probes, deadline_at) for name in names}
+        # Probe timeouts are capped by the deadline; the grace covers connect/DNS stragglers.
+        wait(futures.values(), timeout=self.deadline + 1.0)
+        executor.shutdown(wait=False)
+
+        results = {}
+        for name in names:
+            future = futures[name]
+            if future.done() and future.exception() is None:
+                results[name] = future.result()
+            else:
+                error = str(future.exception()) if future.done() else "deadline exceeded"
+                results[name] = {"status": "error", "endpoint": self.backend_endpoints[name], "error": error,
+                                 "probes": 0, "successes": 0, "availability": 0.0,
+                                 "latency_ms": {phase: None for phase in PHASES}}
+            self._report(name, results[name])
+
         # Summary
         healthy_count = sum(1 for result in results.values() if result["status"] == "healthy")
         total_count = len(results)
-        
-        print(f"\n📊 Backend Health Summary:")
+
+        print(f"\n📊 Backend Health Summary ({(time.monotonic() - started) * 1000:.0f} ms):")
         print(f"   Healthy: {healthy_count}/{total_count}")
-        
+
         for backend, result in results.items():
             status_icon = "✅" if result["status"] == "healthy" else "⚠️" if result["status"] == "warning" else "❌"
             print(f"   {status_icon} {backend}: {result['status']}")
-        
+            for line in format_latency(result):
+                print(f"      {line}")
+
         return results
 
     def get_recommendations(self, results: Dict[str, Dict[str, Any]]) -> List[str]:
         """Get recommendations based on health check results."""
         recommendations = []
-        
+
         for backend, result in results.items():
             if result["status"] == "unhealthy":
                 recommendations.append(f"Start {backend} service: {result.get('endpoint', 'unknown endpoint')}")
             elif result["status"] == "warning":
-                recommendations.append(f"Check {backend} configuration: {result.get('error', 'unknown issue')}")
-        
+                issue = ", ".join(result.get("issues", [])) or result.get("error", "unknown issue")
+                recommendations.append(f"Check {backend} configuration: {issue}")
+            elif result["status"] == "error":
+                recommendations.append(f"Check {backend} at {result.get('endpoint')}: {result.get('error', 'unknown error')}")
+
         if not recommendations:
             recommendations.append("All backend services are healthy!")
-        
-        return recommendations 
\ No newline at end of file
+
+        return recommendations
+
+
+def format_latency(result: Dict[str, Any], phases=PHASES) -> List[str]:
+    """One line per measured phase: p50/p95/p99 in ms."""
+    lines = []
+    width = max(8, *(len(phase) for phase in phases))
+    for phase in phases:
+        stats = result.get("latency_ms", {}).get(phase)
+        if stats:
+            lines.append(f"{phase:<{width}} p50 {stats['p50']:8.2f}  p95 {stats['p95']:8.2f}  p99 {stats['p99']:8.2f} ms")
+    return lines
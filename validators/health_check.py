@@ -1,115 +1,90 @@
-import requests
-import socket
-import time
-import subprocess
 import json
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 
-def check_collector_health(host: str = "localhost", ports: list = [4317, 4318]) -> bool:
-    """Check if the OpenTelemetry Collector is running and listening."""
+def check_collector_health(host: str = "localhost", ports: list = [4317, 4318], timeout: float = 30.0) -> bool:
+    """Wait until the OpenTelemetry Collector is ready and report its pipeline state."""
+    from validators.collector_readiness import CollectorReadinessProbe
     print("🏥 Checking OpenTelemetry Collector health...")
     
-    # Check if ports are listening
-    for port in ports:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            
-            if result == 0:
-                print(f"✅ Collector listening on {host}:{port}")
-            else:
-                print(f"❌ Collector not listening on {host}:{port}")
-                return False
-        except Exception as e:
-            print(f"❌ Error checking port {port}: {e}")
-            return False
-    
-    # Check HTTP health endpoint (if available)
-    try:
-        response = requests.get(f"http://{host}:4318/", timeout=5)
-        if response.status_code == 200:
-            print("✅ Collector HTTP endpoint responding")
+    # Ports, health_check and zpages are polled concurrently; returns as soon as the collector is ready.
+    result = CollectorReadinessProbe(host=host, ports=ports, timeout=timeout).run()
+    for name, check in result["checks"].items():
+        if check["ok"]:
+            print(f"✅ {name}: {check['detail']} after {check['elapsed_ms']:.0f}ms ({check['attempts']} attempts)")
+        elif name.startswith("otlp:"):
+            print(f"❌ {name}: {check['detail']} after {check['elapsed_ms']:.0f}ms")
         else:
-            print(f"⚠️  Collector HTTP endpoint returned status {response.status_code}")
-    except Exception as e:
-        print(f"⚠️  Could not reach collector HTTP endpoint: {e}")
+            print(f"⚠️  {name}: {check['detail']} (is the {name} extension enabled?)")
     
-    return True
+    for name, pipeline in result["pipelines"].items():
+        print(f"🔀 {name}: {', '.join(pipeline['receivers'])} → {', '.join(pipeline['processors']) or '-'} → {', '.join(pipeline['exporters'])}")
+    for name, exporter in result["exporters"].items():
+        icon = {"ok": "✅", "failing": "❌", "idle": "💤"}[exporter["state"]]
+        print(f"{icon} exporter {name}: {exporter['state']} ({exporter['spans']} spans, {exporter['errors']} errors)")
+    
+    if result["ready"]:
+        print(f"✅ Collector ready in {result['elapsed_ms']:.0f}ms")
+    else:
+        print(f"❌ Collector not ready after {result['elapsed_ms']:.0f}ms")
+    return result["ready"]
 
-def send_test_telemetry(host: str = "localhost", port: int = 4318) -> bool:
-    """Send test telemetry to verify the collector is processing data."""
+def send_test_telemetry(host: str = "localhost", port: int = 4318, count: int = 10, timeout: float = 5.0) -> bool:
+    """Send test telemetry and confirm the collector accepted every export."""
+    from validators.round_trip import RoundTripVerifier
     print("📤 Sending test telemetry...")
     
     try:
-        # Set up test tracer
-        trace.set_tracer_provider(TracerProvider())
-        tracer = trace.get_tracer(__name__)
-        
-        # Configure OTLP exporter
-        otlp_exporter = OTLPSpanExporter(
-            endpoint=f"http://{host}:{port}/v1/traces"
-        )
-        
-        # Add span processor
-        span_processor = BatchSpanProcessor(otlp_exporter)
-        trace.get_tracer_provider().add_span_processor(span_processor)
-        
-        # Create and send test span
-        with tracer.start_as_current_span("health-check-span") as span:
-            span.set_attribute("health.check", True)
-            span.set_attribute("test.timestamp", time.time())
-            print("✅ Test span created and sent")
-        
-        # Give time for processing
-        time.sleep(2)
-        
-        return True
-        
+        # Flushes the spans, metrics and logs and returns once the collector has answered.
+        exports = RoundTripVerifier(count=count, timeout=timeout).send_burst(f"http://{host}:{port}")
     except Exception as e:
         print(f"❌ Error sending test telemetry: {e}")
         return False
+    
+    ok = True
+    for signal, result in exports.items():
+        if not result["flushed"]:
+            print(f"❌ Test {signal} were not flushed in time")
+            ok = False
+        elif result["failed_exports"]:
+            print(f"❌ {result['failed_exports']}/{result['exports']} test {signal} exports failed")
+            ok = False
+        else:
+            print(f"✅ Test {signal} accepted by the collector")
+    return ok
 
-def verify_collector_logs(container_name: str = "otel-collector") -> bool:
-    """Check collector logs for any errors or issues."""
+def verify_collector_logs(container_name: str = "otel-collector", source: str = "docker", since: float = 120.0) -> bool:
+    """Check recent collector logs for sustained dropped data, retry, queue, memory or TLS problems."""
+    from validators.collector_logs import CollectorLogAnalyzer, open_source, print_change
     print("📋 Checking collector logs...")
     
     try:
-        # Try to get Docker logs
-        result = subprocess.run(
-            ["docker", "logs", "--tail", "20", container_name],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0:
-            logs = result.stdout
-            if "error" in logs.lower() or "failed" in logs.lower():
-                print("⚠️  Collector logs contain errors:")
-                print(logs)
-                return False
-            else:
-                print("✅ Collector logs look healthy")
-                return True
-        else:
-            print("⚠️  Could not retrieve Docker logs")
-            return True  # Not critical if we can't get logs
-            
-    except Exception as e:
-        print(f"⚠️  Error checking logs: {e}")
+        reader = open_source(source, container_name, follow=False, since=since)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not read collector logs: {e}")
+        return True  # Not critical if we can't get logs
+    
+    analyzer = CollectorLogAnalyzer()
+    try:
+        summary = analyzer.follow(reader, duration=10, on_change=print_change)
+    finally:
+        reader.close()
+    if reader.error:
+        print(f"⚠️  Could not read collector logs: {reader.error}")
         return True  # Not critical
+    
+    if summary["totals"]:
+        counts = ", ".join(f"{name} {count}" for name, count in sorted(summary["totals"].items()))
+        print(f"📊 Log events: {counts}")
+    if summary["anomalies"]:
+        return False
+    print("✅ No sustained problems in collector logs")
+    return True
 
-def run_full_health_check(host: str = "localhost", container_name: str = "otel-collector") -> bool:
+def run_full_health_check(host: str = "localhost", container_name: str = "otel-collector", timeout: float = 30.0) -> bool:
     """Run complete health check suite."""
     print("🔍 Running complete health check...")
     
     # Check if collector is listening
-    if not check_collector_health(host):
+    if not check_collector_health(host, timeout=timeout):
         return False
     
     # Send test telemetry
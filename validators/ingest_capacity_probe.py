@@ -0,0 +1,282 @@
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from generator.exporter_settings import EXPORTER_CAPABILITIES, load_exporter_settings
+from simulators.codecs import CODECS, compress
+from simulators.otlp_payloads import build_logs_payload, build_metrics_payload, build_trace_payload
+from simulators.otlp_sink import SIGNAL_PATHS, OTLPSink, count_items
+from validators.exporter_health_check import percentiles
+
+DEFAULT_BATCH_SIZES = [256, 1024, 4096]
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_STEP_SECONDS = 1.0
+DEFAULT_LATENCY_BUDGET_MS = 1000.0
+# A step with more failed requests than this is past what the backend sustains.
+MAX_ERROR_RATIO = 0.01
+# More concurrency has to buy at least this much throughput, otherwise the previous step is the knee.
+MIN_THROUGHPUT_GAIN = 0.1
+# The queue should hold what arrives while retry_on_failure keeps retrying (max_elapsed_time: 300s)...
+DEFAULT_BUFFER_SECONDS = 300.0
+# ...but not more than this much uncompressed payload per exporter (memory_limiter allows 1500 MiB in total).
+DEFAULT_MEMORY_BUDGET_MIB = 256
+
+# Exporter -> (endpoint variable, auth scheme, credential variable), as in the collector template.
+ENDPOINT_ENV = {
+    "elastic": ("ELASTIC_APM_ENDPOINT", "Bearer", "ELASTIC_APM_SECRET_TOKEN"),
+    "grafana": ("GRAFANA_CLOUD_OTLP_ENDPOINT", "Bearer", "GRAFANA_CLOUD_API_KEY"),
+    "influxdb": ("INFLUXDB_URL", "Token", "INFLUXDB_TOKEN"),
+}
+
+SIGNAL_BUILDERS = {
+    # Builders take a per-service count; roughly this many items come out per unit
+    # (3 services; a span and its db child, a counter and a histogram, one record).
+    "traces": (build_trace_payload, 6),
+    "metrics": (build_metrics_payload, 6),
+    "logs": (build_logs_payload, 3),
+}
+SIGNAL_ROUTES = {signal: path for path, (signal, _, _) in SIGNAL_PATHS.items()}
+REQUEST_TYPES = {signal: request_type for signal, request_type, _ in SIGNAL_PATHS.values()}
+
+
+class StandInBackend:
+    """Local OTLP sink that behaves like a backend with limited ingest capacity.
+
+    At most `workers` exports are processed at once, each taking
+    base_ms + per_item_us per item; further requests wait for a slot, so
+    latency climbs once concurrency exceeds `workers` - the knee the probe
+    looks for.
+    """
+
+    def __init__(self, workers: int = 4, base_ms: float = 2.0, per_item_us: float = 5.0):
+        self.workers = workers
+        self.base_ms = base_ms
+        self.per_item_us = per_item_us
+        self.sink = OTLPSink()
+        self._slots = threading.BoundedSemaphore(workers)
+        self.sink.add_listener(self._process)
+
+    def _process(self, signal: str, request: Any, received_at: float) -> None:
+        with self._slots:
+            time.sleep((self.base_ms + count_items(signal, request) * self.per_item_us / 1000) / 1000)
+
+    @property
+    def endpoint(self) -> str:
+        return self.sink.http_endpoint
+
+    def __enter__(self) -> "StandInBackend":
+        self.sink.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.sink.stop()
+
+
+class IngestCapacityProbe:
+    """Ramp OTLP/HTTP export bursts against a backend to find its sustainable ingest rate.
+
+    For each batch size, concurrency doubles from 1 until throughput stops
+    improving by MIN_THROUGHPUT_GAIN, errors exceed MAX_ERROR_RATIO or p95
+    latency exceeds the budget. The knee is the lowest concurrency reaching
+    within MIN_THROUGHPUT_GAIN of the best healthy throughput; the batch size
+    with the highest rate at its knee determines the exporter settings.
+    """
+
+    def __init__(self, batch_sizes: Optional[List[int]] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 step_seconds: float = DEFAULT_STEP_SECONDS, latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS,
+                 buffer_seconds: float = DEFAULT_BUFFER_SECONDS, memory_budget_mib: float = DEFAULT_MEMORY_BUDGET_MIB):
+        self.batch_sizes = sorted(batch_sizes or DEFAULT_BATCH_SIZES)
+        self.max_concurrency = max_concurrency
+        self.step_seconds = step_seconds
+        self.latency_budget_ms = latency_budget_ms
+        self.buffer_seconds = buffer_seconds
+        self.memory_budget_mib = memory_budget_mib
+        self.timeout = 30  # the exporters' own timeout
+        self.exporter_settings = load_exporter_settings()
+        self._payloads: Dict[Tuple[str, int], Tuple[bytes, int]] = {}
+
+    def payload(self, signal: str, batch_size: int) -> Tuple[bytes, int]:
+        """Serialized export request of about `batch_size` items; returns (payload, exact item count)."""
+        key = (signal, batch_size)
+        if key not in self._payloads:
+            builder, per_unit = SIGNAL_BUILDERS[signal]
+            raw = builder(max(1, round(batch_size / per_unit)))
+            self._payloads[key] = raw, count_items(signal, REQUEST_TYPES[signal].FromString(raw))
+        return self._payloads[key]
+
+    def live_target(self, exporter: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Endpoint and auth headers for a real backend from the collector's environment, if set."""
+        endpoint_var, scheme, credential_var = ENDPOINT_ENV[exporter]
+        endpoint = os.environ.get(endpoint_var)
+        if not endpoint:
+            return None
+        headers = {}
+        if os.environ.get(credential_var):
+            headers["Authorization"] = f"{scheme} {os.environ[credential_var]}"
+        return endpoint.rstrip("/"), headers
+
+    def run_step(self, url: str, headers: Dict[str, str], body: bytes, items: int,
+                 concurrency: int) -> Dict[str, Any]:
+        """Send back-to-back exports from `concurrency` workers for step_seconds."""
+        latencies: List[float] = []
+        failures: Dict[str, int] = {}
+        lock = threading.Lock()
+        deadline = time.monotonic() + self.step_seconds
+
+        def worker() -> None:
+            session = requests.Session()
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        response = session.post(url, data=body, headers=headers, timeout=self.timeout)
+                        outcome = None if 200 <= response.status_code < 300 else f"status {response.status_code}"
+                    except requests.RequestException as e:
+                        outcome = type(e).__name__
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        if outcome:
+                            failures[outcome] = failures.get(outcome, 0) + 1
+                        else:
+                            latencies.append(elapsed)
+            finally:
+                session.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingest-probe") as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+        wall = time.perf_counter() - started
+        failed = sum(failures.values())
+        total = len(latencies) + failed
+        return {
+            "concurrency": concurrency,
+            "requests": total,
+            "failed": failed,
+            "failures": failures,
+            "error_ratio": round(failed / total, 4) if total else 1.0,
+            "items_per_second": round(len(latencies) * items / wall, 1),
+            "latency_ms": percentiles(latencies),
+        }
+
+    def _healthy(self, step: Dict[str, Any]) -> bool:
+        latency = step["latency_ms"]
+        return (step["error_ratio"] <= MAX_ERROR_RATIO and latency is not None
+                and latency["p95"] <= self.latency_budget_ms)
+
+    def ramp(self, url: str, headers: Dict[str, str], body: bytes, items: int) -> Dict[str, Any]:
+        """Double concurrency until the backend saturates; returns the steps and the knee."""
+        steps = []
+        best = 0.0
+        concurrency = 1
+        while concurrency <= self.max_concurrency:
+            step = self.run_step(url, headers, body, items, concurrency)
+            steps.append(step)
+            latency = step["latency_ms"]
+            print(f"      x{concurrency:<3} {step['items_per_second']:>10.0f} items/s, "
+                  f"p95 {latency['p95'] if latency else 'n/a'} ms, {step['failed']}/{step['requests']} failed")
+            if not self._healthy(step) or step["items_per_second"] < best * (1 + MIN_THROUGHPUT_GAIN):
+                break
+            best = step["items_per_second"]
+            concurrency *= 2
+
+        healthy = [s for s in steps if self._healthy(s)]
+        knee = None
+        if healthy:
+            top = max(s["items_per_second"] for s in healthy)
+            knee = min((s for s in healthy if s["items_per_second"] >= top * (1 - MIN_THROUGHPUT_GAIN)),
+                       key=lambda s: s["concurrency"])
+        return {"steps": steps, "knee": knee}
+
+    def probe_exporter(self, exporter: str, endpoint: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Probe one exporter's backend with its first supported signal at every batch size."""
+        signal = EXPORTER_CAPABILITIES[exporter]["signals"][0]
+        codec = self.exporter_settings.get(exporter, {}).get("compression", "none")
+        if codec not in CODECS:
+            codec = "none"
+        url = endpoint + SIGNAL_ROUTES[signal]
+        headers = {**headers, "Content-Type": "application/x-protobuf"}
+        if codec != "none":
+            headers["Content-Encoding"] = codec
+        print(f"🔬 {exporter}: {signal} to {url} ({codec})")
+
+        batches = {}
+        for batch_size in self.batch_sizes:
+            raw, items = self.payload(signal, batch_size)
+            print(f"   📦 batch {batch_size} ({items} items, {len(raw)} bytes)")
+            result = self.ramp(url, headers, compress(codec, raw), items)
+            result.update({"items": items, "raw_bytes": len(raw)})
+            batches[batch_size] = result
+            if result["knee"] is None:
+                # Larger batches will not do better if this one already fails at x1.
+                break
+
+        usable = {size: r for size, r in batches.items() if r["knee"]}
+        result = {"signal": signal, "endpoint": url, "compression": codec,
+                  "batches": {str(size): r for size, r in batches.items()}}
+        if not usable:
+            result["error"] = "no batch size was sustained within the latency budget"
+            return result
+        # Highest sustained rate wins; within MIN_THROUGHPUT_GAIN, the smaller batch (lower latency).
+        top = max(r["knee"]["items_per_second"] for r in usable.values())
+        batch_size = min(size for size, r in usable.items()
+                         if r["knee"]["items_per_second"] >= top * (1 - MIN_THROUGHPUT_GAIN))
+        chosen = usable[batch_size]
+        result.update({
+            "batch_size": batch_size,
+            "sustainable_items_per_second": chosen["knee"]["items_per_second"],
+            "knee_concurrency": chosen["knee"]["concurrency"],
+            "knee_latency_ms": chosen["knee"]["latency_ms"],
+            "settings": self.recommend(chosen["knee"], batch_size, chosen["items"], chosen["raw_bytes"]),
+        })
+        return result
+
+    def recommend(self, knee: Dict[str, Any], batch_size: int, items: int, raw_bytes: int) -> Dict[str, Any]:
+        """sending_queue and batch settings for a backend that sustains `knee`."""
+        num_consumers = knee["concurrency"]
+        batches_per_second = knee["items_per_second"] / items
+        # The queue counts batches: hold buffer_seconds of sustained ingest, within the memory budget.
+        by_time = math.ceil(batches_per_second * self.buffer_seconds)
+        by_memory = int(self.memory_budget_mib * 1024 * 1024 // max(raw_bytes, 1))
+        return {
+            "num_consumers": num_consumers,
+            "queue_size": max(num_consumers * 2, min(by_time, by_memory)),
+            "send_batch_size": batch_size,
+        }
+
+    def run(self, exporters: Optional[List[str]] = None, live: bool = False,
+            stand_in_workers: int = 4) -> Dict[str, Any]:
+        """Probe each exporter's backend (or a local stand-in) and collect recommended settings."""
+        exporters = exporters or list(EXPORTER_CAPABILITIES)
+        unknown = [name for name in exporters if name not in EXPORTER_CAPABILITIES]
+        if unknown:
+            raise ValueError(f"Unknown exporter {', '.join(unknown)}; choose from {', '.join(EXPORTER_CAPABILITIES)}")
+        results: Dict[str, Any] = {"step_seconds": self.step_seconds, "latency_budget_ms": self.latency_budget_ms,
+                                   "target": "live" if live else "stand-in", "exporters": {}}
+        for exporter in exporters:
+            if live:
+                target = self.live_target(exporter)
+                if target is None:
+                    print(f"⚠️  {exporter}: {ENDPOINT_ENV[exporter][0]} is not set; skipping")
+                    continue
+                results["exporters"][exporter] = self.probe_exporter(exporter, *target)
+            else:
+                with StandInBackend(workers=stand_in_workers) as backend:
+                    results["exporters"][exporter] = self.probe_exporter(exporter, backend.endpoint, {})
+        results["selection"] = {name: r["settings"] for name, r in results["exporters"].items() if "settings" in r}
+        return results
+
+    def save_results(self, results: Dict[str, Any], output_dir: str = "output/benchmarks") -> str:
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        results_file = output_path / "ingest-capacity.json"
+        with open(results_file, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        return str(results_file)
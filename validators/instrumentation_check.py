@@ -1,10 +1,19 @@
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Set
 from pathlib import Path
 
+# Distinct project roots are checked concurrently; the checks are file reads and directory walks.
+MAX_CHECK_WORKERS = 8
+LANGUAGE_LABELS = {"python": "Python", "nodejs": "Node.js", "java": "Java", "go": "Go", "dotnet": ".NET"}
+
+
 class InstrumentationChecker:
     def __init__(self):
+        self._cache: Dict[tuple, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
         self.language_instrumentation = {
             "python": {
                 "auto": "opentelemetry-instrumentation",
@@ -61,7 +70,6 @@ class InstrumentationChecker:
 
     def check_python_instrumentation(self, project_path: str) -> Dict[str, Any]:
         """Check Python project for OpenTelemetry instrumentation."""
-        print("🔍 Checking Python instrumentation...")
         
         requirements_files = ["requirements.txt", "requirements-dev.txt", "pyproject.toml", "setup.py"]
         found_instrumentation = set()
@@ -110,7 +118,6 @@ class InstrumentationChecker:
 
     def check_nodejs_instrumentation(self, project_path: str) -> Dict[str, Any]:
         """Check Node.js project for OpenTelemetry instrumentation."""
-        print("🔍 Checking Node.js instrumentation...")
         
         package_files = ["package.json", "package-lock.json", "yarn.lock"]
         found_instrumentation = set()
@@ -159,7 +166,6 @@ class InstrumentationChecker:
 
     def check_java_instrumentation(self, project_path: str) -> Dict[str, Any]:
         """Check Java project for OpenTelemetry instrumentation."""
-        print("🔍 Checking Java instrumentation...")
         
         build_files = ["pom.xml", "build.gradle", "build.gradle.kts"]
         found_instrumentation = set()
@@ -197,7 +203,6 @@ class InstrumentationChecker:
 
     def check_go_instrumentation(self, project_path: str) -> Dict[str, Any]:
         """Check Go project for OpenTelemetry instrumentation."""
-        print("🔍 Checking Go instrumentation...")
         
         go_files = list(Path(project_path).rglob("*.go"))
         found_instrumentation = set()
@@ -227,7 +232,6 @@ class InstrumentationChecker:
 
     def check_dotnet_instrumentation(self, project_path: str) -> Dict[str, Any]:
         """Check .NET project for OpenTelemetry instrumentation."""
-        print("🔍 Checking .NET instrumentation...")
         
         project_files = list(Path(project_path).rglob("*.csproj")) + list(Path(project_path).rglob("*.vbproj"))
         found_instrumentation = set()
@@ -258,11 +262,59 @@ class InstrumentationChecker:
             "recommendations": self._get_dotnet_recommendations(found_instrumentation)
         }
 
+    def service_path(self, service_info: Dict[str, Any]) -> str:
+        """Project directory of a discovered process, falling back to the current directory."""
+        service_path = ""
+        if "exe" in service_info:
+            service_path = os.path.dirname(service_info["exe"] or "")
+        elif "cmdline" in service_info and service_info["cmdline"]:
+            # Try to get working directory from command line
+            cmdline = service_info["cmdline"]
+            if len(cmdline) > 1:
+                potential_path = os.path.dirname(cmdline[1])
+                if os.path.exists(potential_path):
+                    service_path = potential_path
+        if not service_path or not os.path.exists(service_path):
+            service_path = "."
+        return service_path
+
+    def check_project(self, project_path: str, language: str) -> Dict[str, Any]:
+        """Check one project for one language; memoized by (resolved project root, language)."""
+        key = (os.path.realpath(project_path), language)
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+        checks = {
+            "python": self.check_python_instrumentation,
+            "nodejs": self.check_nodejs_instrumentation,
+            "java": self.check_java_instrumentation,
+            "go": self.check_go_instrumentation,
+            "dotnet": self.check_dotnet_instrumentation,
+        }
+        if language in checks:
+            result = checks[language](key[0])
+        else:
+            result = {
+                "status": "unknown_language",
+                "found": [],
+                "missing": ["instrumentation"],
+                "recommendations": [f"Unknown language: {language}"]
+            }
+        with self._cache_lock:
+            self._cache[key] = result
+        return result
+
     def check_all_services(self, discovered_services: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-        """Check instrumentation for all discovered services."""
+        """Check instrumentation for all discovered services.
+
+        Services are grouped by (resolved project root, language), so the
+        workers of one project share a single check, and distinct projects
+        are checked concurrently.
+        """
         print("🔧 Checking instrumentation for all services...")
         
         results = {}
+        projects: Dict[tuple, List[str]] = {}
         
         # Handle enhanced scanner format (dict with lists)
         for service_type, service_list in discovered_services.items():
@@ -280,45 +332,24 @@ class InstrumentationChecker:
                 elif language in ["databases", "message_queues", "web_servers", "docker", "kubernetes", "logs", "ports", "cloud", "service_mesh", "custom"]:
                     continue  # Skip non-language services
                 
-                # Try to get path from process info
-                service_path = ""
-                if "exe" in service_info:
-                    service_path = os.path.dirname(service_info["exe"])
-                elif "cmdline" in service_info and service_info["cmdline"]:
-                    # Try to get working directory from command line
-                    cmdline = service_info["cmdline"]
-                    if len(cmdline) > 1:
-                        potential_path = os.path.dirname(cmdline[1])
-                        if os.path.exists(potential_path):
-                            service_path = potential_path
-                
                 service_name = f"{service_type}_{i}"
                 if "name" in service_info:
                     service_name = service_info["name"]
                 
-                if not service_path or not os.path.exists(service_path):
-                    # Use current directory as fallback
-                    service_path = "."
-                
-                print(f"\n📦 Checking {service_name} ({language}) at {service_path}...")
-                
-                if language == "python":
-                    results[service_name] = self.check_python_instrumentation(service_path)
-                elif language == "nodejs":
-                    results[service_name] = self.check_nodejs_instrumentation(service_path)
-                elif language == "java":
-                    results[service_name] = self.check_java_instrumentation(service_path)
-                elif language == "go":
-                    results[service_name] = self.check_go_instrumentation(service_path)
-                elif language == "dotnet":
-                    results[service_name] = self.check_dotnet_instrumentation(service_path)
-                else:
-                    results[service_name] = {
-                        "status": "unknown_language",
-                        "found": [],
-                        "missing": ["instrumentation"],
-                        "recommendations": [f"Unknown language: {language}"]
-                    }
+                root = os.path.realpath(self.service_path(service_info))
+                projects.setdefault((root, language), []).append(service_name)
+                results[service_name] = None  # keeps discovery order
+        
+        # Checks run concurrently; progress is printed here, in project order, as each one finishes.
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_CHECK_WORKERS, len(projects)))) as pool:
+            checked = pool.map(lambda key: self.check_project(*key), projects)
+            for ((root, language), names), result in zip(projects.items(), checked):
+                shown = ", ".join(names[:3]) + (f" and {len(names) - 3} more" if len(names) > 3 else "")
+                print(f"\n📦 Checking {shown} ({language}) at {root}...")
+                if language in LANGUAGE_LABELS:
+                    print(f"🔍 Checking {LANGUAGE_LABELS[language]} instrumentation...")
+                for service_name in names:
+                    results[service_name] = dict(result)
         
         # Summary
         instrumented_count = sum(1 for result in results.values() if result["status"] == "instrumented")
@@ -0,0 +1,281 @@
+import logging
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import yaml
+
+from simulators.otlp_sink import OTLPSink
+from validators.exporter_health_check import percentiles
+
+SIGNALS = ("traces", "metrics", "logs")
+RUN_ID_ATTRIBUTE = "verification.run_id"
+SEQ_ATTRIBUTE = "verification.seq"
+DEFAULT_COUNT = 100
+DEFAULT_TIMEOUT = 10.0
+
+
+class _RecordingExporter:
+    """Wraps an OTLP exporter and counts failed exports (force_flush only reports timeouts)."""
+
+    def __init__(self, exporter: Any):
+        self.exporter = exporter
+        self.exports = 0
+        self.failures = 0
+
+    def export(self, batch: Any, *args: Any, **kwargs: Any) -> Any:
+        result = self.exporter.export(batch, *args, **kwargs)
+        self.exports += 1
+        if getattr(result, "name", "SUCCESS") != "SUCCESS":
+            self.failures += 1
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.exporter, name)
+
+
+def _attributes(key_values: Any) -> Dict[str, Any]:
+    values = {}
+    for kv in key_values:
+        kind = kv.value.WhichOneof("value")
+        values[kv.key] = getattr(kv.value, kind) if kind else None
+    return values
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def debug_pipeline_config(sink_endpoint: str, grpc_port: int, http_port: int) -> Dict[str, Any]:
+    """Collector config that forwards everything it receives on OTLP to the sink (and the debug exporter)."""
+    pipeline = {"receivers": ["otlp"], "processors": ["batch"], "exporters": ["otlphttp/verify", "debug"]}
+    return {
+        "receivers": {"otlp": {"protocols": {
+            "grpc": {"endpoint": f"127.0.0.1:{grpc_port}"},
+            "http": {"endpoint": f"127.0.0.1:{http_port}"},
+        }}},
+        "processors": {"batch": {"timeout": "100ms"}},
+        "exporters": {
+            "otlphttp/verify": {"endpoint": sink_endpoint, "compression": "none", "tls": {"insecure": True}},
+            "debug": {"verbosity": "basic"},
+        },
+        "service": {"pipelines": {signal: dict(pipeline) for signal in SIGNALS}},
+    }
+
+
+class RoundTripVerifier:
+    """Send a uniquely tagged burst of spans, metrics and logs and confirm every item arrives.
+
+    A local OTLPSink is the far end. With a collector binary, the burst goes
+    through `otelcol` running a debug pipeline that exports to the sink;
+    otherwise it is sent straight to the sink. Instead of sleeping, the SDK
+    providers are force-flushed and the sink's listener signals as soon as the
+    last item of the run has arrived.
+    """
+
+    def __init__(self, count: int = DEFAULT_COUNT, timeout: float = DEFAULT_TIMEOUT,
+                 collector_binary: Optional[str] = None):
+        self.count = count
+        self.timeout = timeout
+        self.collector_binary = collector_binary
+        self.run_id = uuid.uuid4().hex
+        self.sent_at: Dict[str, Dict[int, float]] = {signal: {} for signal in SIGNALS}
+        self.received_at: Dict[str, Dict[int, float]] = {signal: {} for signal in SIGNALS}
+        self.duplicates = {signal: 0 for signal in SIGNALS}
+        self._condition = threading.Condition()
+
+    def on_export(self, signal: str, request: Any, received_at: float) -> None:
+        """OTLPSink listener: record the arrival of this run's items by sequence number."""
+        seqs = []
+        if signal == "traces":
+            for resource_spans in request.resource_spans:
+                if _attributes(resource_spans.resource.attributes).get(RUN_ID_ATTRIBUTE) != self.run_id:
+                    continue
+                for scope_spans in resource_spans.scope_spans:
+                    seqs.extend(_attributes(span.attributes).get(SEQ_ATTRIBUTE) for span in scope_spans.spans)
+        elif signal == "metrics":
+            for resource_metrics in request.resource_metrics:
+                if _attributes(resource_metrics.resource.attributes).get(RUN_ID_ATTRIBUTE) != self.run_id:
+                    continue
+                for scope_metrics in resource_metrics.scope_metrics:
+                    for metric in scope_metrics.metrics:
+                        points = getattr(metric, metric.WhichOneof("data")).data_points
+                        seqs.extend(_attributes(point.attributes).get(SEQ_ATTRIBUTE) for point in points)
+        elif signal == "logs":
+            for resource_logs in request.resource_logs:
+                if _attributes(resource_logs.resource.attributes).get(RUN_ID_ATTRIBUTE) != self.run_id:
+                    continue
+                for scope_logs in resource_logs.scope_logs:
+                    seqs.extend(_attributes(record.attributes).get(SEQ_ATTRIBUTE) for record in scope_logs.log_records)
+        with self._condition:
+            received = self.received_at[signal]
+            for seq in seqs:
+                if seq is None:
+                    continue
+                if seq in received:
+                    self.duplicates[signal] += 1
+                else:
+                    received[seq] = received_at
+            self._condition.notify_all()
+
+    def _complete(self) -> bool:
+        return all(len(self.received_at[signal]) >= self.count for signal in SIGNALS)
+
+    def send_burst(self, endpoint: str) -> Dict[str, Any]:
+        """Emit `count` tagged items per signal to an OTLP/HTTP endpoint and force-flush them.
+
+        Providers are local (the global tracer provider is left alone). Returns
+        per-signal export counts and failures, and whether every flush finished in time.
+        """
+        from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
+        from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+        endpoint = endpoint.rstrip("/")
+        resource = Resource.create({SERVICE_NAME: "otel-integrator-verify", RUN_ID_ATTRIBUTE: self.run_id})
+        # The exporters' retries are bounded by the same timeout as the whole round trip.
+        exporters = {
+            "traces": _RecordingExporter(OTLPSpanExporter(endpoint=f"{endpoint}/v1/traces", timeout=self.timeout)),
+            "metrics": _RecordingExporter(OTLPMetricExporter(endpoint=f"{endpoint}/v1/metrics", timeout=self.timeout)),
+            "logs": _RecordingExporter(OTLPLogExporter(endpoint=f"{endpoint}/v1/logs", timeout=self.timeout)),
+        }
+        tracer_provider = TracerProvider(resource=resource)
+        tracer_provider.add_span_processor(BatchSpanProcessor(exporters["traces"]))
+        # Exported on force_flush only; the interval just has to outlast the burst.
+        reader = PeriodicExportingMetricReader(exporters["metrics"], export_interval_millis=3_600_000)
+        meter_provider = MeterProvider(resource=resource, metric_readers=[reader])
+        logger_provider = LoggerProvider(resource=resource)
+        logger_provider.add_log_record_processor(BatchLogRecordProcessor(exporters["logs"]))
+
+        tracer = tracer_provider.get_tracer("otel-integrator.verify")
+        counter = meter_provider.get_meter("otel-integrator.verify").create_counter("verification.items")
+        logger = logging.getLogger("otel-integrator.verify")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = LoggingHandler(logger_provider=logger_provider)
+        logger.addHandler(handler)
+        try:
+            for seq in range(self.count):
+                attributes = {SEQ_ATTRIBUTE: seq}
+                now = time.time()
+                self.sent_at["traces"][seq] = self.sent_at["metrics"][seq] = self.sent_at["logs"][seq] = now
+                with tracer.start_as_current_span("verification-span", attributes=attributes):
+                    pass
+                counter.add(1, attributes)
+                logger.info("verification record %d", seq, extra=attributes)
+            # Metrics are stamped when collected, which is at flush time.
+            flushed_at = time.time()
+            self.sent_at["metrics"] = {seq: flushed_at for seq in self.sent_at["metrics"]}
+            timeout_ms = int(self.timeout * 1000)
+            flushed = {
+                "traces": tracer_provider.force_flush(timeout_ms),
+                "metrics": meter_provider.force_flush(timeout_ms),
+                "logs": logger_provider.force_flush(timeout_ms),
+            }
+        finally:
+            logger.removeHandler(handler)
+            tracer_provider.shutdown()
+            meter_provider.shutdown()
+            logger_provider.shutdown()
+        return {signal: {"flushed": flushed[signal], "exports": exporter.exports, "failed_exports": exporter.failures}
+                for signal, exporter in exporters.items()}
+
+    def _start_collector(self, binary: str, sink: OTLPSink, workdir: str):
+        grpc_port, http_port = _free_port(), _free_port()
+        config_path = Path(workdir) / "verify-collector.yaml"
+        config_path.write_text(yaml.safe_dump(debug_pipeline_config(sink.http_endpoint, grpc_port, http_port)))
+        log = open(Path(workdir) / "collector.log", "w")
+        process = subprocess.Popen([binary, "--config", str(config_path)], stdout=log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                log.close()
+                raise RuntimeError(f"collector exited: {(Path(workdir) / 'collector.log').read_text()[-500:]}")
+            try:
+                with socket.create_connection(("127.0.0.1", http_port), timeout=0.2):
+                    return process, log, f"http://127.0.0.1:{http_port}"
+            except OSError:
+                time.sleep(0.05)
+        process.terminate()
+        log.close()
+        raise RuntimeError(f"collector did not listen on :{http_port} within {self.timeout}s")
+
+    def run(self) -> Dict[str, Any]:
+        """Run one verification round; returns delivery ratio and end-to-end latency per signal."""
+        binary = self.collector_binary
+        if binary is None:
+            binary = shutil.which("otelcol") or shutil.which("otelcol-contrib")
+        started = time.monotonic()
+        process = log = None
+        with OTLPSink() as sink, tempfile.TemporaryDirectory(prefix="otel-verify-") as workdir:
+            sink.add_listener(self.on_export)
+            try:
+                if binary:
+                    print(f"🧪 Starting {Path(binary).name} with a debug pipeline exporting to {sink.http_endpoint}")
+                    process, log, endpoint = self._start_collector(binary, sink, workdir)
+                    mode = "collector"
+                else:
+                    print("🧪 No collector binary found; sending straight to the local sink")
+                    endpoint, mode = sink.http_endpoint, "direct"
+                print(f"📤 Sending {self.count} spans, metrics and logs (run {self.run_id[:8]})...")
+                exports = self.send_burst(endpoint)
+                with self._condition:
+                    self._condition.wait_for(self._complete, timeout=max(0.0, started + self.timeout - time.monotonic()))
+            finally:
+                if process is not None:
+                    process.terminate()
+                    try:
+                        process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                    log.close()
+
+        signals = {}
+        with self._condition:
+            for signal in SIGNALS:
+                received = self.received_at[signal]
+                latencies = [(at - self.sent_at[signal][seq]) * 1000 for seq, at in received.items()
+                             if seq in self.sent_at[signal]]
+                signals[signal] = {
+                    "sent": self.count,
+                    "received": len(received),
+                    "delivery_ratio": round(len(received) / self.count, 4) if self.count else 1.0,
+                    "duplicates": self.duplicates[signal],
+                    "latency_ms": percentiles(latencies),
+                    **exports[signal],
+                }
+        return {
+            "ok": all(s["received"] == s["sent"] for s in signals.values()),
+            "mode": mode,
+            "run_id": self.run_id,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "signals": signals,
+        }
+
+
+def print_round_trip(result: Dict[str, Any]) -> None:
+    print(f"\n📊 Round trip ({result['mode']}, {result['elapsed_ms']} ms):")
+    for signal, stats in result["signals"].items():
+        icon = "✅" if stats["received"] == stats["sent"] else "❌"
+        latency = stats["latency_ms"]
+        timing = f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms" if latency else "no latency"
+        print(f"   {icon} {signal:<7} {stats['received']}/{stats['sent']} delivered "
+              f"({stats['delivery_ratio']:.1%}), {timing}")
+        if stats["failed_exports"]:
+            print(f"      ⚠️  {stats['failed_exports']}/{stats['exports']} exports failed")
+
@@ -1,87 +1,183 @@
+import hashlib
+import http.client
+import json
+import os
+import re
+import shutil
 import ssl
 import socket
-import requests
+import subprocess
+import tempfile
+import threading
+import time
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 from pathlib import Path
+from urllib.parse import urlparse
 import certifi
 
+from validators.exporter_health_check import percentiles
+
+TLS_RESULT_CACHE_FILE = Path("output/tls-result-cache.json")
+# Cached results are never reused once their certificate is this close to expiring.
+EXPIRY_WARNING_DAYS = 14
+DEFAULT_PERF_SAMPLES = 5
+# HTTP/2 connection health checks for otlphttp exporters (confighttp settings).
+HTTP2_READ_IDLE_TIMEOUT = "10s"
+HTTP2_PING_TIMEOUT = "15s"
+
+
+class EndpointResultCache:
+    """Last healthy result per endpoint, reused without connecting for `ttl` seconds.
+
+    Entries are keyed by URL and TLS settings and store the certificate
+    fingerprint and check time. An entry is never reused past its
+    certificate's expiry minus EXPIRY_WARNING_DAYS, so expiring endpoints
+    are always checked live.
+    """
+
+    def __init__(self, ttl: float, path: Path = TLS_RESULT_CACHE_FILE):
+        self.ttl = ttl
+        self.path = Path(path)
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def _usable_until(self, entry: Dict[str, Any]) -> float:
+        expires_at = entry["result"]["certificate"]["expires_at"]
+        return min(entry["checked_at"] + self.ttl, expires_at - EXPIRY_WARNING_DAYS * 86400)
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        self.endpoints = {key: entry for key, entry in saved.get("endpoints", {}).items()
+                          if self._usable_until(entry) > now}
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"endpoints": self.endpoints}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    def result(self, key: str) -> Optional[Dict[str, Any]]:
+        """The cached result for an endpoint while it is still usable."""
+        with self._lock:
+            entry = self.endpoints.get(key)
+        if entry is None or self._usable_until(entry) <= time.time():
+            return None
+        result = entry["result"]
+        return dict(result, certificate=_with_days_remaining(result["certificate"]), cached=True,
+                    checked_at=entry["checked_at"])
+
+    def store(self, key: str, result: Dict[str, Any]) -> None:
+        # Only verified certificates carry an expiry to cap the reuse at.
+        if result["status"] != "healthy" or not result.get("certificate"):
+            return
+        with self._lock:
+            self.endpoints[key] = {"fingerprint": result["fingerprint_sha256"], "checked_at": time.time(),
+                                   "result": result}
+
+
+def _with_days_remaining(cert: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(cert, days_remaining=int((cert["expires_at"] - time.time()) // 86400))
+
+
 class TLSValidator:
-    def __init__(self):
+    def __init__(self, cache: Optional[EndpointResultCache] = None, max_workers: int = 8):
         self.verify_ssl = True
         self.ca_cert_path = None
         self.client_cert_path = None
         self.client_key_path = None
-        
+        self.cache = cache
+        self.max_workers = max_workers
+        self._context: Optional[ssl.SSLContext] = None
+
     def set_ca_cert(self, ca_cert_path: str):
         """Set custom CA certificate path."""
         if Path(ca_cert_path).exists():
             self.ca_cert_path = ca_cert_path
+            self._context = None
             print(f"✅ Using custom CA certificate: {ca_cert_path}")
         else:
             print(f"❌ CA certificate not found: {ca_cert_path}")
-    
+
     def set_client_certs(self, cert_path: str, key_path: str):
         """Set client certificate and key for mutual TLS."""
         if Path(cert_path).exists() and Path(key_path).exists():
             self.client_cert_path = cert_path
             self.client_key_path = key_path
+            self._context = None
             print(f"✅ Using client certificates: {cert_path}, {key_path}")
         else:
             print(f"❌ Client certificates not found: {cert_path}, {key_path}")
-    
+
     def disable_ssl_verification(self):
         """Disable SSL verification (for self-signed certs in dev)."""
         self.verify_ssl = False
+        self._context = None
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         print("⚠️  SSL verification disabled (development mode)")
-    
+
+    def _build_context(self) -> ssl.SSLContext:
+        context = ssl.create_default_context(cafile=self.ca_cert_path or certifi.where())
+        if not self.verify_ssl and not self.ca_cert_path:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if self.client_cert_path and self.client_key_path:
+            context.load_cert_chain(self.client_cert_path, self.client_key_path)
+        return context
+
+    def ssl_context(self) -> ssl.SSLContext:
+        """One client context for every endpoint (CA bundle and client certs are loaded once)."""
+        if self._context is None:
+            self._context = self._build_context()
+        return self._context
+
+    def _cache_key(self, url: str) -> str:
+        # A result obtained with verification disabled must not pass a verified check.
+        settings = f"{self.verify_ssl}|{self.ca_cert_path}|{self.client_cert_path}"
+        return f"{url} {hashlib.sha256(settings.encode()).hexdigest()[:12]}"
+
     def check_tls_endpoint(self, url: str, timeout: int = 10) -> Dict[str, Any]:
-        """Check TLS certificate validity for an endpoint."""
+        """Check TLS certificate validity for an endpoint with a single handshake (or a fresh cached result)."""
+        if not url.startswith(('http://', 'https://')):
+            url = f"https://{url}"
+        if self.cache is not None:
+            cached = self.cache.result(self._cache_key(url))
+            if cached:
+                print(f"🔒 Checking TLS for: {url} (cached)")
+                return cached
         print(f"🔒 Checking TLS for: {url}")
-        
+
         try:
-            # Parse URL
-            if not url.startswith(('http://', 'https://')):
-                url = f"https://{url}"
-            
-            # Configure requests session
-            session = requests.Session()
-            
-            if self.ca_cert_path:
-                session.verify = self.ca_cert_path
-            elif not self.verify_ssl:
-                session.verify = False
-            
-            if self.client_cert_path and self.client_key_path:
-                session.cert = (self.client_cert_path, self.client_key_path)
-            
-            # Make request
-            response = session.get(url, timeout=timeout)
-            
-            # Check certificate info
-            cert_info = self._get_certificate_info(url)
-            
+            result = self._check(url, timeout)
+        except ssl.SSLCertVerificationError as e:
             return {
-                "status": "healthy",
+                "status": "ssl_error",
                 "url": url,
-                "status_code": response.status_code,
-                "certificate": cert_info,
-                "tls_version": response.raw.connection.sock.version() if hasattr(response.raw.connection, 'sock') else "unknown"
+                "error": e.verify_message or str(e),
+                "recommendation": "Check certificate validity or add custom CA cert"
             }
-            
-        except requests.exceptions.SSLError as e:
+        except ssl.SSLError as e:
             return {
                 "status": "ssl_error",
                 "url": url,
                 "error": str(e),
-                "recommendation": "Check certificate validity or add custom CA cert"
+                "recommendation": "Check the TLS version/cipher settings and client certificates"
             }
-        except requests.exceptions.ConnectionError as e:
+        except (OSError, http.client.HTTPException) as e:
             return {
                 "status": "connection_error",
                 "url": url,
-                "error": str(e),
+                "error": str(e) or type(e).__name__,
                 "recommendation": "Check network connectivity and endpoint availability"
             }
         except Exception as e:
@@ -91,66 +187,338 @@ class TLSValidator:
                 "error": str(e),
                 "recommendation": "Check endpoint configuration"
             }
-    
-    def _get_certificate_info(self, url: str) -> Dict[str, Any]:
-        """Extract certificate information."""
+        return result
+
+    def _connect(self, host: str, port: int, https: bool, timeout: float, session: Optional[ssl.SSLSession] = None,
+                 context: Optional[ssl.SSLContext] = None):
+        """Open a (TLS) connection; returns (socket, {"dns", "connect", "tls"} in ms)."""
+        timing: Dict[str, float] = {}
+        started = time.perf_counter()
+        family, socktype, proto, _, address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+        timing["dns"] = (time.perf_counter() - started) * 1000
+        mark = time.perf_counter()
+        sock = socket.socket(family, socktype, proto)
         try:
-            # Parse hostname and port
-            if url.startswith('https://'):
-                url = url[8:]
-            elif url.startswith('http://'):
-                url = url[7:]
-            
-            if ':' in url:
-                hostname, port = url.split(':', 1)
-                port = int(port)
-            else:
-                hostname = url
-                port = 443
-            
-            # Create SSL context
-            context = ssl.create_default_context()
-            if self.ca_cert_path:
-                context.load_verify_locations(self.ca_cert_path)
-            elif not self.verify_ssl:
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-            
-            # Connect and get certificate
-            with socket.create_connection((hostname, port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    return {
-                        "subject": dict(x[0] for x in cert['subject']),
-                        "issuer": dict(x[0] for x in cert['issuer']),
-                        "version": cert['version'],
-                        "serial_number": cert['serialNumber'],
-                        "not_before": cert['notBefore'],
-                        "not_after": cert['notAfter'],
-                        "san": cert.get('subjectAltName', []),
-                        "tls_version": ssock.version()
-                    }
-        except Exception as e:
-            return {"error": str(e)}
-    
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(timeout)
+            sock.connect(address)
+            timing["connect"] = (time.perf_counter() - mark) * 1000
+            if https:
+                mark = time.perf_counter()
+                sock = (context or self.ssl_context()).wrap_socket(sock, server_hostname=host, session=session)
+                timing["tls"] = (time.perf_counter() - mark) * 1000
+        except BaseException:
+            sock.close()
+            raise
+        return sock, timing
+
+    def _request(self, conn: http.client.HTTPConnection, path: str):
+        """GET `path` on an open connection; returns (response, ttfb ms) with the body read."""
+        mark = time.perf_counter()
+        conn.request("GET", path)
+        response = conn.getresponse()
+        ttfb = (time.perf_counter() - mark) * 1000
+        response.read()
+        return response, ttfb
+
+    def _check(self, url: str, timeout: float) -> Dict[str, Any]:
+        """Resolve, connect, handshake and GET once; everything is read off that one connection."""
+        parsed = urlparse(url)
+        https = parsed.scheme == "https"
+        host = parsed.hostname or "localhost"
+        port = parsed.port or (443 if https else 80)
+
+        started = time.perf_counter()
+        sock, timing = self._connect(host, port, https, timeout)
+        try:
+            # Read the TLS details first: the socket is closed if the server ends the connection after the GET.
+            tls = self._tls_details(sock) if https else {"certificate": None, "tls_version": None}
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            conn.sock = sock
+            response, timing["ttfb"] = self._request(conn, parsed.path or "/")
+            timing["total"] = (time.perf_counter() - started) * 1000
+            result = {
+                "status": "healthy",
+                "url": url,
+                "status_code": response.status,
+                "timing_ms": {phase: round(value, 3) for phase, value in timing.items()},
+                **tls,
+            }
+            if self.cache is not None:
+                self.cache.store(self._cache_key(url), result)
+            return result
+        finally:
+            sock.close()
+
+    def _tls_details(self, sock: ssl.SSLSocket) -> Dict[str, Any]:
+        """Version, cipher, fingerprint and (when verified) certificate of a TLS connection."""
+        # getpeercert() only decodes verified certificates; with verification
+        # disabled only the fingerprint, version and cipher are reported.
+        decoded = sock.getpeercert()
+        cipher, _, bits = sock.cipher()
+        return {
+            "tls_version": sock.version(),
+            "cipher": cipher,
+            "cipher_bits": bits,
+            "fingerprint_sha256": hashlib.sha256(sock.getpeercert(binary_form=True)).hexdigest(),
+            "certificate": _with_days_remaining(self._parse_certificate(decoded)) if decoded else None,
+        }
+
+    def _parse_certificate(self, cert: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract certificate information from a decoded certificate."""
+        return {
+            "subject": dict(x[0] for x in cert['subject']),
+            "issuer": dict(x[0] for x in cert['issuer']),
+            "version": cert['version'],
+            "serial_number": cert['serialNumber'],
+            "not_before": cert['notBefore'],
+            "not_after": cert['notAfter'],
+            "expires_at": ssl.cert_time_to_seconds(cert['notAfter']),
+            "san": [list(entry) for entry in cert.get('subjectAltName', [])],
+        }
+
     def validate_exporters_tls(self, exporters: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
-        """Validate TLS for all exporter endpoints."""
+        """Validate TLS for all exporter endpoints concurrently."""
         print("🔒 Validating TLS for all exporters...")
-        
-        results = {}
-        for exporter_name, endpoint in exporters.items():
-            results[exporter_name] = self.check_tls_endpoint(endpoint)
-        
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(exporters))),
+                                thread_name_prefix="tls-check") as executor:
+            futures = {name: executor.submit(self.check_tls_endpoint, endpoint) for name, endpoint in exporters.items()}
+        results = {name: future.result() for name, future in futures.items()}
+        if self.cache is not None:
+            self.cache.save()
+
         # Summary
         healthy_count = sum(1 for result in results.values() if result["status"] == "healthy")
         total_count = len(results)
-        
-        print(f"\n📊 TLS Validation Summary:")
+
+        print(f"\n📊 TLS Validation Summary ({(time.monotonic() - started) * 1000:.0f} ms):")
         print(f"   Healthy: {healthy_count}/{total_count}")
-        
+
         for exporter_name, result in results.items():
             status_icon = "✅" if result["status"] == "healthy" else "❌"
-            print(f"   {status_icon} {exporter_name}: {result['status']}")
-        
-        return results 
\ No newline at end of file
+            details = []
+            if result.get("tls_version"):
+                details.append(f"{result['tls_version']} {result['cipher']}")
+            if result.get("certificate"):
+                details.append(f"expires in {result['certificate']['days_remaining']} days")
+            elif result.get("fingerprint_sha256"):
+                details.append(f"unverified certificate sha256 {result['fingerprint_sha256'][:16]}")
+            if result.get("cached"):
+                details.append(f"cached {(time.time() - result['checked_at']) / 60:.0f} min ago")
+            elif result.get("timing_ms"):
+                timing = result["timing_ms"]
+                details.append(" ".join(f"{phase} {timing[phase]:.1f}" for phase in ("dns", "connect", "tls", "ttfb")
+                                        if phase in timing) + " ms")
+            suffix = f" ({', '.join(details)})" if details else ""
+            print(f"   {status_icon} {exporter_name}: {result['status']}{suffix}")
+
+        return results
+
+    def _keepalive(self, host: str, port: int, https: bool, path: str, timeout: float,
+                   requests_per_connection: int) -> Dict[str, Any]:
+        """Send several requests on one connection; keepalive is honored if they all share it."""
+        sock, _ = self._connect(host, port, https, timeout)
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conn.sock = sock
+        served, warm = 0, []
+        server_timeout = None
+        try:
+            for i in range(requests_per_connection):
+                try:
+                    response, ttfb = self._request(conn, path)
+                except (OSError, http.client.HTTPException):
+                    break
+                served += 1
+                if i:
+                    warm.append(ttfb)
+                match = re.search(r"timeout=(\d+)", response.getheader("Keep-Alive", ""))
+                if match:
+                    server_timeout = int(match.group(1))
+                if response.will_close or conn.sock is None:
+                    break
+        finally:
+            conn.close()
+        return {
+            "honored": served == requests_per_connection,
+            "requests_on_connection": served,
+            "server_timeout_s": server_timeout,
+            "warm_ttfb_ms": percentiles(warm),
+        }
+
+    def _alpn(self, host: str, port: int, timeout: float) -> Optional[str]:
+        """Protocol the server picks when offered h2 and http/1.1 (a handshake only, no request)."""
+        context = self._build_context()
+        context.set_alpn_protocols(["h2", "http/1.1"])
+        sock, _ = self._connect(host, port, True, timeout, context=context)
+        try:
+            return sock.selected_alpn_protocol()
+        finally:
+            sock.close()
+
+    def _early_data(self, host: str, port: int, path: str, timeout: float) -> Dict[str, Any]:
+        """TLS 1.3 0-RTT support, tested with the openssl CLI (Python's ssl module cannot send early data)."""
+        openssl = shutil.which("openssl")
+        if not openssl:
+            return {"supported": None, "detail": "openssl CLI not found"}
+        request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode()
+        command = [openssl, "s_client", "-connect", f"{host}:{port}", "-servername", host, "-tls1_3"]
+
+        def s_client(args: list, stdin: bytes = b"", wait_for: Optional[str] = None) -> str:
+            # s_client exits on stdin EOF and only then flushes its report, so stdin is held
+            # open until the server closes, the session file is written, or the timeout.
+            proc = subprocess.Popen(command + args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT)
+            proc.stdin.write(stdin)
+            proc.stdin.flush()
+            deadline = time.monotonic() + timeout
+            while proc.poll() is None and time.monotonic() < deadline:
+                if wait_for and os.path.exists(wait_for):
+                    break
+                time.sleep(0.05)
+            try:
+                output, _ = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                output, _ = proc.communicate()
+            return output.decode(errors="replace")
+
+        with tempfile.TemporaryDirectory(prefix="otel-tls-") as tmp:
+            session_file = os.path.join(tmp, "session.pem")
+            early_file = os.path.join(tmp, "early-data.txt")
+            with open(early_file, "wb") as f:
+                f.write(request)
+            first = s_client(["-sess_out", session_file], request, wait_for=session_file)
+            sizes = [int(n) for n in re.findall(r"Max Early Data: (\d+)", first)]
+            max_early_data = max(sizes, default=0)
+            if not os.path.exists(session_file) or not max_early_data:
+                return {"supported": False, "max_early_data": 0, "detail": "session tickets do not allow early data"}
+            second = s_client(["-sess_in", session_file, "-early_data", early_file])
+        accepted = "Early data was accepted" in second
+        return {"supported": accepted, "max_early_data": max_early_data,
+                "detail": "early data accepted" if accepted else "early data advertised but rejected"}
+
+    def analyze_performance(self, url: str, samples: int = DEFAULT_PERF_SAMPLES, timeout: float = 10,
+                            num_consumers: int = 10) -> Dict[str, Any]:
+        """Measure connection setup per phase, session resumption, 0-RTT, keepalive and HTTP/2 for one endpoint.
+
+        `samples` full handshakes and `samples` resumed ones are timed on fresh
+        connections; keepalive is tested with `samples` requests on one
+        connection. Returns the measurements plus exporter HTTP client settings.
+        """
+        if not url.startswith(('http://', 'https://')):
+            url = f"https://{url}"
+        print(f"⏱️  Analyzing connection performance for: {url}")
+        parsed = urlparse(url)
+        https = parsed.scheme == "https"
+        host = parsed.hostname or "localhost"
+        port = parsed.port or (443 if https else 80)
+        path = parsed.path or "/"
+        phases: Dict[str, list] = {"dns": [], "connect": [], "tls_full": [], "tls_resumed": [], "ttfb": []}
+        analysis: Dict[str, Any] = {"url": url, "tls": https}
+        try:
+            session = None
+            for _ in range(samples):
+                sock, timing = self._connect(host, port, https, timeout)
+                conn = http.client.HTTPConnection(host, port, timeout=timeout)
+                conn.sock = sock
+                try:
+                    mark = time.perf_counter()
+                    conn.request("GET", path)
+                    response = conn.getresponse()
+                    ttfb = (time.perf_counter() - mark) * 1000
+                    if https:
+                        # TLS 1.3 tickets arrive after the handshake, ahead of the response; read them
+                        # before the body, since http.client closes the socket after a "Connection: close" body.
+                        session = sock.session
+                        analysis["tls_version"] = sock.version()
+                    response.read()
+                finally:
+                    conn.close()
+                phases["dns"].append(timing["dns"])
+                phases["connect"].append(timing["connect"])
+                phases["ttfb"].append(ttfb)
+                if https:
+                    phases["tls_full"].append(timing["tls"])
+
+            if https:
+                reused = 0
+                for _ in range(samples):
+                    sock, timing = self._connect(host, port, https, timeout, session=session)
+                    try:
+                        if sock.session_reused:
+                            reused += 1
+                            phases["tls_resumed"].append(timing["tls"])
+                        session = sock.session
+                    finally:
+                        sock.close()
+                analysis["session_resumption"] = {
+                    "supported": reused > 0,
+                    "resumed": reused,
+                    "attempts": samples,
+                    "ticket_lifetime_s": session.ticket_lifetime_hint if session is not None and session.has_ticket else None,
+                }
+                analysis["alpn"] = self._alpn(host, port, timeout)
+                analysis["http2"] = analysis["alpn"] == "h2"
+                if analysis.get("tls_version") == "TLSv1.3":
+                    analysis["early_data"] = self._early_data(host, port, path, min(timeout, 5))
+                else:
+                    analysis["early_data"] = {"supported": False, "detail": "0-RTT needs TLS 1.3"}
+            analysis["keepalive"] = self._keepalive(host, port, https, path, timeout, max(2, samples))
+        except ssl.SSLError as e:
+            analysis.update({"status": "ssl_error", "error": getattr(e, "verify_message", None) or str(e)})
+            return analysis
+        except (OSError, http.client.HTTPException) as e:
+            analysis.update({"status": "connection_error", "error": str(e) or type(e).__name__})
+            return analysis
+
+        analysis["status"] = "ok"
+        analysis["timing_ms"] = {phase: percentiles(values) for phase, values in phases.items() if values}
+        analysis["exporter_settings"], analysis["recommendations"] = self.recommend_exporter_settings(
+            analysis, num_consumers)
+        return analysis
+
+    def recommend_exporter_settings(self, analysis: Dict[str, Any], num_consumers: int = 10):
+        """HTTP client settings for an otlphttp exporter sending to the analyzed endpoint, with the reasoning."""
+        settings: Dict[str, Any] = {}
+        recommendations = []
+        timing = analysis["timing_ms"]
+        setup_ms = sum(timing[p]["p50"] for p in ("dns", "connect", "tls_full") if p in timing)
+        keepalive = analysis["keepalive"]
+        if keepalive["honored"]:
+            # One warm connection per sending_queue consumer, so no export waits for a handshake.
+            settings["max_idle_conns"] = num_consumers
+            settings["max_idle_conns_per_host"] = num_consumers
+            server_timeout = keepalive["server_timeout_s"]
+            # Close idle connections just before the server does, so a request never races its close.
+            settings["idle_conn_timeout"] = f"{max(1, server_timeout - 1)}s" if server_timeout else "90s"
+            warm = keepalive["warm_ttfb_ms"]
+            if warm:
+                recommendations.append(f"Keepalive is honored: a warm connection saves ~{setup_ms:.1f} ms of "
+                                       f"connection setup per export (warm request p50 {warm['p50']} ms)")
+        else:
+            recommendations.append(f"Keepalive is not honored ({keepalive['requests_on_connection']} request(s) per "
+                                   f"connection): every export pays ~{setup_ms:.1f} ms of DNS, connect and TLS. "
+                                   "Check proxies or load balancers for 'Connection: close'")
+        if analysis.get("http2"):
+            # Exports are multiplexed on one connection; pings detect it going dead between exports.
+            settings["http2_read_idle_timeout"] = HTTP2_READ_IDLE_TIMEOUT
+            settings["http2_ping_timeout"] = HTTP2_PING_TIMEOUT
+            recommendations.append("HTTP/2 is negotiated: exports are multiplexed on one connection; "
+                                   "health-check it with HTTP/2 pings")
+        elif analysis["tls"]:
+            recommendations.append("HTTP/2 is not offered (ALPN picked "
+                                   f"{analysis.get('alpn') or 'nothing'}): concurrent exports need one connection each")
+        resumption = analysis.get("session_resumption")
+        if resumption and resumption["supported"] and "tls_resumed" in timing:
+            saved = timing["tls_full"]["p50"] - timing["tls_resumed"]["p50"]
+            recommendations.append(f"Session resumption works: reconnects save ~{saved:.1f} ms of handshake")
+        elif resumption:
+            recommendations.append(f"Session resumption is not supported: every reconnect pays a full "
+                                   f"{timing['tls_full']['p50']:.1f} ms handshake, so keep connections warm")
+        early_data = analysis.get("early_data")
+        if early_data and early_data.get("supported"):
+            recommendations.append("TLS 1.3 0-RTT is accepted. The collector's Go TLS client does not send early "
+                                   "data, so exporters rely on keepalive and resumption instead")
+        return settings, recommendations
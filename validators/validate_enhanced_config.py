@@ -60,22 +60,31 @@ def validate_enhanced_config(path: str = 'output/generated-configs/otel-collecto
             print(f"❌ Pipeline {pipeline_name} missing keys: {missing_pipeline_keys}")
             return False
         
-        # Check that pipeline references exist
+        # Check that pipeline references exist (connectors act as both receiver and exporter)
         receivers = pipeline_config.get('receivers', [])
         exporters = pipeline_config.get('exporters', [])
+        connectors = config.get('connectors') or {}
         
         for receiver in receivers:
-            if receiver not in config.get('receivers', {}):
+            if receiver not in config.get('receivers', {}) and receiver not in connectors:
                 print(f"❌ Pipeline {pipeline_name} references unknown receiver: {receiver}")
                 return False
         
         for exporter in exporters:
-            if exporter not in config.get('exporters', {}):
+            if exporter not in config.get('exporters', {}) and exporter not in connectors:
                 print(f"❌ Pipeline {pipeline_name} references unknown exporter: {exporter}")
                 return False
     
+    # Every connector must be fed by one pipeline and read by another
+    for connector in (config.get('connectors') or {}):
+        used_as_exporter = any(connector in p.get('exporters', []) for p in pipelines.values())
+        used_as_receiver = any(connector in p.get('receivers', []) for p in pipelines.values())
+        if not (used_as_exporter and used_as_receiver):
+            print(f"❌ Connector {connector} must be an exporter in one pipeline and a receiver in another")
+            return False
+    
     # Validate specific exporters for our stack
-    expected_exporters = ['otlphttp/elastic', 'otlphttp/grafana', 'otlphttp/influxdb', 'loki']
+    expected_exporters = ['otlphttp/elastic', 'otlp/elastic', 'otlphttp/grafana', 'otlphttp/influxdb', 'loki']
     available_exporters = list(config.get('exporters', {}).keys())
     
     print(f"✅ Available exporters: {available_exporters}")